@@ -5,13 +5,32 @@ A tkinter-based graphical user interface for the Daily Sales Sheet management sy
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
+import importlib.util
 import os
+import queue
 import sys
 import threading
 from datetime import datetime
 import subprocess
 from pathlib import Path
 
+from python_scripts.sales_periods import PERIODS
+from python_scripts.sales_pipeline import setup_pipeline
+from python_scripts.sales_status import format_status, load_status, workbook_status
+from python_scripts.sales_worker import SalesWorker, WorkerUnavailable
+
+# How often the Tk main loop checks for events posted by background threads
+EVENT_POLL_MS = 50
+
+# Rows shown at once in the Browse tab, and where they can come from
+BROWSE_VISIBLE_ROWS = 20
+BROWSE_SOURCES = ["Sample data workbook", "SQLite sales store"]
+BROWSE_NUMBER_COLUMNS = ("Quantity Sold", "Unit Price", "Total Amount")
+# The "Sales Entry" columns, in sales_store.SALES_COLUMNS order; listed here so the
+# GUI starts without importing pandas (sales_browser is imported when rows are loaded)
+BROWSE_COLUMNS = ("Date", "Product Name", "Category", "Quantity Sold", "Unit Price",
+                  "Total Amount", "Payment Method", "Customer Type")
+
 
 class SalesSheetGUI:
     """Main GUI application for Daily Sales Sheet management."""
@@ -29,9 +48,36 @@ class SalesSheetGUI:
         # Variables
         self.status_var = tk.StringVar()
         self.progress_var = tk.DoubleVar()
+        self.period_var = tk.StringVar(value="all")
+        
+        # Background threads never touch widgets; they post (handler, args) here
+        self.events = queue.Queue()
+        self.status_generation = 0
+        
+        # Browse tab state; rows are fetched off the main thread, one window at a time
+        self.browser = None
+        self.browse_first = 0
+        self.browse_total = 0
+        self.browse_lock = threading.Lock()
+        self.browse_changes = []
+        self.browse_fetching = False
+        
+        # Warm worker process for template, data and analysis jobs
+        self.worker = SalesWorker()
+        try:
+            self.worker.start()
+        except OSError as e:
+            print(f"Background worker unavailable ({e}); scripts will run in new processes")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         self.setup_gui()
         self.check_dependencies()
+        self.process_events()
+    
+    def on_close(self):
+        """Stop the background worker and close the window."""
+        self.worker.stop()
+        self.root.destroy()
     
     def setup_gui(self):
         """Setup the main GUI components."""
@@ -56,6 +102,7 @@ class SalesSheetGUI:
         # Create tabs
         self.create_main_tab()
         self.create_data_tab()
+        self.create_browse_tab()
         self.create_analysis_tab()
         self.create_settings_tab()
         
@@ -218,6 +265,246 @@ This application helps small shop owners track, analyze, and summarize daily sal
             font=("Arial", 10)
         ).pack(pady=10)
     
+    def create_browse_tab(self):
+        """Create the tab for browsing sales rows page by page."""
+        browse_frame = ttk.Frame(self.notebook)
+        self.notebook.add(browse_frame, text="🔎 Browse")
+        
+        # Source and filter controls
+        controls_frame = tk.LabelFrame(browse_frame, text="Browse Sales Rows", font=("Arial", 12, "bold"))
+        controls_frame.pack(fill="x", padx=10, pady=10)
+        
+        source_row = tk.Frame(controls_frame)
+        source_row.pack(fill="x", padx=10, pady=5)
+        
+        tk.Label(source_row, text="Source:").pack(side="left")
+        self.browse_source_var = tk.StringVar(value=BROWSE_SOURCES[0])
+        ttk.Combobox(
+            source_row,
+            textvariable=self.browse_source_var,
+            values=BROWSE_SOURCES,
+            state="readonly",
+            width=22
+        ).pack(side="left", padx=5)
+        
+        tk.Button(
+            source_row,
+            text="📂 Load Rows",
+            command=self.load_browser,
+            bg="#3498db",
+            fg="white",
+            font=("Arial", 10)
+        ).pack(side="left", padx=10)
+        
+        filter_row = tk.Frame(controls_frame)
+        filter_row.pack(fill="x", padx=10, pady=5)
+        
+        self.browse_start_var = tk.StringVar()
+        self.browse_end_var = tk.StringVar()
+        self.browse_product_var = tk.StringVar()
+        self.browse_category_var = tk.StringVar()
+        
+        tk.Label(filter_row, text="From:").pack(side="left")
+        tk.Entry(filter_row, textvariable=self.browse_start_var, width=11).pack(side="left", padx=5)
+        tk.Label(filter_row, text="To:").pack(side="left")
+        tk.Entry(filter_row, textvariable=self.browse_end_var, width=11).pack(side="left", padx=5)
+        
+        tk.Label(filter_row, text="Product:").pack(side="left")
+        self.browse_product_box = ttk.Combobox(filter_row, textvariable=self.browse_product_var, width=14)
+        self.browse_product_box.pack(side="left", padx=5)
+        tk.Label(filter_row, text="Category:").pack(side="left")
+        self.browse_category_box = ttk.Combobox(filter_row, textvariable=self.browse_category_var, width=10)
+        self.browse_category_box.pack(side="left", padx=5)
+        
+        tk.Button(
+            filter_row,
+            text="Apply",
+            command=self.apply_browse_filters,
+            bg="#2ecc71",
+            fg="white",
+            font=("Arial", 9)
+        ).pack(side="left", padx=5)
+        
+        tk.Button(
+            filter_row,
+            text="Clear",
+            command=self.clear_browse_filters,
+            font=("Arial", 9)
+        ).pack(side="left")
+        
+        # Rows: the tree only ever holds the visible window; the scrollbar spans the whole view
+        rows_frame = tk.Frame(browse_frame)
+        rows_frame.pack(fill="both", expand=True, padx=10, pady=(0, 5))
+        
+        self.browse_tree = ttk.Treeview(rows_frame, columns=BROWSE_COLUMNS, show="headings",
+                                        height=BROWSE_VISIBLE_ROWS, selectmode="browse")
+        for column in BROWSE_COLUMNS:
+            self.browse_tree.heading(column, text=column, command=lambda c=column: self.sort_browse(c))
+            self.browse_tree.column(column, width=100, anchor="e" if column in BROWSE_NUMBER_COLUMNS else "w")
+        self.browse_tree.pack(side="left", fill="both", expand=True)
+        
+        self.browse_scrollbar = ttk.Scrollbar(rows_frame, orient="vertical", command=self.on_browse_scroll)
+        self.browse_scrollbar.pack(side="right", fill="y")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.browse_tree.bind(sequence, self.on_browse_wheel)
+        
+        self.browse_info_var = tk.StringVar(value="Choose a source and click Load Rows")
+        tk.Label(browse_frame, textvariable=self.browse_info_var, font=("Arial", 9),
+                 fg="#7f8c8d").pack(anchor="w", padx=10, pady=(0, 10))
+    
+    def load_browser(self):
+        """Open the chosen row source in a background thread and show its first rows."""
+        source = self.browse_source_var.get()
+        self.browse_info_var.set(f"Loading {source.lower()} (the first load of a workbook copies it "
+                                 f"into a browsable SQLite file)...")
+        
+        def run():
+            try:
+                # Imported here: pandas is only needed once rows are browsed
+                from python_scripts.sales_browser import FILTER_COLUMNS, RowBrowser, open_rows
+                from python_scripts.sales_store import DEFAULT_STORE_PATH
+                
+                if source == BROWSE_SOURCES[1]:
+                    rows = open_rows(db_path=DEFAULT_STORE_PATH)
+                else:
+                    rows = open_rows("sample_data/sample_sales_data.xlsx")
+                browser = RowBrowser(rows)
+                choices = {column: rows.distinct_values(column) for column in FILTER_COLUMNS}
+            except Exception as e:
+                self.post_event(self.browse_info_var.set, f"❌ Could not load rows: {e}")
+                return
+            self.post_event(self.show_browser, browser, choices)
+        
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+    
+    def show_browser(self, browser, choices):
+        """Start browsing a freshly opened source from its first row."""
+        self.browser = browser
+        self.browse_product_box["values"] = [""] + choices["Product Name"]
+        self.browse_category_box["values"] = [""] + choices["Category"]
+        self.browse_first = 0
+        self.update_browse_headings()
+        self.fetch_browse_rows()
+    
+    def apply_browse_filters(self):
+        """Filter the rows by the date range, product and category entered."""
+        if self.browser is None:
+            return
+        try:
+            start, end = (datetime.strptime(text, "%Y-%m-%d").date() if text else None
+                          for text in (self.browse_start_var.get().strip(), self.browse_end_var.get().strip()))
+        except ValueError:
+            messagebox.showerror("Error", "Please enter dates as YYYY-MM-DD")
+            return
+        filters = {"Product Name": [self.browse_product_var.get()] if self.browse_product_var.get() else [],
+                   "Category": [self.browse_category_var.get()] if self.browse_category_var.get() else []}
+        self.browse_first = 0
+        self.fetch_browse_rows(lambda browser: browser.set_view(start, end, filters))
+    
+    def clear_browse_filters(self):
+        """Show every row again, keeping the sort order."""
+        for var in (self.browse_start_var, self.browse_end_var, self.browse_product_var, self.browse_category_var):
+            var.set("")
+        self.apply_browse_filters()
+    
+    def sort_browse(self, column):
+        """Sort by a column, reversing the order when it is already the sort column."""
+        if self.browser is None:
+            return
+        descending = not self.browser.descending if column == self.browser.sort_by else False
+        self.browse_first = 0
+        self.fetch_browse_rows(lambda browser: browser.set_view(browser.start, browser.end, browser.filters,
+                                                                 column, descending))
+    
+    def update_browse_headings(self):
+        """Mark the sort column and direction in the column headings."""
+        for column in BROWSE_COLUMNS:
+            arrow = ""
+            if self.browser is not None and column == self.browser.sort_by:
+                arrow = " ▼" if self.browser.descending else " ▲"
+            self.browse_tree.heading(column, text=column + arrow)
+    
+    def on_browse_scroll(self, action, amount, unit=None):
+        """Move the visible window for a scrollbar drag ("moveto") or click ("scroll")."""
+        if action == "moveto":
+            first = int(float(amount) * self.browse_total)
+        else:
+            step = BROWSE_VISIBLE_ROWS if unit == "pages" else 1
+            first = self.browse_first + int(amount) * step
+        self.scroll_browse_to(first)
+    
+    def on_browse_wheel(self, event):
+        """Scroll three rows per mouse wheel step."""
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_browse_to(self.browse_first - 3)
+        else:
+            self.scroll_browse_to(self.browse_first + 3)
+        return "break"
+    
+    def scroll_browse_to(self, first):
+        """Show the window of rows starting at first, fetching any pages it needs."""
+        first = max(0, min(first, self.browse_total - BROWSE_VISIBLE_ROWS))
+        if self.browser is None or first == self.browse_first:
+            return
+        self.browse_first = first
+        self.fetch_browse_rows()
+    
+    def fetch_browse_rows(self, change=None):
+        """
+        Fetch the visible rows in a background thread, after applying a view change.
+        
+        Only one fetch runs at a time. Scrolling while it runs just moves
+        browse_first; the fetch thread then loads the newest window before it
+        stops, so fast scrolling skips the windows in between.
+        """
+        with self.browse_lock:
+            if change is not None:
+                self.browse_changes.append(change)
+            if self.browse_fetching:
+                return
+            self.browse_fetching = True
+        
+        def run():
+            while True:
+                with self.browse_lock:
+                    changes, self.browse_changes = self.browse_changes, []
+                    browser, first = self.browser, self.browse_first
+                try:
+                    for change in changes:
+                        change(browser)
+                    rows = browser.rows(first, BROWSE_VISIBLE_ROWS)
+                except Exception as e:
+                    self.post_event(self.browse_info_var.set, f"❌ Could not read rows: {e}")
+                    rows = None
+                if rows is not None:
+                    self.post_event(self.show_browse_rows, first, rows, browser.total)
+                with self.browse_lock:
+                    if rows is None or (not self.browse_changes and self.browse_first == first
+                                        and self.browser is browser):
+                        self.browse_fetching = False
+                        return
+        
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+    
+    def show_browse_rows(self, first, rows, total):
+        """Replace the tree's rows with one window of the view."""
+        self.browse_total = total
+        self.browse_tree.delete(*self.browse_tree.get_children())
+        for row in rows:
+            self.browse_tree.insert("", "end", values=row)
+        if total:
+            self.browse_scrollbar.set(first / total, (first + len(rows)) / total)
+            self.browse_info_var.set(f"Rows {first + 1:,}–{first + len(rows):,} of {total:,} "
+                                     f"from {self.browser.source.name}")
+        else:
+            self.browse_scrollbar.set(0, 1)
+            self.browse_info_var.set(f"No rows match the filters in {self.browser.source.name}")
+        self.update_browse_headings()
+
     def create_analysis_tab(self):
         """Create the analysis and reporting tab."""
         analysis_frame = ttk.Frame(self.notebook)
@@ -252,6 +539,20 @@ This application helps small shop owners track, analyze, and summarize daily sal
             height=2
         ).pack(side="left", padx=10)
         
+        # Report period (also used by "Run Sales Analysis" on the Main tab)
+        period_frame = tk.Frame(controls_frame)
+        period_frame.pack(pady=(0, 10))
+        
+        tk.Label(period_frame, text="Period:", font=("Arial", 10)).pack(side="left", padx=5)
+        ttk.Combobox(
+            period_frame,
+            textvariable=self.period_var,
+            values=PERIODS,
+            width=15
+        ).pack(side="left", padx=5)
+        tk.Label(period_frame, text="(or YYYY-MM, YYYY-MM-DD, START:END)",
+                 font=("Arial", 9), fg="#7f8c8d").pack(side="left", padx=5)
+        
         # Results display
         results_frame = tk.LabelFrame(analysis_frame, text="Analysis Results", font=("Arial", 12, "bold"))
         results_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -360,47 +661,125 @@ Check the documentation/ folder for detailed guides.
         
         self.status_var.set("Ready")
     
+    def post_event(self, handler, *args):
+        """Queue handler(*args) to run on the Tk main thread."""
+        self.events.put((handler, args))
+    
+    def process_events(self):
+        """Run every queued event, then check again after EVENT_POLL_MS."""
+        while True:
+            try:
+                handler, args = self.events.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                handler(*args)
+            except Exception as e:
+                print(f"GUI event {getattr(handler, '__name__', handler)} failed: {e}")
+        self.root.after(EVENT_POLL_MS, self.process_events)
+    
+    def in_main_thread(self, handler, *args):
+        """Call handler(*args) now on the main thread, or queue it from any other thread."""
+        if threading.current_thread() is threading.main_thread():
+            handler(*args)
+        else:
+            self.post_event(handler, *args)
+    
     def update_status(self, message):
-        """Update the status bar message."""
-        self.status_var.set(message)
-        self.root.update()
+        """Update the status bar message (safe from any thread)."""
+        self.in_main_thread(self.status_var.set, message)
+    
+    def set_progress(self, value):
+        """Set the progress bar, 0 to 100 (safe from any thread)."""
+        self.in_main_thread(self.progress_var.set, value)
+    
+    def show_info(self, title, message):
+        """Show an information box (safe from any thread)."""
+        self.in_main_thread(messagebox.showinfo, title, message)
+    
+    def show_error(self, title, message):
+        """Show an error box (safe from any thread)."""
+        self.in_main_thread(messagebox.showerror, title, message)
+    
+    def report_progress(self, fraction, message):
+        """Show a job's progress fraction (0 to 1) and message (safe from any thread)."""
+        self.set_progress(100 * fraction)
+        self.update_status(message)
+    
+    def run_in_worker(self, job, wait=True, progress=None):
+        """
+        Run a (kind, params) job in the warm worker process.
+        
+        Returns a CompletedProcess like subprocess.run does, or None when the
+        worker is not available (or busy, with wait=False), so the caller can
+        start the script instead. progress is called with the job's progress
+        fraction and message as the worker reports them.
+        """
+        kind, params = job
+        try:
+            if not self.worker.alive:
+                self.worker.start()
+            reply = self.worker.run(kind, wait=wait, progress=progress, **params)
+        except (WorkerUnavailable, OSError) as e:
+            print(f"Background worker unavailable ({e}); running the script in a new process")
+            return None
+        return subprocess.CompletedProcess([kind], 0 if reply['ok'] else 1, reply['output'], reply['error'])
     
-    def run_script_async(self, script_path, callback=None):
-        """Run a Python script asynchronously."""
+    def run_script(self, script_path, args=None, job=None, wait=True, progress=None):
+        """
+        Run a Python script and return its CompletedProcess.
+        
+        When job is given as (kind, params) it runs in the warm worker process
+        instead, which keeps the modules and loaded data between runs; the
+        script is only started in a new interpreter if the worker is unavailable.
+        Only worker jobs report progress.
+        """
+        result = self.run_in_worker(job, wait, progress) if job else None
+        if result is None:
+            # Get the Python executable path
+            python_exe = sys.executable
+            if os.path.exists(".venv/bin/python"):
+                python_exe = ".venv/bin/python"
+            elif os.path.exists(".venv/Scripts/python.exe"):
+                python_exe = ".venv/Scripts/python.exe"
+            
+            result = subprocess.run(
+                [python_exe, script_path] + list(args or []),
+                capture_output=True,
+                text=True,
+                cwd=os.getcwd()
+            )
+        return result
+    
+    def run_script_async(self, script_path, callback=None, args=None, job=None):
+        """
+        Run a Python script (or worker job, see run_script) asynchronously.
+        
+        The thread only posts events: status, progress, error boxes and the
+        callback with the script's output all run on the Tk main thread.
+        """
         def run():
             try:
                 self.update_status(f"Running {os.path.basename(script_path)}...")
-                self.progress_var.set(50)
+                self.set_progress(0)
                 
-                # Get the Python executable path
-                python_exe = sys.executable
-                if os.path.exists(".venv/bin/python"):
-                    python_exe = ".venv/bin/python"
-                elif os.path.exists(".venv/Scripts/python.exe"):
-                    python_exe = ".venv/Scripts/python.exe"
+                result = self.run_script(script_path, args, job, progress=self.report_progress)
                 
-                result = subprocess.run(
-                    [python_exe, script_path],
-                    capture_output=True,
-                    text=True,
-                    cwd=os.getcwd()
-                )
-                
-                self.progress_var.set(100)
+                self.set_progress(100)
                 
                 if result.returncode == 0:
                     self.update_status(f"✅ {os.path.basename(script_path)} completed successfully")
                     if callback:
-                        callback(result.stdout)
+                        self.post_event(callback, result.stdout)
                 else:
                     self.update_status(f"❌ {os.path.basename(script_path)} failed")
-                    messagebox.showerror("Error", f"Script failed:\n{result.stderr}")
+                    self.show_error("Error", f"Script failed:\n{result.stderr}")
                 
             except Exception as e:
                 self.update_status(f"❌ Error running script")
-                messagebox.showerror("Error", f"Failed to run script:\n{str(e)}")
+                self.show_error("Error", f"Failed to run script:\n{str(e)}")
             finally:
-                self.progress_var.set(0)
+                self.set_progress(0)
         
         thread = threading.Thread(target=run)
         thread.daemon = True
@@ -410,14 +789,16 @@ Check the documentation/ folder for detailed guides.
         """Create Excel template."""
         self.run_script_async(
             "python_scripts/create_excel_template.py",
-            lambda output: self.refresh_status()
+            lambda output: self.refresh_status(),
+            job=("template", {})
         )
     
     def generate_sample_data(self):
         """Generate sample data."""
         self.run_script_async(
             "python_scripts/generate_sample_data.py",
-            lambda output: self.refresh_status()
+            lambda output: self.refresh_status(),
+            job=("generate", {})
         )
     
     def generate_custom_data(self):
@@ -428,24 +809,11 @@ Check the documentation/ folder for detailed guides.
                 messagebox.showerror("Error", "Please enter a valid number of days (1-365)")
                 return
             
-            # Modify the script to accept days parameter
-            script_content = f"""
-import sys
-sys.path.append('python_scripts')
-from generate_sample_data import SampleDataGenerator
-
-generator = SampleDataGenerator()
-filepath = generator.generate_and_save(days={days})
-print(f"Generated {{days}} days of sample data: {{filepath}}")
-"""
-            
-            # Write temporary script
-            with open("temp_generate.py", "w") as f:
-                f.write(script_content)
-            
             self.run_script_async(
-                "temp_generate.py",
-                lambda output: [self.refresh_status(), os.remove("temp_generate.py") if os.path.exists("temp_generate.py") else None]
+                "python_scripts/generate_sample_data.py",
+                lambda output: self.refresh_status(),
+                ["--days", str(days)],
+                job=("generate", {"days": days})
             )
             
         except ValueError:
@@ -459,31 +827,90 @@ print(f"Generated {{days}} days of sample data: {{filepath}}")
             self.refresh_charts_list()
             self.refresh_status()
         
+        period = self.period_var.get().strip()
+        args = ["--period", period] if period and period != "all" else []
+        
         self.run_script_async(
             "python_scripts/sales_analyzer.py",
-            analysis_callback
+            analysis_callback,
+            args,
+            job=("analyze", {"period": period if period and period != "all" else None})
         )
     
     def complete_setup(self):
-        """Run complete setup."""
-        def setup_callback(output):
+        """
+        Run complete setup as a pipeline (see sales_pipeline).
+        
+        The template and the sample data are created at the same time; the
+        analysis waits until the sample data has been written. The progress
+        bar is the stages' weighted share of the work, counting how far each
+        running stage has got by its worker's progress reports.
+        """
+        stage_done = {}
+        
+        def show_overall(pipeline):
+            total = sum(stage.weight for stage in pipeline.stages.values()) or 1.0
+            done = sum(pipeline.stages[name].weight * fraction for name, fraction in stage_done.items())
+            self.set_progress(100 * done / total)
+        
+        def stage(name, script_path, job, args=None):
+            def report(fraction, message):
+                stage_done[name] = fraction
+                show_overall(pipeline)
+                self.update_status(message)
+            
+            def run():
+                # Without waiting, a stage that finds the worker busy runs in its own process
+                result = self.run_script(script_path, args, job, wait=False, progress=report)
+                if result.returncode != 0:
+                    raise RuntimeError(result.stderr.strip() or f"{os.path.basename(script_path)} failed")
+                return result.stdout
+            return run
+        
+        def show_progress(event):
+            if event['state'] != 'started':
+                stage_done[event['stage']] = 1.0
+            show_overall(pipeline)
+            if event['state'] == 'started':
+                self.update_status(f"Running {event['label']}...")
+            elif event['state'] == 'finished':
+                self.update_status(f"✅ {event['label']} finished in {event['seconds']:.1f}s")
+            else:
+                self.update_status(f"❌ {event['label']} {event['state']}")
+        
+        def finish(results):
+            analysis = results['analysis']
+            if analysis['state'] == 'finished':
+                self.results_text.delete(1.0, tk.END)
+                self.results_text.insert(tk.END, analysis['result'])
             self.refresh_status()
             self.refresh_charts_list()
-            messagebox.showinfo("Setup Complete", "All components have been created successfully!")
-        
-        # Run all scripts in sequence
-        def run_sequence():
-            scripts = [
-                "python_scripts/create_excel_template.py",
-                "python_scripts/generate_sample_data.py",
-                "python_scripts/sales_analyzer.py"
-            ]
             
-            for script in scripts:
-                if os.path.exists(script):
-                    self.run_script_async(script)
+            summary = pipeline.summary(results)
+            if all(outcome['state'] == 'finished' for outcome in results.values()):
+                self.update_status("✅ Complete setup finished")
+                messagebox.showinfo("Setup Complete",
+                                    f"All components have been created successfully!\n\n{summary}")
+            else:
+                self.update_status("❌ Complete setup failed")
+                messagebox.showerror("Setup Failed", f"Some steps did not complete:\n\n{summary}")
         
-        run_sequence()
+        pipeline = setup_pipeline(
+            stage('template', "python_scripts/create_excel_template.py", ("template", {})),
+            stage('sample_data', "python_scripts/generate_sample_data.py", ("generate", {})),
+            stage('analysis', "python_scripts/sales_analyzer.py", ("analyze", {"period": None}))
+        )
+        
+        def run():
+            try:
+                results = pipeline.run(progress=show_progress)
+            finally:
+                self.set_progress(0)
+            self.post_event(finish, results)
+        
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
     
     def open_template(self):
         """Open Excel template."""
@@ -581,9 +1008,14 @@ print(f"Generated {{days}} days of sample data: {{filepath}}")
                 self.charts_listbox.insert(tk.END, chart)
     
     def refresh_status(self):
-        """Refresh project status display."""
-        status_text = "PROJECT STATUS\n" + "="*50 + "\n\n"
+        """
+        Refresh project status display.
         
+        The data summary comes from the workbook's status manifest (see
+        sales_status) when it is fresh. Otherwise the panel shows the file
+        checks straight away, and the numbers are computed in a background
+        thread and filled in when ready.
+        """
         # Check file existence
         files_to_check = [
             ("Excel Template", "excel_templates/daily_sales_sheet.xlsx"),
@@ -595,47 +1027,65 @@ print(f"Generated {{days}} days of sample data: {{filepath}}")
             ("Analysis Report", "visualizations/sales_analysis_report.txt")
         ]
         
+        files_text = ""
         for name, path in files_to_check:
             if os.path.exists(path):
-                status_text += f"✅ {name}: {path}\n"
+                files_text += f"✅ {name}: {path}\n"
             else:
-                status_text += f"❌ {name}: Not created yet\n"
+                files_text += f"❌ {name}: Not created yet\n"
+        
+        # Newer refreshes replace the result of any summary still being computed
+        self.status_generation += 1
+        generation = self.status_generation
         
-        # Add summary stats if sample data exists
         sample_path = "sample_data/sample_sales_data.xlsx"
-        if os.path.exists(sample_path):
+        if not os.path.exists(sample_path):
+            self.show_status(generation, files_text, "")
+            return
+        
+        cached = load_status(sample_path)
+        if cached is not None:
+            self.show_status(generation, files_text, format_status(cached))
+            return
+        
+        self.show_status(generation, files_text, "\n⏳ Reading sample data statistics...\n")
+        
+        def compute():
             try:
-                import pandas as pd
-                df = pd.read_excel(sample_path, sheet_name="Sales Entry")
-                total_sales = df['Total Amount'].sum()
-                total_transactions = len(df)
-                date_range = f"{df['Date'].min()} to {df['Date'].max()}"
-                
-                status_text += f"\n📊 DATA SUMMARY:\n"
-                status_text += f"Period: {date_range}\n"
-                status_text += f"Total Transactions: {total_transactions:,}\n"
-                status_text += f"Total Sales: ${total_sales:,.2f}\n"
-                status_text += f"Average Transaction: ${total_sales/total_transactions:.2f}\n"
-                
+                summary_text = format_status(workbook_status(sample_path))
             except Exception:
-                status_text += "\n⚠️ Could not read sample data statistics\n"
+                summary_text = format_status(None)
+            self.post_event(self.show_status, generation, files_text, summary_text)
         
+        thread = threading.Thread(target=compute)
+        thread.daemon = True
+        thread.start()
+    
+    def show_status(self, generation, files_text, summary_text):
+        """Show the status panel, unless a newer refresh has started since this one."""
+        if generation != self.status_generation:
+            return
+        status_text = "PROJECT STATUS\n" + "="*50 + "\n\n" + files_text + summary_text
         status_text += f"\nLast Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         
         self.status_text.delete(1.0, tk.END)
         self.status_text.insert(tk.END, status_text)
     
     def check_dependencies(self):
-        """Check if required packages are installed."""
+        """
+        Check if required packages are installed.
+        
+        Packages are looked up with importlib.util.find_spec rather than imported,
+        so the check does not load pandas or matplotlib on the Tk main thread.
+        """
         required_packages = ['pandas', 'openpyxl', 'matplotlib', 'seaborn', 'numpy']
         
         deps_status = "DEPENDENCY CHECK\n" + "="*40 + "\n\n"
         
         for package in required_packages:
-            try:
-                __import__(package)
+            if importlib.util.find_spec(package) is not None:
                 deps_status += f"✅ {package}: Installed\n"
-            except ImportError:
+            else:
                 deps_status += f"❌ {package}: Missing\n"
         
         deps_status += f"\n🐍 Python Version: {sys.version}\n"
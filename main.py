@@ -67,8 +67,13 @@ def generate_sample_data():
         return None
 
 
-def run_sales_analysis():
-    """Run sales analysis and generate reports."""
+def run_sales_analysis(period=None):
+    """
+    Run sales analysis and generate reports.
+    
+    period limits the report to a date range such as 'last_7_days', 'this_month'
+    or '2025-03'; only the month partitions overlapping it are read.
+    """
     try:
         from python_scripts.sales_analyzer import SalesAnalyzer
         
@@ -80,8 +85,9 @@ def run_sales_analysis():
         
         print("Running sales analysis...")
         analyzer = SalesAnalyzer(sample_file)
-        analyzer.load_sales_data()
-        report = analyzer.generate_sales_report()
+        if period is None:
+            analyzer.load_sales_data()
+        report = analyzer.generate_sales_report(period=period)
         
         print("✓ Sales analysis complete!")
         print("\nGenerated visualizations:")
@@ -212,36 +218,33 @@ def view_project_info():
 
 
 def complete_setup():
-    """Run complete setup process."""
+    """
+    Run complete setup process.
+    
+    The steps run as a pipeline (see sales_pipeline): the template and the
+    sample data are created at the same time, and the analysis starts once
+    the sample data has been written.
+    """
+    from python_scripts.sales_pipeline import setup_pipeline
+    
     print("\n" + "="*50)
     print("         COMPLETE SETUP")
     print("="*50)
     
-    success = True
-    
-    # Step 1: Create Excel template
-    print("\nStep 1: Creating Excel Template")
-    if create_excel_template():
-        print("✓ Excel template created successfully")
-    else:
-        print("✗ Failed to create Excel template")
-        success = False
+    def show_progress(event):
+        if event['state'] == 'started':
+            print(f"\n▶ {event['label']} started ({event['fraction']:.0%} done)")
+        elif event['state'] == 'finished':
+            print(f"✓ {event['label']} finished in {event['seconds']:.2f}s ({event['fraction']:.0%} done)")
+        else:
+            print(f"✗ {event['label']} {event['state']}: {event['error']}")
     
-    # Step 2: Generate sample data
-    print("\nStep 2: Generating Sample Data")
-    if generate_sample_data():
-        print("✓ Sample data generated successfully")
-    else:
-        print("✗ Failed to generate sample data")
-        success = False
+    pipeline = setup_pipeline(create_excel_template, generate_sample_data, run_sales_analysis)
+    results = pipeline.run(progress=show_progress)
+    success = all(outcome['state'] == 'finished' for outcome in results.values())
     
-    # Step 3: Run analysis
-    print("\nStep 3: Running Sales Analysis")
-    if run_sales_analysis():
-        print("✓ Sales analysis completed successfully")
-    else:
-        print("✗ Failed to run sales analysis")
-        success = False
+    print("\nStage timings:")
+    print(pipeline.summary(results))
     
     if success:
         print("\n" + "="*50)
@@ -279,7 +282,8 @@ def main():
             elif choice == '2':
                 generate_sample_data()
             elif choice == '3':
-                run_sales_analysis()
+                period = input("Period (e.g. last_7_days, this_month, 2025-03; Enter for all): ").strip()
+                run_sales_analysis(period or None)
             elif choice == '4':
                 complete_setup()
             elif choice == '5':
@@ -0,0 +1,145 @@
+"""
+Aggregation Benchmark
+Times the report's original separate pandas groupby calls against the
+single-pass AggregationPlan on both group-by backends, using a large synthetic
+dataset. Both sides build the same tables; the plan's KLL value sketches are
+timed on their own line, and chart rendering is not included.
+"""
+
+import argparse
+import time
+import warnings
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+try:
+    from python_scripts.generate_sample_data import SampleDataGenerator
+    from python_scripts.groupby_engine import BACKENDS
+    from python_scripts.sales_aggregates import AggregationPlan, best_sellers
+    from python_scripts.sales_sketches import ValueSketches
+except ImportError:
+    from generate_sample_data import SampleDataGenerator
+    from groupby_engine import BACKENDS
+    from sales_aggregates import AggregationPlan, best_sellers
+    from sales_sketches import ValueSketches
+
+
+def build_synthetic_sales(rows: int, days: int = 365, seed: int = 0) -> pd.DataFrame:
+    """Build a cleaned sales DataFrame with the same columns as "Sales Entry"."""
+    rng = np.random.default_rng(seed)
+    generator = SampleDataGenerator()
+
+    catalogue = [(product, category) for category, products in generator.products.items()
+                 for product in products]
+    product_index = rng.integers(0, len(catalogue), rows)
+    products = np.array([product for product, _ in catalogue], dtype=object)
+    categories = np.array([category for _, category in catalogue], dtype=object)
+
+    quantity = rng.choice([1, 2, 3, 4, 5], size=rows, p=[0.5, 0.3, 0.15, 0.04, 0.01])
+    unit_price = np.round(rng.uniform(0.99, 15.99, rows), 2)
+
+    return pd.DataFrame({
+        'Date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, days, rows), unit='D'),
+        'Product Name': products[product_index],
+        'Category': categories[product_index],
+        'Quantity Sold': quantity,
+        'Unit Price': unit_price,
+        'Total Amount': np.round(quantity * unit_price, 2),
+        'Payment Method': rng.choice(generator.payment_methods, size=rows),
+        'Customer Type': rng.choice(generator.customer_types, size=rows)
+    })
+
+
+def _time(func: Callable, repeat: int) -> float:
+    """Return the best wall time of several runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def separate_groupbys(sales_data: pd.DataFrame) -> None:
+    """
+    Build the report's tables with the separate pandas groupby calls it made
+    before the shared aggregation plan (key metrics, daily, product, category
+    and payment), one groupby per consumer.
+    """
+    sales_data['Total Amount'].sum()
+    sales_data['Total Amount'].mean()
+    sales_data.groupby('Product Name')['Quantity Sold'].sum().idxmax()
+    sales_data['Date'].min()
+    sales_data['Date'].max()
+
+    daily_summary = sales_data.groupby('Date').agg({
+        'Total Amount': ['sum', 'count', 'mean'],
+        'Quantity Sold': 'sum'
+    }).round(2)
+    daily_summary['Best Selling Product'] = best_sellers(
+        sales_data.groupby(['Date', 'Product Name']).size()).reindex(daily_summary.index)
+
+    sales_data.groupby('Product Name').agg({
+        'Quantity Sold': 'sum',
+        'Total Amount': ['sum', 'mean'],
+        'Date': ['min', 'max', 'count']
+    }).round(2)
+
+    sales_data.groupby('Category')['Total Amount'].sum().sort_values(ascending=False)
+
+    sales_data.groupby('Payment Method').agg({
+        'Total Amount': 'sum',
+        'Date': 'count'
+    }).round(2)
+
+
+def run_benchmark(rows: int = 1_000_000, repeat: int = 3) -> Dict[str, float]:
+    """
+    Time each aggregation path and print the timings.
+
+    The shared plan is built without its value sketches so that both sides
+    produce the same tables; building the sketches is timed separately, as
+    the extra work the report's plan does for quantiles.
+    """
+    sales_data = build_synthetic_sales(rows)
+    with warnings.catch_warnings():
+        # The original path rounds the product table's date columns too, which pandas warns about
+        warnings.simplefilter('ignore', UserWarning)
+        timings = {'separate_groupbys': _time(lambda: separate_groupbys(sales_data), repeat)}
+
+    for backend in BACKENDS:
+        def shared_plan_path():
+            plan = AggregationPlan.from_frame(sales_data, backend, sketches=False)
+            plan.key_metrics()
+            plan.daily_summary()
+            plan.product_performance()
+            plan.category_sales()
+            plan.payment_summary()
+
+        timings[f'{backend}_shared_plan'] = _time(shared_plan_path, repeat)
+
+    timings['value_sketches'] = _time(lambda: ValueSketches.from_frame(sales_data), repeat)
+
+    baseline = timings['separate_groupbys']
+    print(f"Aggregation benchmark on {rows:,} rows (best of {repeat}):")
+    print(f"- Separate pandas groupbys (original path): {baseline:.3f}s (1.0x)")
+    for backend in BACKENDS:
+        seconds = timings[f'{backend}_shared_plan']
+        print(f"- Shared aggregation plan [{backend}], no sketches: {seconds:.3f}s ({baseline / seconds:.1f}x)")
+    print(f"- Value sketches for the plan (extra, not in the rows above): {timings['value_sketches']:.3f}s")
+    return timings
+
+
+def main():
+    """Run the aggregation benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark sales report aggregation")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="number of synthetic rows")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per path")
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
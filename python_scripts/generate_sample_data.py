@@ -5,15 +5,123 @@ Generates realistic sample sales data for testing the Daily Sales Sheet system.
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+import argparse
 import random
 import os
 
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    from python_scripts.groupby_engine import group_aggregate
+    from python_scripts.sales_money import amount_cents, divide_cents, format_cents, to_dollars
+except ImportError:
+    from groupby_engine import group_aggregate
+    from sales_money import amount_cents, divide_cents, format_cents, to_dollars
+
+
+OUTPUT_FORMATS = ('xlsx', 'csv', 'parquet')
+DAILY_SUMMARY_COLUMNS = ['Total Sales', 'Total Transactions', 'Average Sale', 'Total Quantity']
+PRODUCT_SUMMARY_COLUMNS = ['Total Quantity', 'Total Revenue', 'Avg Sale Value', 'Sale Count']
+
+
+class RunningSummaries:
+    """
+    Daily Summary and Product Analysis totals folded in one chunk at a time.
+    
+    Only per-day and per-product sums and counts are kept, so memory depends on
+    the number of days and products rather than on the number of rows written.
+    Amounts are summed as integer cents.
+    """
+    
+    def __init__(self, backend: str = 'pandas'):
+        self.backend = backend
+        self.daily_parts = []
+        self.products = None
+    
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Add one chunk of sales rows to the running totals."""
+        if chunk.empty:
+            return
+        
+        chunk = chunk.assign(amount_cents=amount_cents(chunk))
+        daily = group_aggregate(chunk, 'Date', {
+            'amount_cents': ['sum', 'count'],
+            'Quantity Sold': 'sum'
+        }, self.backend)
+        daily.columns = ['amount_cents', 'amount_count', 'quantity_sum']
+        self.daily_parts.append(daily)
+        
+        products = group_aggregate(chunk, ['Product Name', 'Category'], {
+            'Quantity Sold': 'sum',
+            'amount_cents': ['sum', 'count']
+        }, self.backend)
+        products.columns = ['quantity_sum', 'amount_cents', 'amount_count']
+        self.products = products if self.products is None else self.products.add(products, fill_value=0)
+        
+        # Day-sized chunks give one row per part; fold them now and then
+        if len(self.daily_parts) >= 256:
+            self.daily_parts = [self._daily_totals()]
+    
+    def _daily_totals(self) -> pd.DataFrame:
+        """Sum the collected per-day parts, in case a day spans several chunks."""
+        return pd.concat(self.daily_parts).groupby(level=0).sum()
+    
+    def total_cents(self) -> int:
+        """Return the total amount of all rows seen so far, in cents."""
+        return 0 if self.products is None else int(self.products['amount_cents'].sum())
+    
+    def daily_summary(self) -> pd.DataFrame:
+        """Return the Daily Summary sheet, indexed by date."""
+        if not self.daily_parts:
+            return pd.DataFrame(columns=DAILY_SUMMARY_COLUMNS)
+        daily = self._daily_totals()
+        daily_summary = pd.DataFrame({
+            'Total Sales': to_dollars(daily['amount_cents']),
+            'Total Transactions': daily['amount_count'].astype(np.int64),
+            'Average Sale': to_dollars(divide_cents(daily['amount_cents'], daily['amount_count'])),
+            'Total Quantity': daily['quantity_sum'].astype(np.int64)
+        }).round(2)
+        return daily_summary
+    
+    def product_summary(self) -> pd.DataFrame:
+        """Return the Product Analysis sheet, indexed by product and category."""
+        if self.products is None:
+            return pd.DataFrame(columns=PRODUCT_SUMMARY_COLUMNS)
+        products = self.products.sort_index()
+        product_summary = pd.DataFrame({
+            'Total Quantity': products['quantity_sum'].astype(np.int64),
+            'Total Revenue': to_dollars(products['amount_cents']),
+            'Avg Sale Value': to_dollars(divide_cents(products['amount_cents'], products['amount_count'])),
+            'Sale Count': products['amount_count'].astype(np.int64)
+        }).round(2)
+        return product_summary
+
 
 class SampleDataGenerator:
     """Generates sample sales data for testing purposes."""
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None, progress: Optional[Callable[[float, str], None]] = None):
+        """
+        Set up product catalogue and price ranges.
+        
+        seed makes both generation paths reproducible: the row-by-row path uses
+        a seeded random.Random and the vectorized path a seeded NumPy Generator.
+        progress, if given, is called with a fraction (0 to 1) and a message as
+        generate_and_save makes and writes the days.
+        """
+        self.seed = seed
+        self.progress = progress
+        self.random = random.Random(seed)
         self.products = {
             'Food': ['Sandwich', 'Burger', 'Pizza Slice', 'Salad', 'Wrap', 'Soup'],
             'Beverage': ['Coffee', 'Tea', 'Juice', 'Soda', 'Water', 'Smoothie'],
@@ -31,6 +139,15 @@ class SampleDataGenerator:
             'Snack': (0.99, 4.99),
             'Dessert': (2.99, 8.99)
         }
+        
+        # Quantity distribution: most sales are 1-3 items
+        self.quantities = [1, 2, 3, 4, 5]
+        self.quantity_weights = [50, 30, 15, 4, 1]
+    
+    def _report_progress(self, fraction: float, message: str) -> None:
+        """Pass progress to the callback given to the constructor, if any."""
+        if self.progress is not None:
+            self.progress(fraction, message)
     
     def generate_sample_data(self, days: int = 30, min_transactions_per_day: int = 20, 
                            max_transactions_per_day: int = 50) -> pd.DataFrame:
@@ -44,32 +161,33 @@ class SampleDataGenerator:
             
             # Vary transactions based on day of week (weekends busier)
             if current_date.weekday() in [5, 6]:  # Weekend
-                num_transactions = random.randint(int(max_transactions_per_day * 0.8), max_transactions_per_day)
+                num_transactions = self.random.randint(int(max_transactions_per_day * 0.8), max_transactions_per_day)
             else:  # Weekday
-                num_transactions = random.randint(min_transactions_per_day, int(max_transactions_per_day * 0.7))
+                num_transactions = self.random.randint(min_transactions_per_day, int(max_transactions_per_day * 0.7))
             
             for _ in range(num_transactions):
                 # Select random category and product
-                category = random.choice(list(self.products.keys()))
-                product = random.choice(self.products[category])
+                category = self.random.choice(list(self.products.keys()))
+                product = self.random.choice(self.products[category])
                 
                 # Generate realistic quantity (most sales are 1-3 items)
-                quantity = random.choices([1, 2, 3, 4, 5], weights=[50, 30, 15, 4, 1])[0]
+                quantity = self.random.choices(self.quantities, weights=self.quantity_weights)[0]
                 
                 # Generate price within category range
                 min_price, max_price = self.price_ranges[category]
-                unit_price = round(random.uniform(min_price, max_price), 2)
+                unit_cents = round(self.random.uniform(min_price, max_price) * 100)
+                unit_price = unit_cents / 100
                 
-                # Calculate total
-                total_amount = round(quantity * unit_price, 2)
+                # Calculate total in whole cents so it is exact
+                total_amount = quantity * unit_cents / 100
                 
                 # Select payment method and customer type
-                payment_method = random.choice(self.payment_methods)
-                customer_type = random.choice(self.customer_types)
+                payment_method = self.random.choice(self.payment_methods)
+                customer_type = self.random.choice(self.customer_types)
                 
                 # Add some time variation within the day
-                hour = random.randint(8, 20)  # Shop open 8 AM to 8 PM
-                minute = random.randint(0, 59)
+                hour = self.random.randint(8, 20)  # Shop open 8 AM to 8 PM
+                minute = self.random.randint(0, 59)
                 transaction_time = current_date.replace(hour=hour, minute=minute)
                 
                 sales_data.append({
@@ -82,70 +200,290 @@ class SampleDataGenerator:
                     'Payment Method': payment_method,
                     'Customer Type': customer_type
                 })
+            
+            self._report_progress(0.6 * (day + 1) / days, f"Generated day {day + 1} of {days}")
         
         return pd.DataFrame(sales_data)
     
-    def save_sample_data(self, data: pd.DataFrame, filename: str = "sample_sales_data.xlsx") -> str:
-        """Save sample data to Excel file."""
+    def _daily_transaction_counts(self, rng: np.random.Generator, days: int,
+                                  min_transactions_per_day: int, max_transactions_per_day: int,
+                                  start_date: Optional[date]) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw each day's transaction count, with the weekend uplift."""
+        if start_date is None:
+            start_date = (datetime.now() - timedelta(days=days)).date()
+        
+        dates = np.datetime64(start_date, 'D') + np.arange(days)
+        weekend = pd.DatetimeIndex(dates).weekday.isin([5, 6])
+        low = np.where(weekend, int(max_transactions_per_day * 0.8), min_transactions_per_day)
+        high = np.where(weekend, max_transactions_per_day, int(max_transactions_per_day * 0.7))
+        return dates, rng.integers(low, high + 1)
+    
+    def _draw_rows(self, rng: np.random.Generator, dates: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+        """Draw counts[i] sales rows for each dates[i] as one DataFrame."""
+        rows = int(counts.sum())
+        
+        # Category, then a product within that category
+        categories = list(self.products.keys())
+        category_codes = rng.integers(0, len(categories), rows)
+        sizes = np.array([len(self.products[category]) for category in categories])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        product_codes = offsets[category_codes] + (rng.random(rows) * sizes[category_codes]).astype(np.int64)
+        product_names = np.array([product for category in categories for product in self.products[category]],
+                                 dtype=object)
+        
+        # Quantities and prices
+        weights = np.array(self.quantity_weights, dtype=float)
+        quantity = rng.choice(np.array(self.quantities), size=rows, p=weights / weights.sum())
+        price_low = np.array([self.price_ranges[category][0] for category in categories])
+        price_high = np.array([self.price_ranges[category][1] for category in categories])
+        unit_cents = np.round(rng.uniform(price_low[category_codes], price_high[category_codes]) * 100).astype(np.int64)
+        total_cents = quantity * unit_cents
+        
+        payment_methods = np.array(self.payment_methods, dtype=object)
+        customer_types = np.array(self.customer_types, dtype=object)
+        
+        return pd.DataFrame({
+            'Date': np.repeat(dates, counts),
+            'Product Name': product_names[product_codes],
+            'Category': np.array(categories, dtype=object)[category_codes],
+            'Quantity Sold': quantity,
+            'Unit Price': unit_cents / 100,
+            'Total Amount': total_cents / 100,
+            'Payment Method': payment_methods[rng.integers(0, len(payment_methods), rows)],
+            'Customer Type': customer_types[rng.integers(0, len(customer_types), rows)]
+        })
+    
+    def generate_sample_data_vectorized(self, days: int = 30, min_transactions_per_day: int = 20,
+                                        max_transactions_per_day: int = 50,
+                                        start_date: Optional[date] = None) -> pd.DataFrame:
+        """
+        Generate sample sales data with NumPy arrays instead of one row at a time.
+        
+        Uses the same rules as generate_sample_data: busier weekends, uniform
+        category/product choice, category price ranges and weighted quantities.
+        Each day's transaction count and every row attribute are drawn as arrays
+        from a NumPy Generator seeded with self.seed, so the same seed and
+        start_date always give the same rows. start_date defaults to `days`
+        days before today. Dates are returned as datetime64 values.
+        """
+        rng = np.random.default_rng(self.seed)
+        dates, counts = self._daily_transaction_counts(rng, days, min_transactions_per_day,
+                                                       max_transactions_per_day, start_date)
+        return self._draw_rows(rng, dates, counts)
+    
+    def iter_sample_chunks(self, days: int = 30, min_transactions_per_day: int = 20,
+                           max_transactions_per_day: int = 50,
+                           start_date: Optional[date] = None) -> Iterator[pd.DataFrame]:
+        """
+        Yield vectorized sample data one day at a time.
+        
+        Only one day's rows are held in memory. The output is reproducible for a
+        given seed and start_date, but differs from generate_sample_data_vectorized
+        because the random draws are made in a different order.
+        """
+        rng = np.random.default_rng(self.seed)
+        dates, counts = self._daily_transaction_counts(rng, days, min_transactions_per_day,
+                                                       max_transactions_per_day, start_date)
+        for day, count in zip(dates, counts):
+            yield self._draw_rows(rng, day[np.newaxis], count[np.newaxis])
+    
+    def save_sample_data(self, data: pd.DataFrame, filename: str = "sample_sales_data.xlsx",
+                         backend: str = 'pandas') -> str:
+        """Save sample data to Excel file, summarizing with the chosen group-by backend."""
         os.makedirs("sample_data", exist_ok=True)
         filepath = os.path.join("sample_data", filename)
         
         # Create Excel file with multiple sheets
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+        # Show datetime64 dates (from the vectorized path) like plain dates
+        with pd.ExcelWriter(filepath, engine='openpyxl', datetime_format='YYYY-MM-DD') as writer:
             # Main sales data
             data.to_excel(writer, sheet_name='Sales Entry', index=False)
             
-            # Daily summary
-            daily_summary = data.groupby('Date').agg({
-                'Total Amount': ['sum', 'count', 'mean'],
-                'Quantity Sold': 'sum'
-            }).round(2)
-            daily_summary.columns = ['Total Sales', 'Total Transactions', 'Average Sale', 'Total Quantity']
-            daily_summary.to_excel(writer, sheet_name='Daily Summary')
-            
-            # Product analysis
-            product_summary = data.groupby(['Product Name', 'Category']).agg({
-                'Quantity Sold': 'sum',
-                'Total Amount': ['sum', 'mean'],
-                'Date': 'count'
-            }).round(2)
-            product_summary.columns = ['Total Quantity', 'Total Revenue', 'Avg Sale Value', 'Sale Count']
-            product_summary.to_excel(writer, sheet_name='Product Analysis')
+            # Summaries, with amounts summed as integer cents
+            totals = RunningSummaries(backend)
+            totals.update(data)
+            totals.daily_summary().to_excel(writer, sheet_name='Daily Summary')
+            totals.product_summary().to_excel(writer, sheet_name='Product Analysis')
         
         return filepath
     
-    def generate_and_save(self, days: int = 30) -> str:
-        """Generate and save sample data in one step."""
+    def _summary_rows(self, summary: pd.DataFrame) -> Iterator[list]:
+        """Yield a summary table as a header row and plain value rows."""
+        yield list(summary.index.names) + list(summary.columns)
+        for row in summary.reset_index().itertuples(index=False, name=None):
+            yield [value.date() if isinstance(value, pd.Timestamp) else value for value in row]
+    
+    def _write_xlsx(self, chunks: Iterable[pd.DataFrame], filepath: str,
+                    totals: RunningSummaries) -> None:
+        """Stream chunks into a write-only workbook with the three usual sheets."""
+        workbook = Workbook(write_only=True)
+        sales_sheet = workbook.create_sheet('Sales Entry')
+        header_written = False
+        bold = Font(bold=True)
+        
+        for chunk in chunks:
+            totals.update(chunk)
+            if not header_written:
+                header = []
+                for name in chunk.columns:
+                    cell = WriteOnlyCell(sales_sheet, value=name)
+                    cell.font = bold
+                    header.append(cell)
+                sales_sheet.append(header)
+                header_written = True
+            
+            rows = chunk.assign(Date=pd.to_datetime(chunk['Date']).dt.date)
+            for row in rows.itertuples(index=False, name=None):
+                sales_sheet.append(row)
+        
+        for sheet_name, summary in [('Daily Summary', totals.daily_summary()),
+                                    ('Product Analysis', totals.product_summary())]:
+            sheet = workbook.create_sheet(sheet_name)
+            for row in self._summary_rows(summary):
+                sheet.append(row)
+        
+        workbook.save(filepath)
+    
+    def _write_csv(self, chunks: Iterable[pd.DataFrame], filepath: str,
+                   totals: RunningSummaries) -> None:
+        """Append chunks to a CSV file; summaries go to sibling CSV files."""
+        first = True
+        for chunk in chunks:
+            totals.update(chunk)
+            chunk.to_csv(filepath, mode='w' if first else 'a', header=first, index=False,
+                         date_format='%Y-%m-%d')
+            first = False
+        
+        root, _ = os.path.splitext(filepath)
+        totals.daily_summary().to_csv(root + '_daily_summary.csv', date_format='%Y-%m-%d')
+        totals.product_summary().to_csv(root + '_product_analysis.csv')
+    
+    def _write_parquet(self, chunks: Iterable[pd.DataFrame], filepath: str,
+                       totals: RunningSummaries) -> None:
+        """Write each chunk as a Parquet row group; summaries go to sibling files."""
+        if pyarrow is None:
+            raise ImportError("Parquet output needs the optional 'pyarrow' package")
+        
+        writer = None
+        try:
+            for chunk in chunks:
+                totals.update(chunk)
+                if writer is None:
+                    table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+                    writer = pyarrow.parquet.ParquetWriter(filepath, table.schema)
+                else:
+                    table = pyarrow.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        root, _ = os.path.splitext(filepath)
+        totals.daily_summary().to_parquet(root + '_daily_summary.parquet')
+        totals.product_summary().to_parquet(root + '_product_analysis.parquet')
+    
+    def stream_sample_data(self, chunks: Iterable[pd.DataFrame], filename: str = "sample_sales_data.xlsx",
+                           output_format: str = 'xlsx',
+                           backend: str = 'pandas') -> Tuple[str, RunningSummaries]:
+        """
+        Write sales chunks to disk as they arrive, without holding every row.
+        
+        xlsx output uses a write-only (constant memory) workbook with the same
+        three sheets as save_sample_data. csv and parquet output write the sales
+        rows to one file and the two summaries to "_daily_summary" and
+        "_product_analysis" files next to it. The summaries are built from
+        running totals, so no final groupby over all rows is needed.
+        
+        Returns the sales file path and the running totals.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}'. Choose from: {', '.join(OUTPUT_FORMATS)}")
+        
+        os.makedirs("sample_data", exist_ok=True)
+        root, _ = os.path.splitext(filename)
+        filepath = os.path.join("sample_data", f"{root}.{output_format}")
+        
+        totals = RunningSummaries(backend)
+        writers = {'xlsx': self._write_xlsx, 'csv': self._write_csv, 'parquet': self._write_parquet}
+        writers[output_format](chunks, filepath, totals)
+        return filepath, totals
+    
+    def _chunks_with_progress(self, chunks: Iterable[pd.DataFrame], days: int) -> Iterator[pd.DataFrame]:
+        """Pass day-sized chunks through, reporting each one as it is written."""
+        for day, chunk in enumerate(chunks, start=1):
+            yield chunk
+            self._report_progress(0.95 * day / days, f"Wrote day {day} of {days}")
+    
+    def generate_and_save(self, days: int = 30, vectorized: bool = False, streaming: bool = False,
+                          output_format: str = 'xlsx') -> str:
+        """
+        Generate and save sample data in one step.
+        
+        With streaming, day-sized vectorized chunks are written as they are
+        generated (see stream_sample_data) instead of building one DataFrame.
+        """
         print(f"Generating {days} days of sample sales data...")
+        self._report_progress(0.0, f"Generating {days} days of sample data")
         
-        sample_data = self.generate_sample_data(days)
-        filepath = self.save_sample_data(sample_data)
+        if streaming:
+            chunks = self._chunks_with_progress(self.iter_sample_chunks(days), days)
+            filepath, totals = self.stream_sample_data(chunks, output_format=output_format)
+            daily = totals.daily_summary()
+            products = totals.product_summary()
+            total_cents = totals.total_cents()
+            total_transactions = int(daily['Total Transactions'].sum())
+            first_date, last_date = daily.index.min(), daily.index.max()
+            product_names = products.index.get_level_values('Product Name')
+            categories = products.index.get_level_values('Category').unique()
+        else:
+            if vectorized:
+                sample_data = self.generate_sample_data_vectorized(days)
+            else:
+                sample_data = self.generate_sample_data(days)
+            self._report_progress(0.6, f"Saving {len(sample_data):,} sales records")
+            filepath = self.save_sample_data(sample_data)
+            
+            total_cents = int(amount_cents(sample_data).sum())
+            total_transactions = len(sample_data)
+            dates = pd.to_datetime(sample_data['Date'])
+            first_date, last_date = dates.min(), dates.max()
+            product_names = sample_data['Product Name']
+            categories = sample_data['Category'].unique()
         
         # Print summary statistics
-        total_sales = sample_data['Total Amount'].sum()
-        total_transactions = len(sample_data)
-        avg_transaction = sample_data['Total Amount'].mean()
-        date_range = f"{sample_data['Date'].min()} to {sample_data['Date'].max()}"
+        avg_cents = divide_cents(total_cents, total_transactions)
+        date_range = f"{pd.Timestamp(first_date).date()} to {pd.Timestamp(last_date).date()}"
         
         print(f"\nSample data generated successfully!")
         print(f"File saved: {filepath}")
         print(f"\nData Summary:")
         print(f"- Period: {date_range}")
         print(f"- Total Transactions: {total_transactions:,}")
-        print(f"- Total Sales: ${total_sales:,.2f}")
-        print(f"- Average Transaction: ${avg_transaction:.2f}")
-        print(f"- Products: {sample_data['Product Name'].nunique()} unique items")
-        print(f"- Categories: {', '.join(sample_data['Category'].unique())}")
+        print(f"- Total Sales: {format_cents(total_cents)}")
+        print(f"- Average Transaction: {format_cents(avg_cents, grouping=False)}")
+        print(f"- Products: {pd.Series(product_names).nunique()} unique items")
+        print(f"- Categories: {', '.join(categories)}")
         
+        self._report_progress(1.0, "Sample data saved")
         return filepath
 
 
 def main():
     """Generate sample sales data."""
-    generator = SampleDataGenerator()
+    parser = argparse.ArgumentParser(description="Generate sample sales data")
+    parser.add_argument('--days', type=int, default=30, help="number of days to generate")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for reproducible data")
+    parser.add_argument('--vectorized', action='store_true', help="use the fast NumPy generator")
+    parser.add_argument('--streaming', action='store_true',
+                        help="write day-sized chunks as they are generated (implies --vectorized)")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='xlsx', help="output format for --streaming")
+    args = parser.parse_args()
+    
+    generator = SampleDataGenerator(seed=args.seed)
     
-    # Generate 30 days of sample data
-    filepath = generator.generate_and_save(days=30)
+    # Generate 30 days of sample data by default
+    filepath = generator.generate_and_save(days=args.days, vectorized=args.vectorized,
+                                           streaming=args.streaming, output_format=args.format)
     
     print(f"\nYou can now:")
     print("1. Open the sample data file to review the generated data")
@@ -0,0 +1,197 @@
+"""
+Group-By Engines
+Runs ``df.groupby(keys).agg(spec)`` either through pandas or through an
+integer-coded NumPy engine that factorizes the key columns once and reduces
+the values with bincount / ufunc.at kernels.
+"""
+
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+BACKENDS = ('pandas', 'numpy')
+SUPPORTED_FUNCTIONS = ('sum', 'count', 'mean', 'min', 'max', 'size')
+
+AggSpec = Dict[str, Union[str, List[str]]]
+
+
+def check_backend(backend: str) -> None:
+    """Raise a ValueError for unknown backend names."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown aggregation backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+
+
+def group_aggregate(data: Union[pd.DataFrame, 'CodedFrame'], keys: Union[str, Sequence[str]],
+                    spec: AggSpec, backend: str = 'pandas', dropna: bool = True) -> pd.DataFrame:
+    """
+    Aggregate rows by keys with a pandas-style dict spec on the chosen backend.
+
+    data may be a DataFrame or a CodedFrame; passing the same CodedFrame to
+    repeated numpy-backend calls reuses its factorized key columns.
+    """
+    check_backend(backend)
+    if backend == 'pandas':
+        df = data.df if isinstance(data, CodedFrame) else data
+        return df.groupby(keys, dropna=dropna).agg(spec)
+    coded = data if isinstance(data, CodedFrame) else CodedFrame(data)
+    return coded.aggregate(keys, spec, dropna)
+
+
+def _reduce(values: pd.Series, group_ids: np.ndarray, n_groups: int, func: str) -> np.ndarray:
+    """Apply one reduction to values already restricted to grouped rows."""
+    if func == 'size':
+        return np.bincount(group_ids, minlength=n_groups)
+
+    present = values.notna().to_numpy()
+    if func == 'count':
+        return np.bincount(group_ids[present], minlength=n_groups)
+
+    if isinstance(values.dtype, pd.api.extensions.ExtensionDtype) and values.dtype.kind in 'iub':
+        # Nullable integers (e.g. cents with gaps); masked entries are not in present
+        array = values.to_numpy(dtype=values.dtype.numpy_dtype, na_value=0)
+    else:
+        array = values.to_numpy()
+    ids = group_ids[present]
+    if func in ('sum', 'mean'):
+        weights = array[present].astype(np.float64)
+        totals = np.bincount(ids, weights=weights, minlength=n_groups)
+        if array.dtype.kind in 'iub':
+            if np.abs(weights).sum() < 2 ** 53:
+                totals = totals.astype(np.int64)  # float64 sums of these ints are exact
+            else:
+                totals = np.zeros(n_groups, dtype=np.int64)
+                np.add.at(totals, ids, array[present].astype(np.int64))
+        if func == 'sum':
+            return totals
+        counts = np.bincount(ids, minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+
+    # min / max on an integer view so datetimes and ints share one kernel
+    is_datetime = array.dtype.kind == 'M'
+    data = array.view(np.int64) if is_datetime else array.astype(np.float64)
+    info = np.iinfo(np.int64) if is_datetime else None
+    if func == 'min':
+        fill = info.max if is_datetime else np.inf
+        result = np.full(n_groups, fill, dtype=data.dtype)
+        np.minimum.at(result, ids, data[present])
+    else:
+        fill = info.min if is_datetime else -np.inf
+        result = np.full(n_groups, fill, dtype=data.dtype)
+        np.maximum.at(result, ids, data[present])
+
+    empty = np.bincount(ids, minlength=n_groups) == 0
+    if is_datetime:
+        result[empty] = np.iinfo(np.int64).min  # NaT
+        return result.view(array.dtype)
+    result[empty] = np.nan
+    if array.dtype.kind in 'iu' and not empty.any():
+        return result.astype(array.dtype)
+    return result
+
+
+class CodedFrame:
+    """
+    A DataFrame whose key columns are factorized into integer codes once.
+
+    Codes and group ids are cached, so several aggregations over the same rows
+    (daily, product, category, payment...) only pay for factorizing each key
+    column the first time it is used.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._codes = {}
+        self._groups = {}
+
+    def codes(self, column: str, dropna: bool = True) -> Tuple[np.ndarray, pd.Index]:
+        """Return sorted integer codes and unique values for a column."""
+        if column not in self._codes:
+            self._codes[column] = pd.factorize(self.df[column], sort=True)
+        codes, uniques = self._codes[column]
+        if dropna or not (codes < 0).any():
+            return codes, pd.Index(uniques)
+
+        # Missing values become their own group, sorted last like pandas does
+        codes = np.where(codes < 0, len(uniques), codes)
+        return codes, pd.Index(uniques).append(pd.Index([np.nan]))
+
+    def groups(self, keys: List[str], dropna: bool = True) -> Tuple[np.ndarray, np.ndarray, pd.Index]:
+        """
+        Return the grouped-row mask, dense group ids and sorted group index.
+
+        The group order matches a sorted pandas groupby over the same keys.
+        """
+        cache_key = (tuple(keys), dropna)
+        if cache_key in self._groups:
+            return self._groups[cache_key]
+
+        codes_list = []
+        uniques_list = []
+        valid = np.ones(len(self.df), dtype=bool)
+        for key in keys:
+            codes, uniques = self.codes(key, dropna)
+            valid &= codes >= 0
+            codes_list.append(codes)
+            uniques_list.append(uniques)
+
+        shape = tuple(max(len(uniques), 1) for uniques in uniques_list)
+        combined = np.ravel_multi_index([codes[valid] for codes in codes_list], shape)
+        key_space = int(np.prod(shape))
+        if key_space <= max(4 * len(combined), 1 << 20):
+            # Dense lookup table over the key space: linear time, no sort needed
+            occupied = np.bincount(combined, minlength=key_space) > 0
+            group_keys = np.flatnonzero(occupied)
+            lookup = np.cumsum(occupied) - 1
+            group_ids = lookup[combined]
+        else:
+            group_keys, group_ids = np.unique(combined, return_inverse=True)
+
+        key_codes = np.unravel_index(group_keys, shape)
+        if len(keys) == 1:
+            index = pd.Index(uniques_list[0].take(key_codes[0]), name=keys[0])
+        else:
+            index = pd.MultiIndex(levels=uniques_list, codes=list(key_codes), names=keys)
+
+        self._groups[cache_key] = (valid, group_ids, index)
+        return self._groups[cache_key]
+
+    def aggregate(self, keys: Union[str, Sequence[str]], spec: AggSpec,
+                  dropna: bool = True) -> pd.DataFrame:
+        """
+        NumPy implementation of ``df.groupby(keys, dropna=dropna).agg(spec)``.
+
+        The result has the same index, column layout and dtypes as pandas returns
+        for the supported functions: sum, count, mean, min, max and size.
+        """
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        multi_column = any(not isinstance(funcs, str) for funcs in spec.values())
+
+        if self.df.empty:
+            return self.df.groupby(keys, dropna=dropna).agg(spec)
+
+        valid, group_ids, index = self.groups(keys, dropna)
+        n_groups = len(index)
+        all_rows = valid.all()
+
+        columns = {}
+        for column, funcs in spec.items():
+            values = self.df[column] if all_rows else self.df[column][valid]
+            for func in ([funcs] if isinstance(funcs, str) else funcs):
+                if func not in SUPPORTED_FUNCTIONS:
+                    raise ValueError(f"The numpy backend does not support '{func}'")
+                label = (column, func) if multi_column else column
+                columns[label] = _reduce(values, group_ids, n_groups, func)
+
+        result = pd.DataFrame(columns, index=index)
+        if multi_column:
+            result.columns = pd.MultiIndex.from_tuples(list(columns))
+        return result
+
+
+def numpy_group_aggregate(df: pd.DataFrame, keys: Union[str, Sequence[str]], spec: AggSpec,
+                          dropna: bool = True) -> pd.DataFrame:
+    """One-off NumPy aggregation; use a CodedFrame to reuse codes across calls."""
+    return CodedFrame(df).aggregate(keys, spec, dropna)
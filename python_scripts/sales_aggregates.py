@@ -0,0 +1,233 @@
+"""
+Mergeable Sales Aggregates
+A single-pass aggregation plan shared by the sales report and its charts, plus
+a running version that can be updated batch by batch.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    from python_scripts.groupby_engine import group_aggregate
+    from python_scripts.sales_money import amount_cents, cents_column, divide_cents, to_dollars
+    from python_scripts.sales_sketches import DEFAULT_QUANTILES, ValueSketches
+except ImportError:
+    from groupby_engine import group_aggregate
+    from sales_money import amount_cents, cents_column, divide_cents, to_dollars
+    from sales_sketches import DEFAULT_QUANTILES, ValueSketches
+
+
+def best_sellers(pair_totals: pd.Series) -> pd.Series:
+    """
+    Pick each date's best-selling product from (Date, Product Name) totals.
+
+    The totals can be row counts or summed quantities. Ties are broken in favour
+    of the alphabetically first product name, which is also what the previous
+    per-group ``Series.mode()`` returned.
+    """
+    if pair_totals.empty:
+        return pd.Series(dtype=object)
+
+    # Sorted (date, product) order makes the first maximum per date the winner
+    pair_totals = pair_totals.sort_index()
+    is_top = pair_totals.eq(pair_totals.groupby(level=0).transform('max'))
+    top = pair_totals.index[is_top.to_numpy()]
+    dates = top.get_level_values(0)
+    first = ~dates.duplicated()
+    return pd.Series(top.get_level_values(1)[first], index=dates[first], name='Best Selling Product')
+
+
+class AggregationPlan:
+    """
+    Every grouping the sales report needs, built from one scan of the rows.
+
+    The rows are grouped once at the finest grain any consumer needs (date,
+    product, category and payment method). The daily, product, category and
+    payment tables are then rolled up from that small base table instead of
+    regrouping the raw rows for each one.
+
+    Money is summed as int64 cents, so totals are exact however many plans
+    are merged; it is only turned into dollars in the output tables.
+
+    Plans built from rows also carry a KLL sketch of transaction values per
+    date and category (sketches), merged along with the base table, so
+    quantiles for any date range come from merged sketches. Plans built
+    elsewhere (such as the SQL store's GROUP BY) have no sketches.
+    """
+
+    BASE_KEYS = ['Date', 'Product Name', 'Category', 'Payment Method']
+    MEASURES = ['amount_cents', 'amount_count', 'quantity_sum', 'rows']
+
+    def __init__(self, base: Optional[pd.DataFrame] = None, row_count: int = 0,
+                 sketches: Optional[ValueSketches] = None):
+        self.base = base
+        self.row_count = row_count
+        self.sketches = sketches
+
+    @classmethod
+    def from_frame(cls, sales_data: pd.DataFrame, backend: str = 'pandas',
+                   sketches: bool = True) -> 'AggregationPlan':
+        """
+        Build the plan from cleaned sales rows with a single groupby.
+
+        sketches=False skips the per-(date, category) value sketches, leaving
+        a plan that answers every table but not quantiles.
+        """
+        if sales_data.empty:
+            return cls()
+
+        amount = cents_column('Total Amount')
+        if amount not in sales_data.columns:
+            sales_data = sales_data.assign(**{amount: amount_cents(sales_data)})
+        base = group_aggregate(sales_data, cls.BASE_KEYS, {
+            amount: ['sum', 'count'],
+            'Quantity Sold': 'sum',
+            'Date': 'size'
+        }, backend=backend, dropna=False)
+        base.columns = cls.MEASURES
+        base['amount_cents'] = base['amount_cents'].astype(np.int64)
+        return cls(base, len(sales_data), ValueSketches.from_frame(sales_data) if sketches else None)
+
+    def merge(self, other: 'AggregationPlan') -> 'AggregationPlan':
+        """Return a plan covering the rows of both plans."""
+        if other.empty:
+            return AggregationPlan(self.base, self.row_count, self.sketches)
+        if self.empty:
+            return AggregationPlan(other.base, other.row_count, other.sketches)
+
+        combined = pd.concat([self.base, other.base])
+        levels = list(range(len(self.BASE_KEYS)))
+        base = combined.groupby(level=levels, dropna=False).sum()
+        sketches = None
+        if self.sketches is not None and other.sketches is not None:
+            sketches = self.sketches.merge(other.sketches)
+        return AggregationPlan(base, self.row_count + other.row_count, sketches)
+
+    @property
+    def empty(self) -> bool:
+        """True when no rows have been aggregated."""
+        return self.row_count == 0
+
+    def _rollup(self, keys) -> pd.DataFrame:
+        """Sum the base measures up to a coarser set of keys."""
+        return self.base.groupby(level=keys).sum()
+
+    def daily_totals(self) -> pd.DataFrame:
+        """Return the raw measures summed per date."""
+        if self.empty:
+            return pd.DataFrame(columns=self.MEASURES)
+        return self._rollup('Date')
+
+    def daily_summary(self, best_seller_weight: str = 'rows') -> pd.DataFrame:
+        """Return the table produced by SalesAnalyzer.calculate_daily_summary."""
+        if self.empty:
+            return pd.DataFrame()
+
+        weight_column = 'quantity_sum' if best_seller_weight == 'quantity' else 'rows'
+        best = best_sellers(self._rollup(['Date', 'Product Name'])[weight_column])
+
+        daily = self._rollup('Date')
+        daily_summary = pd.DataFrame({
+            'Total Sales': to_dollars(daily['amount_cents']),
+            'Total Transactions': daily['amount_count'],
+            'Average Sale': to_dollars(divide_cents(daily['amount_cents'], daily['amount_count'])),
+            'Total Quantity': daily['quantity_sum'],
+            'Best Selling Product': best.reindex(daily.index)
+        }).round(2)
+        return daily_summary.reset_index()
+
+    def product_totals(self) -> pd.DataFrame:
+        """Return raw per-product sums, counts and first/last sale dates."""
+        products = self._rollup('Product Name')
+        sale_dates = self.base.index.to_frame(index=False).groupby('Product Name')['Date']
+        products['first_sale'] = sale_dates.min()
+        products['last_sale'] = sale_dates.max()
+        return products
+
+    def product_performance(self) -> pd.DataFrame:
+        """Return the table produced by SalesAnalyzer.analyze_product_performance."""
+        if self.empty:
+            return pd.DataFrame()
+
+        products = self.product_totals()
+        product_analysis = pd.DataFrame({
+            'Total Quantity': products['quantity_sum'],
+            'Total Revenue': to_dollars(products['amount_cents']),
+            'Avg Sale Value': to_dollars(divide_cents(products['amount_cents'], products['amount_count'])),
+            'First Sale': products['first_sale'],
+            'Last Sale': products['last_sale'],
+            'Sale Count': products['rows']
+        })
+        numeric_columns = ['Total Quantity', 'Total Revenue', 'Avg Sale Value', 'Sale Count']
+        product_analysis[numeric_columns] = product_analysis[numeric_columns].round(2)
+        product_analysis = product_analysis.reset_index()
+        return product_analysis.sort_values('Total Revenue', ascending=False)
+
+    def category_sales(self) -> pd.Series:
+        """Return total revenue per category, largest first."""
+        if self.empty:
+            return pd.Series(dtype=float)
+        categories = to_dollars(self._rollup('Category')['amount_cents'])
+        return categories.rename('Total Amount').sort_values(ascending=False)
+
+    def payment_summary(self) -> pd.DataFrame:
+        """Return revenue and transaction count per payment method."""
+        if self.empty:
+            return pd.DataFrame()
+        payments = self._rollup('Payment Method')
+        payment_data = pd.DataFrame({
+            'Total Amount': to_dollars(payments['amount_cents']),
+            'Transaction Count': payments['rows']
+        }).round(2)
+        return payment_data
+
+    def key_metrics(self) -> Dict:
+        """Return the headline numbers used by the sales report."""
+        products = self.product_totals()
+        revenue_cents = int(products['amount_cents'].sum())
+        avg_cents = divide_cents(revenue_cents, int(products['amount_count'].sum()))
+        return {
+            'total_revenue': to_dollars(revenue_cents),
+            'total_revenue_cents': revenue_cents,
+            'total_transactions': self.row_count,
+            'avg_transaction': to_dollars(avg_cents),
+            'avg_transaction_cents': avg_cents,
+            'best_selling_product': products['quantity_sum'].idxmax(),
+            'first_date': products['first_sale'].min(),
+            'last_date': products['last_sale'].max(),
+            'transaction_quantiles': self.transaction_quantiles()
+        }
+
+    def transaction_quantiles(self, quantiles: Sequence[float] = DEFAULT_QUANTILES, start=None, end=None,
+                              categories: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Return transaction-value quantiles ('Median', 'P90', 'P99') in dollars.
+
+        start, end and categories narrow the sketches that are merged. Returns
+        an empty dict when the plan has no sketches.
+        """
+        if self.empty or self.sketches is None:
+            return {}
+        return self.sketches.quantiles(quantiles, start, end, categories)
+
+
+class RunningAggregates(AggregationPlan):
+    """
+    An aggregation plan that is built up one batch of rows at a time.
+
+    Memory grows with the number of distinct (date, product, category, payment
+    method) combinations, not with the number of rows fed in.
+    """
+
+    def __init__(self, backend: str = 'pandas'):
+        super().__init__()
+        self.backend = backend
+
+    def update(self, batch: pd.DataFrame) -> None:
+        """Fold a batch of cleaned sales rows into the running totals."""
+        merged = self.merge(AggregationPlan.from_frame(batch, self.backend))
+        self.base = merged.base
+        self.row_count = merged.row_count
+        self.sketches = merged.sketches
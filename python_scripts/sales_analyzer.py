@@ -4,37 +4,265 @@ Analyzes sales data from Excel files and generates insights and charts.
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional
+import argparse
 import os
 
+try:
+    from python_scripts.groupby_engine import CodedFrame, check_backend, group_aggregate
+    from python_scripts.sales_aggregates import AggregationPlan, RunningAggregates, best_sellers
+    from python_scripts.sales_charts import CHART_FILES, render_charts
+    from python_scripts.sales_cache import file_signature, load_cached_frame, store_cached_frame
+    from python_scripts.sales_compact import column_memory, compact_sales_frame, compare_memory
+    from python_scripts.sales_consolidate import ConsolidatedSales, resolve_workbooks, store_name
+    from python_scripts.sales_cube import SalesCube
+    from python_scripts.sales_ingest import IncrementalIngestor
+    from python_scripts.sales_money import add_cents_columns, cents_column, divide_cents, format_cents, to_dollars
+    from python_scripts.sales_partials import SalesPartial, consolidate_partials, resolve_partials, write_partials
+    from python_scripts.sales_partitions import PERIODS, PartitionedDataset, dataset_path, resolve_period
+    from python_scripts.sales_prefix import COMPARISONS, DailyPrefixIndex
+    from python_scripts.sales_sketches import DEFAULT_EPSILON, DEFAULT_QUANTILES, TopProducts, ValueSketches
+    from python_scripts.sales_store import SalesStore
+    from python_scripts.sales_stream import DEFAULT_BATCH_SIZE, clean_sales_rows, iter_sales_batches
+except ImportError:
+    from groupby_engine import CodedFrame, check_backend, group_aggregate
+    from sales_aggregates import AggregationPlan, RunningAggregates, best_sellers
+    from sales_charts import CHART_FILES, render_charts
+    from sales_cache import file_signature, load_cached_frame, store_cached_frame
+    from sales_compact import column_memory, compact_sales_frame, compare_memory
+    from sales_consolidate import ConsolidatedSales, resolve_workbooks, store_name
+    from sales_cube import SalesCube
+    from sales_ingest import IncrementalIngestor
+    from sales_money import add_cents_columns, cents_column, divide_cents, format_cents, to_dollars
+    from sales_partials import SalesPartial, consolidate_partials, resolve_partials, write_partials
+    from sales_partitions import PERIODS, PartitionedDataset, dataset_path, resolve_period
+    from sales_prefix import COMPARISONS, DailyPrefixIndex
+    from sales_sketches import DEFAULT_EPSILON, DEFAULT_QUANTILES, TopProducts, ValueSketches
+    from sales_store import SalesStore
+    from sales_stream import DEFAULT_BATCH_SIZE, clean_sales_rows, iter_sales_batches
+
 
 class SalesAnalyzer:
     """Analyzes sales data and creates visualizations."""
     
-    def __init__(self, excel_file_path: str):
-        """Initialize the analyzer with Excel file path."""
+    def __init__(self, excel_file_path: str, use_cache: bool = True, backend: str = 'pandas',
+                 compact: bool = False, progress: Optional[Callable[[float, str], None]] = None):
+        """
+        Initialize the analyzer with Excel file path.
+        
+        With use_cache enabled the cleaned data is kept in a sidecar file next to
+        the workbook and reused until the workbook changes. backend selects the
+        group-by engine for summaries: 'pandas' or the integer-coded 'numpy' engine.
+        With compact enabled the loaded rows are kept in a memory-compact form
+        (see sales_compact.compact_sales_frame).
+        
+        progress, if given, is called with a fraction (0 to 1) and a message as
+        the data is loaded, aggregated and charted: loading covers the first 30%,
+        aggregation up to 45% and chart rendering the rest of a full report.
+        """
+        check_backend(backend)
         self.excel_file = excel_file_path
+        self.use_cache = use_cache
+        self.backend = backend
+        self.compact = compact
+        self.progress = progress
         self.sales_data = None
+        self._loaded_memory = None
+        self.sales_cube = None
+        self.prefix_index = None
+        self._coded_data = None
+        self.store = None
+        self.start_date = None
+        self.end_date = None
+        self.store_filters = None
+        self.dataset = None
+        self.workbooks = None
+        self.max_workers = None
+        self.consolidation = None
         self.output_dir = "visualizations"
         os.makedirs(self.output_dir, exist_ok=True)
     
+    @classmethod
+    def from_store(cls, db_path: str, start=None, end=None, filters: Optional[Dict] = None,
+                   backend: str = 'pandas') -> 'SalesAnalyzer':
+        """
+        Create an analyzer that reads from a SQLite SalesStore instead of a workbook.
+        
+        start and end (inclusive) and filters (column -> value or list of values)
+        are pushed down into SQL, so only matching rows are read. The report's
+        aggregation plan is built with a SQL GROUP BY, without loading rows at all.
+        """
+        analyzer = cls(db_path, use_cache=False, backend=backend)
+        analyzer.store = SalesStore(db_path)
+        analyzer.start_date = start
+        analyzer.end_date = end
+        analyzer.store_filters = filters
+        return analyzer
+    
+    @classmethod
+    def from_dataset(cls, dataset_dir: str, start=None, end=None,
+                     backend: str = 'pandas') -> 'SalesAnalyzer':
+        """
+        Create an analyzer that reads a PartitionedDataset instead of a workbook.
+        
+        Only the partitions overlapping the inclusive start / end range are opened.
+        """
+        analyzer = cls(dataset_dir, use_cache=False, backend=backend)
+        analyzer.dataset = PartitionedDataset(dataset_dir)
+        analyzer.start_date = start
+        analyzer.end_date = end
+        return analyzer
+    
+    @classmethod
+    def from_workbooks(cls, source: str, backend: str = 'pandas', use_cache: bool = True,
+                       max_workers: Optional[int] = None) -> 'SalesAnalyzer':
+        """
+        Create an analyzer over a chain of shops, one workbook per store.
+        
+        source is a folder of workbooks or a glob pattern such as
+        'stores/*.xlsx'. Each workbook is aggregated in its own worker process
+        and the partial aggregates are merged for the chain-wide report, which
+        also gets a per-store breakdown (see sales_consolidate).
+        """
+        analyzer = cls(source, use_cache=use_cache, backend=backend)
+        analyzer.workbooks = resolve_workbooks(source)
+        analyzer.max_workers = max_workers
+        if not analyzer.workbooks:
+            print(f"No workbooks found in {source}")
+        return analyzer
+    
+    @classmethod
+    def from_partials(cls, sources: List[str], backend: str = 'pandas') -> 'SalesAnalyzer':
+        """
+        Create an analyzer over partial-aggregate files exported by each shop.
+        
+        sources are files, folders or glob patterns of .sales_partial.json.gz
+        files (see sales_partials). The report is built from the merged totals
+        alone, so no workbook is needed.
+        """
+        paths = resolve_partials(sources)
+        analyzer = cls(', '.join(sources), use_cache=False, backend=backend)
+        analyzer.consolidation = consolidate_partials(paths)
+        print(f"Merged {len(paths)} partial files from {len(analyzer.consolidation.stores)} stores")
+        return analyzer
+    
+    @property
+    def multi_store(self) -> bool:
+        """True for a chain of stores built with from_workbooks or from_partials."""
+        return self.workbooks is not None or self.consolidation is not None
+    
+    def _reads_workbook(self) -> bool:
+        """True when rows come from a single workbook rather than a store, dataset or chain."""
+        return self.store is None and self.dataset is None and not self.multi_store
+    
+    def consolidate(self, parallel: bool = True) -> ConsolidatedSales:
+        """Aggregate every store's workbook (once) and return the merged result."""
+        if self.consolidation is None:
+            self.consolidation = ConsolidatedSales.from_workbooks(
+                self.workbooks or [], self.max_workers, self.backend, self.use_cache, parallel)
+            print(f"Consolidated {len(self.consolidation.stores)} stores "
+                  f"in {self.consolidation.wall_seconds:.2f}s")
+        return self.consolidation
+    
+    def export_partials(self, out_dir: str = 'partials', store: Optional[str] = None) -> List[str]:
+        """
+        Write one partial-aggregate file per day of this workbook's sales.
+        
+        store defaults to the workbook's file name. Loaded rows are summarized
+        directly; otherwise the workbook is streamed in batches.
+        """
+        store = store or store_name(self.excel_file)
+        if self.sales_data is not None:
+            partial = SalesPartial.from_frame(self.sales_data, store, self.backend)
+        else:
+            partial = SalesPartial.from_workbook(self.excel_file, store, backend=self.backend)
+        return write_partials(partial, out_dir)
+    
+    def partitioned_dataset(self, dataset_dir: Optional[str] = None,
+                            granularity: str = 'month') -> PartitionedDataset:
+        """
+        Return the workbook's month (or day) partitioned copy, rewriting it if stale.
+        
+        The partitions are written next to the workbook (sample_data/<name>_partitions
+        for the sample data) and rewritten whenever the workbook's size or
+        modification time no longer match the ones recorded in the dataset.
+        """
+        if self.dataset is not None:
+            return self.dataset
+        
+        dataset = PartitionedDataset(dataset_dir or dataset_path(self.excel_file), granularity)
+        signature = file_signature(self.excel_file, with_hash=False)
+        if dataset.source != signature:
+            if self.sales_data is None:
+                self.load_sales_data()
+            written = dataset.write(self.sales_data, signature)
+            print(f"Wrote {len(written)} {dataset.granularity} partitions to {dataset.root}")
+        return dataset
+    
+    def period_aggregation_plan(self, period: str) -> AggregationPlan:
+        """
+        Build the aggregation plan for a period such as 'last_7_days' or '2025-03'.
+        
+        Store-backed analyzers push the range down to SQL; otherwise only the
+        overlapping partitions of the partitioned dataset are read.
+        """
+        start, end = resolve_period(period)
+        if self.store is not None:
+            return self.store.aggregation_plan(start, end, self.store_filters)
+        
+        dataset = self.partitioned_dataset()
+        plan = dataset.aggregation_plan(start, end, self.backend)
+        print(f"Read {len(dataset.last_opened)} of {len(dataset.partitions())} partitions for period '{period}'")
+        return plan
+    
+    def _report_progress(self, fraction: float, message: str) -> None:
+        """Pass progress to the callback given to the constructor, if any."""
+        if self.progress is not None:
+            self.progress(fraction, message)
+    
     def load_sales_data(self) -> pd.DataFrame:
-        """Load sales data from Excel file."""
+        """
+        Load sales data from Excel file, or from its sidecar cache when fresh.
+        
+        In compact mode the rows are converted with compact_sales_frame after loading.
+        """
+        self._report_progress(0.0, "Loading sales data")
+        sales_data = self._read_sales_data()
+        self._loaded_memory = None
+        self.prefix_index = None
+        if self.compact and sales_data is self.sales_data and not sales_data.empty:
+            self._loaded_memory = column_memory(sales_data)
+            self.sales_data = compact_sales_frame(sales_data)
+            sales_data = self.sales_data
+        self._report_progress(0.3, f"Loaded {len(sales_data):,} sales records")
+        return sales_data
+    
+    def _read_sales_data(self) -> pd.DataFrame:
+        """Read cleaned rows from the store, dataset, cache or workbook."""
         try:
-            self.sales_data = pd.read_excel(self.excel_file, sheet_name="Sales Entry")
+            if self.dataset is not None:
+                self.sales_data = self.dataset.read(self.start_date, self.end_date)
+                print(f"Loaded {len(self.sales_data)} sales records ({len(self.dataset.last_opened)} partitions)")
+                return self.sales_data
+            
+            if self.store is not None:
+                self.sales_data = self.store.load_frame(self.start_date, self.end_date, self.store_filters)
+                print(f"Loaded {len(self.sales_data)} sales records (store)")
+                return self.sales_data
             
-            # Clean and prepare data
-            self.sales_data['Date'] = pd.to_datetime(self.sales_data['Date'])
-            self.sales_data = self.sales_data.dropna(subset=['Product Name', 'Date'])
+            if self.use_cache:
+                cached = load_cached_frame(self.excel_file)
+                if cached is not None:
+                    self.sales_data = cached
+                    print(f"Loaded {len(self.sales_data)} sales records (cached)")
+                    return self.sales_data
+                signature = file_signature(self.excel_file)
             
-            # Ensure numeric columns
-            numeric_columns = ['Quantity Sold', 'Unit Price', 'Total Amount']
-            for col in numeric_columns:
-                self.sales_data[col] = pd.to_numeric(self.sales_data[col], errors='coerce')
+            raw_data = pd.read_excel(self.excel_file, sheet_name="Sales Entry")
+            self.sales_data = self._clean_sales_data(raw_data)
+            
+            if self.use_cache:
+                store_cached_frame(self.excel_file, self.sales_data, signature)
             
             print(f"Loaded {len(self.sales_data)} sales records")
             return self.sales_data
@@ -43,19 +271,231 @@ class SalesAnalyzer:
             print(f"Error loading data: {e}")
             return pd.DataFrame()
     
-    def calculate_daily_summary(self) -> pd.DataFrame:
-        """Calculate daily sales summary."""
+    def memory_report(self) -> pd.DataFrame:
+        """
+        Show the bytes used by each column before and after compaction.
+        
+        In compact mode this compares the rows as loaded with the compact rows
+        in use; otherwise it shows what compact mode would save.
+        """
+        if self.sales_data is None:
+            self.load_sales_data()
+        if self._loaded_memory is not None:
+            return compare_memory(self._loaded_memory, self.sales_data)
+        return compare_memory(column_memory(self.sales_data), compact_sales_frame(self.sales_data))
+    
+    @staticmethod
+    def _clean_sales_data(sales_data: pd.DataFrame) -> pd.DataFrame:
+        """Clean raw "Sales Entry" rows into typed analysis data."""
+        return clean_sales_rows(sales_data)
+    
+    def stream_sales_aggregates(self, batch_size: int = DEFAULT_BATCH_SIZE) -> RunningAggregates:
+        """
+        Aggregate the workbook batch by batch without loading it all at once.
+        
+        Each batch is cleaned the same way as in load_sales_data and folded into
+        running daily, product, category and payment-method totals.
+        """
+        aggregates = RunningAggregates(self.backend)
+        try:
+            for batch in self._iter_clean_batches(batch_size):
+                aggregates.update(batch)
+            print(f"Streamed {aggregates.row_count} sales records")
+        except Exception as e:
+            print(f"Error streaming data: {e}")
+        return aggregates
+    
+    def _iter_clean_batches(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+        """Yield cleaned rows in batches from the store, dataset or workbook."""
+        if self.store is not None:
+            return self.store.iter_frames(batch_size, self.start_date, self.end_date, self.store_filters)
+        if self.dataset is not None:
+            return self.dataset.iter_frames(self.start_date, self.end_date)
+        return (self._clean_sales_data(batch) for batch in iter_sales_batches(self.excel_file, batch_size))
+    
+    def stream_top_products(self, k: int = 10, epsilon: float = DEFAULT_EPSILON,
+                            batch_size: int = DEFAULT_BATCH_SIZE) -> TopProducts:
+        """
+        Find the top k products by revenue and by quantity in one bounded-memory pass.
+        
+        Uses Space-Saving sketches with ceil(1 / epsilon) counters, so memory
+        does not grow with the size of the catalogue. Each estimate is at most
+        epsilon times the stream total above the true value.
+        """
+        tracker = TopProducts(k, epsilon)
+        try:
+            for batch in self._iter_clean_batches(batch_size):
+                tracker.update(batch)
+            print(f"Streamed {tracker.row_count} sales records")
+        except Exception as e:
+            print(f"Error streaming data: {e}")
+        return tracker
+    
+    def ingest_incremental(self, force_rebuild: bool = False,
+                           batch_size: int = DEFAULT_BATCH_SIZE) -> AggregationPlan:
+        """
+        Return the workbook's aggregation plan, aggregating only rows added since last run.
+        
+        The plan is saved next to the workbook with a watermark (last sale row and
+        its hash). If that row was edited the plan is rebuilt from the whole sheet.
+        An existing prefix index is updated with only the newly read rows.
+        """
+        ingestor = IncrementalIngestor(self.excel_file, self.backend, batch_size)
+        try:
+            plan = ingestor.ingest(force_rebuild)
+            if ingestor.last_run['incremental'] and self.prefix_index is not None:
+                self.prefix_index.add_plan(ingestor.last_run['added'])
+            else:
+                self.prefix_index = DailyPrefixIndex.from_plan(plan)
+            mode = "incremental" if ingestor.last_run['incremental'] else "full rebuild"
+            print(f"Read {ingestor.last_run['rows_read']} new sheet rows ({mode}), "
+                  f"{plan.row_count} sales records in total")
+            return plan
+        except Exception as e:
+            print(f"Error ingesting data: {e}")
+            return AggregationPlan()
+    
+    def _grouping_data(self):
+        """
+        Return the loaded rows in the form the selected backend groups fastest.
+        
+        The numpy backend keeps one CodedFrame per loaded DataFrame so each key
+        column is factorized only once across all summaries. Rows set without
+        integer cents columns get them here.
+        """
+        if cents_column('Total Amount') not in self.sales_data.columns:
+            self.sales_data = add_cents_columns(self.sales_data.copy())
+        if self.backend == 'pandas':
+            return self.sales_data
+        if self._coded_data is None or self._coded_data.df is not self.sales_data:
+            self._coded_data = CodedFrame(self.sales_data)
+        return self._coded_data
+    
+    def build_aggregation_plan(self) -> AggregationPlan:
+        """
+        Group the loaded rows once into every table the report and charts need.
+        
+        For a store-backed analyzer with no rows loaded, the grouping runs in SQL;
+        a dataset-backed one groups each overlapping partition in turn, and a
+        multi-store one merges the stores' plans.
+        """
+        if self.sales_data is None and self.multi_store:
+            return self.consolidate().chain
+        if self.sales_data is None and self.store is not None:
+            return self.store.aggregation_plan(self.start_date, self.end_date, self.store_filters)
+        if self.sales_data is None and self.dataset is not None:
+            return self.dataset.aggregation_plan(self.start_date, self.end_date, self.backend)
         if self.sales_data is None or self.sales_data.empty:
-            return pd.DataFrame()
+            return AggregationPlan()
+        return AggregationPlan.from_frame(self.sales_data, self.backend)
+    
+    def get_prefix_index(self) -> DailyPrefixIndex:
+        """
+        Return the daily prefix-sum index, building it on first use.
         
-        daily_summary = self.sales_data.groupby('Date').agg({
-            'Total Amount': ['sum', 'count', 'mean'],
-            'Quantity Sold': 'sum',
-            'Product Name': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'N/A'
-        }).round(2)
+        Range totals and period comparisons are then answered in constant time
+        without regrouping the rows.
+        """
+        if self.prefix_index is None:
+            if self.sales_data is None and self._reads_workbook():
+                self.load_sales_data()
+            self.prefix_index = DailyPrefixIndex.from_plan(self.build_aggregation_plan())
+        return self.prefix_index
+    
+    def revenue_between(self, start=None, end=None) -> Dict:
+        """Return revenue, transactions and quantity for the inclusive [start, end] days."""
+        return self.get_prefix_index().range_totals(start, end)
+    
+    def compare_periods(self, kind: str = 'wow', end=None) -> Dict:
+        """Compare the week, month or year to date ending on end with the one before."""
+        return self.get_prefix_index().compare(kind, end)
+    
+    def value_sketches(self) -> ValueSketches:
+        """
+        Return the per-date, per-category transaction value sketches.
+        
+        They come with the aggregation plan; a store-backed analyzer streams its
+        rows once to build them, since the SQL plan has none.
+        """
+        if self.sales_data is None and self._reads_workbook():
+            self.load_sales_data()
+        plan = self.build_aggregation_plan()
+        if plan.sketches is not None or plan.empty:
+            return plan.sketches or ValueSketches()
+        sketches = ValueSketches()
+        for batch in self._iter_clean_batches():
+            sketches = sketches.merge(ValueSketches.from_frame(batch))
+        return sketches
+    
+    def transaction_quantiles(self, quantiles=DEFAULT_QUANTILES, start=None, end=None,
+                              categories: Optional[List[str]] = None) -> Dict[str, float]:
+        """Return median / P90 / P99 transaction values for a date range and categories."""
+        return self.value_sketches().quantiles(quantiles, start, end, categories)
+    
+    def get_sales_cube(self) -> SalesCube:
+        """
+        Return the pre-aggregated sales cube for the workbook.
+        
+        A saved cube is reused while the workbook is unchanged; otherwise the
+        data is loaded, the cube is rebuilt and (with use_cache) saved again.
+        """
+        if self.sales_cube is not None:
+            return self.sales_cube
+        
+        if self.use_cache:
+            self.sales_cube = SalesCube.load_for_workbook(self.excel_file)
+            if self.sales_cube is not None:
+                return self.sales_cube
+        
+        if self.sales_data is None:
+            self.load_sales_data()
+        
+        self.sales_cube = SalesCube.from_frame(self.sales_data)
+        if self.use_cache and os.path.exists(self.excel_file):
+            self.sales_cube.save_for_workbook(self.excel_file)
         
-        # Flatten column names
-        daily_summary.columns = ['Total Sales', 'Total Transactions', 'Average Sale', 'Total Quantity', 'Best Selling Product']
+        return self.sales_cube
+    
+    def query_cube(self, by: List[str] = None, start=None, end=None,
+                   filters: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Answer a rollup question from the sales cube instead of the raw rows.
+        
+        Example: query_cube(['Category'], start='2025-03-01', end='2025-03-31')
+        gives revenue, quantity and transactions per category for March.
+        """
+        return self.get_sales_cube().rollup(by or [], start, end, filters)
+    
+    def calculate_daily_summary(self, best_seller_weight: str = 'rows') -> pd.DataFrame:
+        """
+        Calculate daily sales summary.
+        
+        "Best Selling Product" is the product with the most sales rows that day
+        (best_seller_weight='rows') or the most units sold (best_seller_weight=
+        'quantity'). Ties go to the alphabetically first product name.
+        """
+        if self.sales_data is None or self.sales_data.empty:
+            return pd.DataFrame()
+        
+        if best_seller_weight not in ('rows', 'quantity'):
+            raise ValueError("best_seller_weight must be 'rows' or 'quantity'")
+        
+        data = self._grouping_data()
+        daily_summary = group_aggregate(data, 'Date', {
+            cents_column('Total Amount'): ['sum', 'count'],
+            'Quantity Sold': 'sum'
+        }, self.backend)
+        
+        # Flatten column names; money is summed in cents and converted once
+        daily_summary.columns = ['Total Sales', 'Total Transactions', 'Total Quantity']
+        daily_summary.insert(2, 'Average Sale',
+                             to_dollars(divide_cents(daily_summary['Total Sales'], daily_summary['Total Transactions'])))
+        daily_summary['Total Sales'] = to_dollars(daily_summary['Total Sales'])
+        daily_summary = daily_summary.round(2)
+        
+        weight_spec = {'Quantity Sold': 'sum'} if best_seller_weight == 'quantity' else {'Product Name': 'size'}
+        pair_totals = group_aggregate(data, ['Date', 'Product Name'], weight_spec, self.backend).iloc[:, 0]
+        daily_summary['Best Selling Product'] = best_sellers(pair_totals).reindex(daily_summary.index)
         daily_summary = daily_summary.reset_index()
         
         return daily_summary
@@ -65,155 +505,225 @@ class SalesAnalyzer:
         if self.sales_data is None or self.sales_data.empty:
             return pd.DataFrame()
         
-        product_analysis = self.sales_data.groupby('Product Name').agg({
+        product_analysis = group_aggregate(self._grouping_data(), 'Product Name', {
             'Quantity Sold': 'sum',
-            'Total Amount': ['sum', 'mean'],
+            cents_column('Total Amount'): ['sum', 'count'],
             'Date': ['min', 'max', 'count']
-        }).round(2)
-        
-        # Flatten column names
-        product_analysis.columns = ['Total Quantity', 'Total Revenue', 'Avg Sale Value', 'First Sale', 'Last Sale', 'Sale Count']
+        }, self.backend)
+        
+        # Flatten column names; money is summed in cents and converted once
+        product_analysis.columns = ['Total Quantity', 'Total Revenue', 'Revenue Count', 'First Sale', 'Last Sale', 'Sale Count']
+        product_analysis.insert(2, 'Avg Sale Value',
+                                to_dollars(divide_cents(product_analysis['Total Revenue'], product_analysis['Revenue Count'])))
+        product_analysis = product_analysis.drop(columns='Revenue Count')
+        product_analysis['Total Revenue'] = to_dollars(product_analysis['Total Revenue'])
+        numeric_columns = ['Total Quantity', 'Total Revenue', 'Avg Sale Value', 'Sale Count']
+        product_analysis[numeric_columns] = product_analysis[numeric_columns].round(2)
         product_analysis = product_analysis.reset_index()
         product_analysis = product_analysis.sort_values('Total Revenue', ascending=False)
         
         return product_analysis
     
-    def create_daily_sales_chart(self) -> str:
-        """Create daily sales trend chart."""
-        daily_summary = self.calculate_daily_summary()
+    def calculate_category_sales(self) -> pd.Series:
+        """Calculate total revenue per category, largest first."""
+        if self.sales_data is None or self.sales_data.empty:
+            return pd.Series(dtype=float)
         
-        if daily_summary.empty:
-            return "No data available for chart"
+        amount = cents_column('Total Amount')
+        category_sales = group_aggregate(self._grouping_data(), 'Category', {amount: 'sum'}, self.backend)
+        category_sales = to_dollars(category_sales[amount]).rename('Total Amount')
+        return category_sales.sort_values(ascending=False)
+    
+    def calculate_payment_summary(self) -> pd.DataFrame:
+        """Calculate revenue and transaction count per payment method."""
+        if self.sales_data is None or self.sales_data.empty:
+            return pd.DataFrame()
         
-        plt.figure(figsize=(12, 6))
-        plt.plot(daily_summary['Date'], daily_summary['Total Sales'], marker='o', linewidth=2, markersize=6)
-        plt.title('Daily Sales Trend', fontsize=16, fontweight='bold')
-        plt.xlabel('Date', fontsize=12)
-        plt.ylabel('Total Sales ($)', fontsize=12)
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
+        payment_data = group_aggregate(self._grouping_data(), 'Payment Method', {
+            cents_column('Total Amount'): 'sum',
+            'Date': 'count'
+        }, self.backend)
+        payment_data.columns = ['Total Amount', 'Transaction Count']
+        payment_data['Total Amount'] = to_dollars(payment_data['Total Amount'])
+        payment_data = payment_data.round(2)
         
-        chart_path = os.path.join(self.output_dir, 'daily_sales_trend.png')
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        return payment_data
+    
+    def _chart_path(self, chart_name: str) -> str:
+        """Return the output path of one of the report charts."""
+        return os.path.join(self.output_dir, CHART_FILES[chart_name])
+    
+    def _chart_jobs(self, daily_summary: pd.DataFrame, product_data: pd.DataFrame,
+                    category_sales: pd.Series, payment_data: pd.DataFrame) -> Dict:
+        """
+        Build render jobs for the four charts from their aggregates.
         
-        return chart_path
+        Each job carries only the columns its chart draws. Charts without data
+        are left out.
+        """
+        jobs = {}
+        if not daily_summary.empty:
+            jobs['daily'] = (daily_summary[['Date', 'Total Sales']], self._chart_path('daily'))
+        if not product_data.empty:
+            # Top 10 products by revenue
+            top_products = product_data.head(10)[['Product Name', 'Total Revenue']]
+            jobs['product'] = (top_products, self._chart_path('product'))
+        if not category_sales.empty:
+            jobs['category'] = (category_sales, self._chart_path('category'))
+        if not payment_data.empty:
+            jobs['payment'] = (payment_data[['Total Amount', 'Transaction Count']], self._chart_path('payment'))
+        return jobs
+    
+    def _render_chart(self, chart_name: str, data) -> str:
+        """Draw one report chart through render_charts, so chart_manifest.json stays current."""
+        return render_charts({chart_name: (data, self._chart_path(chart_name))}, parallel=False,
+                             use_cache=False)[chart_name]
     
-    def create_product_performance_chart(self) -> str:
-        """Create product performance bar chart."""
-        product_data = self.analyze_product_performance()
+    def create_daily_sales_chart(self, daily_summary: Optional[pd.DataFrame] = None) -> str:
+        """Create daily sales trend chart, optionally from a precomputed daily summary."""
+        if daily_summary is None:
+            daily_summary = self.calculate_daily_summary()
         
-        if product_data.empty:
+        if daily_summary.empty:
             return "No data available for chart"
         
-        # Top 10 products by revenue
-        top_products = product_data.head(10)
-        
-        plt.figure(figsize=(12, 8))
-        bars = plt.bar(range(len(top_products)), top_products['Total Revenue'])
-        plt.title('Top 10 Products by Revenue', fontsize=16, fontweight='bold')
-        plt.xlabel('Products', fontsize=12)
-        plt.ylabel('Total Revenue ($)', fontsize=12)
-        plt.xticks(range(len(top_products)), top_products['Product Name'].tolist(), rotation=45, ha='right')
-        
-        # Add value labels on bars
-        for i, bar in enumerate(bars):
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                    f'${height:.0f}', ha='center', va='bottom')
-        
-        plt.tight_layout()
-        
-        chart_path = os.path.join(self.output_dir, 'product_performance.png')
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return chart_path
+        return self._render_chart('daily', daily_summary[['Date', 'Total Sales']])
     
-    def create_category_analysis_chart(self) -> str:
-        """Create category sales distribution chart."""
-        if self.sales_data is None or self.sales_data.empty:
-            return "No data available for chart"
+    def create_product_performance_chart(self, product_data: Optional[pd.DataFrame] = None) -> str:
+        """Create product performance bar chart, optionally from precomputed product data."""
+        if product_data is None:
+            product_data = self.analyze_product_performance()
         
-        category_sales = self.sales_data.groupby('Category')['Total Amount'].sum().sort_values(ascending=False)
-        
-        plt.figure(figsize=(10, 8))
-        colors = plt.get_cmap('Set3')(np.linspace(0, 1, len(category_sales))).tolist()
-        pie_result = plt.pie(category_sales.to_numpy(), labels=category_sales.index.tolist(), 
-                             autopct='%1.1f%%', colors=colors, startangle=90)
-        if len(pie_result) == 3:
-            wedges, texts, autotexts = pie_result
-        else:
-            wedges, texts = pie_result
-            autotexts = []
-        
-        plt.title('Sales Distribution by Category', fontsize=16, fontweight='bold')
+        if product_data.empty:
+            return "No data available for chart"
         
-        # Enhance text appearance
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
+        # Top 10 products by revenue
+        top_products = product_data.head(10)[['Product Name', 'Total Revenue']]
+        return self._render_chart('product', top_products)
+    
+    def create_category_analysis_chart(self, category_sales: Optional[pd.Series] = None) -> str:
+        """Create category sales distribution chart, optionally from precomputed totals."""
+        if category_sales is None:
+            category_sales = self.calculate_category_sales()
         
-        chart_path = os.path.join(self.output_dir, 'category_distribution.png')
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        if category_sales.empty:
+            return "No data available for chart"
         
-        return chart_path
+        return self._render_chart('category', category_sales)
     
-    def create_payment_method_chart(self) -> str:
-        """Create payment method distribution chart."""
-        if self.sales_data is None or self.sales_data.empty:
-            return "No data available for chart"
+    def create_payment_method_chart(self, payment_data: Optional[pd.DataFrame] = None) -> str:
+        """Create payment method distribution chart, optionally from precomputed totals."""
+        if payment_data is None:
+            payment_data = self.calculate_payment_summary()
         
-        payment_data = self.sales_data.groupby('Payment Method').agg({
-            'Total Amount': 'sum',
-            'Date': 'count'
-        }).round(2)
-        payment_data.columns = ['Total Amount', 'Transaction Count']
+        if payment_data.empty:
+            return "No data available for chart"
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        return self._render_chart('payment', payment_data[['Total Amount', 'Transaction Count']])
+    
+    def generate_sales_report(self, streaming: bool = False,
+                              batch_size: int = DEFAULT_BATCH_SIZE,
+                              parallel_charts: bool = True,
+                              reuse_charts: bool = True,
+                              incremental: bool = False,
+                              period: Optional[str] = None) -> str:
+        """
+        Generate comprehensive sales report.
         
-        # Revenue by payment method
-        payment_data['Total Amount'].plot(kind='bar', ax=ax1, color='skyblue')
-        ax1.set_title('Revenue by Payment Method', fontweight='bold')
-        ax1.set_ylabel('Total Revenue ($)')
-        ax1.tick_params(axis='x', rotation=45)
+        The rows are grouped once into an AggregationPlan whose tables feed the
+        key metrics and all four charts. With streaming enabled the workbook is
+        read in batches of batch_size rows and only running totals are kept, so
+        memory use does not grow with the number of rows. The report contains
+        the same numbers either way.
         
-        # Transaction count by payment method
-        payment_data['Transaction Count'].plot(kind='bar', ax=ax2, color='lightcoral')
-        ax2.set_title('Transaction Count by Payment Method', fontweight='bold')
-        ax2.set_ylabel('Number of Transactions')
-        ax2.tick_params(axis='x', rotation=45)
+        With parallel_charts enabled the four charts are rendered concurrently
+        in worker processes, each receiving only its own small aggregate. With
+        reuse_charts enabled a chart whose aggregate is unchanged since it was
+        last drawn is reused from the visualizations folder.
         
-        plt.tight_layout()
+        With incremental enabled the plan saved by the previous run is reused and
+        only rows appended to the workbook since then are aggregated (see
+        ingest_incremental).
         
-        chart_path = os.path.join(self.output_dir, 'payment_methods.png')
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        period restricts the report to a date range such as 'last_7_days',
+        'this_month', '2025-03' or '2025-01-01:2025-03-31' (see resolve_period);
+        only the month partitions overlapping it are read.
         
-        return chart_path
-    
-    def generate_sales_report(self) -> str:
-        """Generate comprehensive sales report."""
-        if self.sales_data is None:
-            self.load_sales_data()
+        A multi-store analyzer (see from_workbooks and from_partials) always reports on the merged
+        plan of every store and adds a per-store breakdown section.
+        """
+        self._report_progress(0.3, "Aggregating sales data")
+        if self.multi_store:
+            plan = self.build_aggregation_plan()
+        elif period not in (None, 'all'):
+            plan = self.period_aggregation_plan(period)
+        elif incremental and self.store is None:
+            plan = self.ingest_incremental(batch_size=batch_size)
+        elif streaming:
+            plan = self.stream_sales_aggregates(batch_size)
+        else:
+            if self.sales_data is None and self._reads_workbook():
+                self.load_sales_data()
+            plan = self.build_aggregation_plan()
         
-        if self.sales_data.empty:
+        if plan.empty:
             return "No data available for analysis"
         
         # Calculate key metrics
-        total_revenue = self.sales_data['Total Amount'].sum()
-        total_transactions = len(self.sales_data)
-        avg_transaction = self.sales_data['Total Amount'].mean()
-        best_selling_product = self.sales_data.groupby('Product Name')['Quantity Sold'].sum().idxmax()
-        date_range = f"{self.sales_data['Date'].min().date()} to {self.sales_data['Date'].max().date()}"
-        
-        # Generate charts
-        daily_chart = self.create_daily_sales_chart()
-        product_chart = self.create_product_performance_chart()
-        category_chart = self.create_category_analysis_chart()
-        payment_chart = self.create_payment_method_chart()
+        metrics = plan.key_metrics()
+        self._report_progress(0.45, f"Aggregated {plan.row_count:,} sales records")
+        
+        # Generate charts from the shared aggregates
+        jobs = self._chart_jobs(plan.daily_summary(), plan.product_performance(),
+                                plan.category_sales(), plan.payment_summary())
+        charts = render_charts(jobs, parallel=parallel_charts, use_cache=reuse_charts,
+                               progress=lambda fraction, message: self._report_progress(0.45 + 0.5 * fraction,
+                                                                                        message))
+        no_chart = "No data available for chart"
+        daily_chart = charts.get('daily', no_chart)
+        product_chart = charts.get('product', no_chart)
+        category_chart = charts.get('category', no_chart)
+        payment_chart = charts.get('payment', no_chart)
+        
+        total_revenue = format_cents(metrics['total_revenue_cents'])
+        total_transactions = metrics['total_transactions']
+        avg_transaction = format_cents(metrics['avg_transaction_cents'], grouping=False)
+        best_selling_product = metrics['best_selling_product']
+        quantiles = metrics['transaction_quantiles']
+        quantile_text = ' / '.join(format_cents(round(value * 100), grouping=False) for value in quantiles.values())
+        quantile_line = (f"Transaction Value ({' / '.join(quantiles)}): {quantile_text}\n"
+                         if quantiles else "")
+        date_range = f"{metrics['first_date'].date()} to {metrics['last_date'].date()}"
+        
+        # Period-over-period lines from a prefix-sum index over the plan's days; a
+        # comparison is left out when its previous period starts before the first
+        # sale or has no sales, since it would compare against missing history
+        prefix_index = DailyPrefixIndex.from_plan(plan)
+        comparison_lines = []
+        for kind, label in COMPARISONS.items():
+            comparison = prefix_index.compare(kind)
+            if (comparison['previous_range'][0] < prefix_index.first_date
+                    or comparison['previous']['transactions'] == 0):
+                continue
+            change = comparison['change_pct']['revenue_cents']
+            change_text = f"{change:+.1f}%" if change is not None else "n/a"
+            ranges = [f"{start.date()} to {end.date()}"
+                      for start, end in (comparison['current_range'], comparison['previous_range'])]
+            comparison_lines.append(f"{label.capitalize()}: {format_cents(comparison['current']['revenue_cents'])} "
+                                    f"vs {format_cents(comparison['previous']['revenue_cents'])} ({change_text})\n"
+                                    f"  {ranges[0]} vs {ranges[1]}")
+        comparisons = '\n'.join(comparison_lines) or "No earlier period with sales to compare against"
+        
+        # Per-store lines for a chain of shops
+        store_section = ""
+        if self.multi_store:
+            breakdown = self.consolidate().store_breakdown()
+            store_lines = [f"{store}: {format_cents(round(row['Total Revenue'] * 100))} "
+                           f"({row['Revenue Share (%)']:.1f}%), {row['Transactions']:,} transactions, "
+                           f"avg {format_cents(round(row['Avg Transaction'] * 100), grouping=False)}, "
+                           f"best seller {row['Best Selling Product']}"
+                           for store, row in breakdown.iterrows()]
+            store_section = ("STORE BREAKDOWN:\n---------------\n" + '\n'.join(store_lines) + "\n\n")
         
         # Create report
         report = f"""
@@ -224,12 +734,16 @@ Period: {date_range}
 
 KEY METRICS:
 -----------
-Total Revenue: ${total_revenue:,.2f}
+Total Revenue: {total_revenue}
 Total Transactions: {total_transactions:,}
-Average Transaction Value: ${avg_transaction:.2f}
-Best Selling Product: {best_selling_product}
+Average Transaction Value: {avg_transaction}
+{quantile_line}Best Selling Product: {best_selling_product}
 
-GENERATED VISUALIZATIONS:
+PERIOD COMPARISONS:
+------------------
+{comparisons}
+
+{store_section}GENERATED VISUALIZATIONS:
 ------------------------
 1. Daily Sales Trend: {daily_chart}
 2. Product Performance: {product_chart}
@@ -251,11 +765,34 @@ All charts have been saved to the 'visualizations' folder.
         with open(report_path, 'w') as f:
             f.write(report)
         
+        self._report_progress(1.0, "Report saved")
         return report
 
 
 def main():
     """Main function to run sales analysis."""
+    parser = argparse.ArgumentParser(description="Analyze sales data and generate charts and a report")
+    parser.add_argument('--period', default=None,
+                        help=f"date range to report on: {', '.join(PERIODS)}, YYYY-MM, YYYY-MM-DD or START:END")
+    parser.add_argument('--stores', default=None,
+                        help="folder or glob of store workbooks to consolidate into one chain-wide report")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for --stores (default: one per CPU)")
+    parser.add_argument('--partials', nargs='+', default=None,
+                        help="partial-aggregate files, folders or globs to merge into one chain-wide report")
+    args = parser.parse_args()
+    
+    if args.partials is not None:
+        print("Starting Sales Analysis from Partial Aggregates...")
+        print(SalesAnalyzer.from_partials(args.partials).generate_sales_report())
+        return
+    
+    if args.stores is not None:
+        print("Starting Multi-Store Sales Analysis...")
+        analyzer = SalesAnalyzer.from_workbooks(args.stores, max_workers=args.workers)
+        print(analyzer.generate_sales_report())
+        return
+    
     # First try to use sample data, then template
     excel_file = "sample_data/sample_sales_data.xlsx"
     
@@ -270,9 +807,10 @@ def main():
     print("Starting Sales Data Analysis...")
     analyzer = SalesAnalyzer(excel_file)
     
-    # Load data and generate report
-    analyzer.load_sales_data()
-    report = analyzer.generate_sales_report()
+    # Load data and generate report; a period report reads only its partitions
+    if args.period is None:
+        analyzer.load_sales_data()
+    report = analyzer.generate_sales_report(period=args.period)
     
     print(report)
     print(f"\nAnalysis complete! Check the 'visualizations' folder for charts and reports.")
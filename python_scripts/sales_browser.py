@@ -0,0 +1,211 @@
+"""
+Sales Row Browser
+Pages sorted, filtered sales rows out of SQLite a screenful at a time, either
+from the sales store or from a SQLite copy of a workbook, so the GUI can scroll
+through millions of transactions while holding only a few pages of display rows.
+"""
+
+import os
+import sqlite3
+from collections import OrderedDict
+from contextlib import closing
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from python_scripts.sales_cache import file_signature
+    from python_scripts.sales_money import MONEY_COLUMNS
+    from python_scripts.sales_store import SALES_COLUMNS, Filters, SalesStore
+except ImportError:
+    from sales_cache import file_signature
+    from sales_money import MONEY_COLUMNS
+    from sales_store import SALES_COLUMNS, Filters, SalesStore
+
+
+DEFAULT_PAGE_SIZE = 200
+DEFAULT_MAX_PAGES = 16
+
+BROWSE_SUFFIX = ".sales_browse.db"
+
+# A browsable copy also indexes the columns the store itself does not
+BROWSE_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_sales_quantity ON sales (quantity_sold);
+CREATE INDEX IF NOT EXISTS idx_sales_unit_price ON sales (unit_price);
+CREATE INDEX IF NOT EXISTS idx_sales_amount ON sales (total_amount);
+CREATE INDEX IF NOT EXISTS idx_sales_payment ON sales (payment_method);
+CREATE INDEX IF NOT EXISTS idx_sales_customer ON sales (customer_type);
+"""
+
+FILTER_COLUMNS = ('Product Name', 'Category')
+
+
+class StoreRows:
+    """Rows from the SQLite store; sorting, filtering and paging run as SQL."""
+
+    def __init__(self, db_path: str):
+        self.store = SalesStore(db_path)
+        self.name = f"SQLite store ({db_path})"
+
+    def row_count(self, start=None, end=None, filters: Optional[Filters] = None) -> int:
+        """Return how many rows match a date range and filters."""
+        return self.store.row_count(start, end, filters)
+
+    def page_frame(self, offset: int, limit: int, start=None, end=None, filters: Optional[Filters] = None,
+                   sort_by: str = 'Date', descending: bool = False) -> pd.DataFrame:
+        """Return one page of matching rows in sort order."""
+        return self.store.page_frame(offset, limit, start, end, filters, sort_by, descending)
+
+    def distinct_values(self, column: str) -> List[str]:
+        """Return the sorted distinct values of a text column."""
+        return self.store.distinct_values(column)
+
+
+def browse_db_path(excel_file: str) -> str:
+    """Return the path of the browsable SQLite copy that belongs to a workbook."""
+    root, _ = os.path.splitext(excel_file)
+    return root + BROWSE_SUFFIX
+
+
+def browse_copy_fresh(excel_file: str, db_path: str) -> bool:
+    """True if db_path is a browsable copy of the workbook as it is now."""
+    if not os.path.exists(db_path):
+        return False
+    try:
+        with closing(sqlite3.connect(db_path)) as connection:
+            saved = connection.execute("SELECT size, mtime_ns FROM browse_source").fetchone()
+    except sqlite3.Error:
+        return False
+    current = file_signature(excel_file, with_hash=False)
+    return saved == (current['size'], current['mtime_ns'])
+
+
+def build_browse_copy(excel_file: str, db_path: str) -> int:
+    """
+    Copy a workbook's "Sales Entry" rows into a SQLite file and return the row count.
+
+    The sheet is streamed in batches (see SalesStore.import_workbook), so memory
+    stays bounded however many rows the workbook holds. Every sortable column
+    is indexed, and the workbook's size and mtime are recorded so the copy can
+    be checked later. The copy is written to a temporary file and moved into
+    place, so a browser never opens a half-built one.
+    """
+    signature = file_signature(excel_file, with_hash=False)
+    tmp_path = db_path + '.tmp'
+    for path in (tmp_path, tmp_path + '-wal', tmp_path + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+    imported = SalesStore(tmp_path).import_workbook(excel_file, replace=True)
+    with closing(sqlite3.connect(tmp_path)) as connection, connection:
+        connection.executescript(BROWSE_INDEXES)
+        connection.execute("CREATE TABLE browse_source (size INTEGER, mtime_ns INTEGER)")
+        connection.execute("INSERT INTO browse_source VALUES (?, ?)", (signature['size'], signature['mtime_ns']))
+    os.replace(tmp_path, db_path)
+    return imported
+
+
+class WorkbookRows(StoreRows):
+    """
+    A workbook's rows, paged through a SQLite copy kept next to it.
+
+    The copy (<workbook>.sales_browse.db, see build_browse_copy) is built the
+    first time the workbook is browsed and again whenever the workbook's size
+    or modification time changes; after that, opening the workbook is instant
+    and sorting, filtering and paging run as SQL like any other store.
+    """
+
+    def __init__(self, excel_file: str, db_path: Optional[str] = None):
+        db_path = db_path or browse_db_path(excel_file)
+        if not browse_copy_fresh(excel_file, db_path):
+            build_browse_copy(excel_file, db_path)
+        super().__init__(db_path)
+        self.name = f"Workbook ({excel_file})"
+
+
+def open_rows(excel_file: Optional[str] = None, db_path: Optional[str] = None) -> StoreRows:
+    """Open the store when db_path is given, otherwise the workbook (through its browsable copy)."""
+    if db_path is not None:
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"No sales store at {db_path}")
+        return StoreRows(db_path)
+    if not os.path.exists(excel_file):
+        raise FileNotFoundError(f"No workbook at {excel_file}")
+    return WorkbookRows(excel_file)
+
+
+def format_row(row: Dict) -> Tuple[str, ...]:
+    """Format one sales row for display, in SALES_COLUMNS order."""
+    values = []
+    for column in SALES_COLUMNS:
+        value = row.get(column)
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            values.append('')
+        elif column == 'Date':
+            values.append(pd.Timestamp(value).strftime('%Y-%m-%d'))
+        elif column in MONEY_COLUMNS:
+            values.append(f"{float(value):,.2f}")
+        elif column == 'Quantity Sold':
+            values.append(f"{float(value):g}")
+        else:
+            values.append(str(value))
+    return tuple(values)
+
+
+class RowBrowser:
+    """
+    A sorted, filtered view of a row source, read one page at a time.
+
+    rows(first, count) returns display tuples for any window of the view.
+    Pages of page_size rows are fetched on demand and the most recent
+    max_pages are kept, so memory stays bounded however far the user scrolls.
+    set_view() changes the range, filters or sort and starts from page one.
+    """
+
+    def __init__(self, source, page_size: int = DEFAULT_PAGE_SIZE, max_pages: int = DEFAULT_MAX_PAGES):
+        self.source = source
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages = OrderedDict()
+        self.start = self.end = None
+        self.filters = {}
+        self.sort_by = 'Date'
+        self.descending = False
+        self.total = 0
+        self.set_view()
+
+    def set_view(self, start=None, end=None, filters: Optional[Filters] = None,
+                 sort_by: Optional[str] = None, descending: Optional[bool] = None) -> int:
+        """Select the rows to browse and return how many there are."""
+        self.start, self.end = start, end
+        self.filters = {name: values for name, values in (filters or {}).items() if values}
+        if sort_by is not None:
+            self.sort_by = sort_by
+        if descending is not None:
+            self.descending = descending
+        self.pages.clear()
+        self.total = self.source.row_count(self.start, self.end, self.filters)
+        return self.total
+
+    def _page(self, number: int) -> List[Tuple[str, ...]]:
+        """Return one page of display rows, fetching it if it is not kept."""
+        if number in self.pages:
+            self.pages.move_to_end(number)
+            return self.pages[number]
+        frame = self.source.page_frame(number * self.page_size, self.page_size, self.start, self.end,
+                                       self.filters, self.sort_by, self.descending)
+        page = [format_row(row) for row in frame.to_dict('records')]
+        self.pages[number] = page
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+        return page
+
+    def rows(self, first: int, count: int) -> List[Tuple[str, ...]]:
+        """Return up to count display rows starting at row first of the view."""
+        first = max(0, min(first, self.total))
+        last = min(self.total, first + count)
+        rows = []
+        for number in range(first // self.page_size, (last - 1) // self.page_size + 1 if last > first else 0):
+            page = self._page(number)
+            offset = number * self.page_size
+            rows.extend(page[max(first - offset, 0):last - offset])
+        return rows
@@ -0,0 +1,168 @@
+"""
+Columnar Sidecar Cache
+Keeps a typed NumPy copy of the cleaned "Sales Entry" sheet next to the workbook
+so repeat analyses can skip re-parsing the Excel file.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".sales_cache.npz"
+
+
+def sidecar_path(excel_file: str) -> str:
+    """Return the sidecar cache path that belongs to an Excel workbook."""
+    root, _ = os.path.splitext(excel_file)
+    return root + CACHE_SUFFIX
+
+
+def file_content_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_signature(path: str, with_hash: bool = True) -> Dict:
+    """Describe a file by size, modification time and (optionally) content hash."""
+    stat = os.stat(path)
+    signature = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if with_hash:
+        signature['sha256'] = file_content_hash(path)
+    return signature
+
+
+def save_frame(df: pd.DataFrame, path: str, extra_meta: Optional[Dict] = None) -> None:
+    """
+    Write a DataFrame to a typed ``.npz`` file.
+
+    Numeric and datetime columns are stored as-is; nullable integer columns
+    are stored as values plus a missing-value mask. Text columns are stored as
+    int32 codes plus a table of unique strings, which keeps the file small and
+    lets it be read back without pickling.
+    """
+    arrays = {}
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) and series.dtype.kind in 'biuf':
+            arrays[f'c{i}_values'] = series.to_numpy(dtype=series.dtype.numpy_dtype, na_value=0)
+            arrays[f'c{i}_mask'] = series.isna().to_numpy()
+            columns.append({'name': name, 'dtype': str(series.dtype), 'kind': 'masked'})
+        elif series.dtype.kind in 'biufM':
+            arrays[f'c{i}_values'] = series.to_numpy()
+            columns.append({'name': name, 'dtype': str(series.dtype), 'kind': 'plain'})
+        else:
+            codes, uniques = pd.factorize(series)
+            if not all(isinstance(value, str) for value in uniques):
+                raise ValueError(f"Column '{name}' mixes text and non-text values")
+            arrays[f'c{i}_codes'] = codes.astype(np.int32)
+            arrays[f'c{i}_uniques'] = np.asarray(list(uniques), dtype=str)
+            columns.append({'name': name, 'dtype': str(series.dtype), 'kind': 'coded'})
+
+    arrays['index'] = df.index.to_numpy(dtype=np.int64)
+    meta = {'version': CACHE_VERSION, 'columns': columns}
+    meta.update(extra_meta or {})
+    arrays['meta'] = np.array(json.dumps(meta))
+
+    # Write to a temporary file first so readers never see a partial sidecar
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def read_meta(path: str) -> Dict:
+    """Read only the metadata block of a ``.npz`` frame file."""
+    with np.load(path, allow_pickle=False) as npz:
+        return json.loads(str(npz['meta']))
+
+
+def load_frame(path: str) -> pd.DataFrame:
+    """Read a DataFrame written by :func:`save_frame`."""
+    with np.load(path, allow_pickle=False) as npz:
+        meta = json.loads(str(npz['meta']))
+        data = {}
+        for i, column in enumerate(meta['columns']):
+            if column['kind'] == 'plain':
+                data[column['name']] = pd.Series(npz[f'c{i}_values'], dtype=column['dtype'])
+            elif column['kind'] == 'masked':
+                values = pd.Series(npz[f'c{i}_values'], dtype=column['dtype'])
+                data[column['name']] = values.mask(npz[f'c{i}_mask'])
+            else:
+                codes = npz[f'c{i}_codes']
+                uniques = npz[f'c{i}_uniques'].astype(object)
+                values = np.empty(len(codes), dtype=object)
+                values[:] = np.nan
+                present = codes >= 0
+                values[present] = uniques[codes[present]]
+                data[column['name']] = pd.Series(values, dtype=column['dtype'])
+        df = pd.DataFrame(data)
+        df.index = pd.Index(npz['index'])
+    return df
+
+
+def load_cached_frame(excel_file: str, cache_file: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Return the cached cleaned frame for a workbook, or None if it is missing or stale.
+
+    cache_file defaults to the workbook's sidecar; other derived files (such as
+    the sales cube) pass their own path to reuse the same freshness check.
+
+    A sidecar is fresh when the workbook's size and mtime still match. If only the
+    mtime changed (for example after a copy), the content hash decides, and the
+    stored mtime is refreshed so later checks stay cheap.
+    """
+    cache_file = cache_file or sidecar_path(excel_file)
+    if not os.path.exists(cache_file) or not os.path.exists(excel_file):
+        return None
+
+    try:
+        meta = read_meta(cache_file)
+        if meta.get('version') != CACHE_VERSION:
+            return None
+
+        cached = meta['source']
+        current = file_signature(excel_file, with_hash=False)
+        if current['size'] != cached['size']:
+            return None
+
+        df = None
+        if current['mtime_ns'] != cached['mtime_ns']:
+            if file_content_hash(excel_file) != cached['sha256']:
+                return None
+            df = load_frame(cache_file)
+            cached.update(current)
+            save_frame(df, cache_file, {'source': cached})
+
+        return df if df is not None else load_frame(cache_file)
+
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def store_cached_frame(excel_file: str, df: pd.DataFrame,
+                       signature: Optional[Dict] = None,
+                       cache_file: Optional[str] = None) -> bool:
+    """
+    Write the cleaned frame to the workbook's sidecar. Returns True on success.
+
+    Pass the signature taken *before* the workbook was read so that an edit made
+    while it was being parsed leaves the sidecar stale rather than wrong.
+    """
+    try:
+        signature = signature or file_signature(excel_file)
+        save_frame(df, cache_file or sidecar_path(excel_file), {'source': signature})
+        return True
+    except (OSError, ValueError) as e:
+        print(f"Could not write data cache: {e}")
+        return False
@@ -0,0 +1,286 @@
+"""
+Sales Chart Rendering
+Draws the four report charts from small precomputed aggregates. The render
+functions only take plain data and an output path, so they can run in
+separate worker processes.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional, Tuple
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+
+CHART_DPI = 300
+
+# Bump when a renderer's drawing code changes so cached charts are redrawn
+CHART_STYLE_VERSION = 1
+MANIFEST_FILE = 'chart_manifest.json'
+
+CHART_FILES = {
+    'daily': 'daily_sales_trend.png',
+    'product': 'product_performance.png',
+    'category': 'category_distribution.png',
+    'payment': 'payment_methods.png'
+}
+
+
+def render_daily_sales_chart(daily_sales: pd.DataFrame, chart_path: str, dpi: int = CHART_DPI) -> str:
+    """Draw the daily sales trend line chart from Date / Total Sales columns."""
+    plt.figure(figsize=(12, 6))
+    plt.plot(daily_sales['Date'], daily_sales['Total Sales'], marker='o', linewidth=2, markersize=6)
+    plt.title('Daily Sales Trend', fontsize=16, fontweight='bold')
+    plt.xlabel('Date', fontsize=12)
+    plt.ylabel('Total Sales ($)', fontsize=12)
+    plt.xticks(rotation=45)
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+    plt.savefig(chart_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+    return chart_path
+
+
+def render_product_performance_chart(top_products: pd.DataFrame, chart_path: str,
+                                     dpi: int = CHART_DPI) -> str:
+    """Draw the top products bar chart from Product Name / Total Revenue columns."""
+    plt.figure(figsize=(12, 8))
+    bars = plt.bar(range(len(top_products)), top_products['Total Revenue'])
+    plt.title('Top 10 Products by Revenue', fontsize=16, fontweight='bold')
+    plt.xlabel('Products', fontsize=12)
+    plt.ylabel('Total Revenue ($)', fontsize=12)
+    plt.xticks(range(len(top_products)), top_products['Product Name'].tolist(), rotation=45, ha='right')
+
+    # Add value labels on bars
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
+                f'${height:.0f}', ha='center', va='bottom')
+
+    plt.tight_layout()
+
+    plt.savefig(chart_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+    return chart_path
+
+
+def render_category_chart(category_sales: pd.Series, chart_path: str, dpi: int = CHART_DPI) -> str:
+    """Draw the category sales pie chart from revenue per category."""
+    plt.figure(figsize=(10, 8))
+    colors = plt.get_cmap('Set3')(np.linspace(0, 1, len(category_sales))).tolist()
+    pie_result = plt.pie(category_sales.to_numpy(), labels=category_sales.index.tolist(),
+                         autopct='%1.1f%%', colors=colors, startangle=90)
+    if len(pie_result) == 3:
+        wedges, texts, autotexts = pie_result
+    else:
+        wedges, texts = pie_result
+        autotexts = []
+
+    plt.title('Sales Distribution by Category', fontsize=16, fontweight='bold')
+
+    # Enhance text appearance
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+
+    plt.savefig(chart_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+    return chart_path
+
+
+def render_payment_method_chart(payment_data: pd.DataFrame, chart_path: str,
+                                dpi: int = CHART_DPI) -> str:
+    """Draw revenue and transaction count per payment method side by side."""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+
+    # Revenue by payment method
+    payment_data['Total Amount'].plot(kind='bar', ax=ax1, color='skyblue')
+    ax1.set_title('Revenue by Payment Method', fontweight='bold')
+    ax1.set_ylabel('Total Revenue ($)')
+    ax1.tick_params(axis='x', rotation=45)
+
+    # Transaction count by payment method
+    payment_data['Transaction Count'].plot(kind='bar', ax=ax2, color='lightcoral')
+    ax2.set_title('Transaction Count by Payment Method', fontweight='bold')
+    ax2.set_ylabel('Number of Transactions')
+    ax2.tick_params(axis='x', rotation=45)
+
+    plt.tight_layout()
+
+    plt.savefig(chart_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+    return chart_path
+
+
+RENDERERS: Dict[str, Callable] = {
+    'daily': render_daily_sales_chart,
+    'product': render_product_performance_chart,
+    'category': render_category_chart,
+    'payment': render_payment_method_chart
+}
+
+
+def _init_render_worker() -> None:
+    """Use the non-interactive Agg backend in chart worker processes."""
+    matplotlib.use('Agg')
+
+
+def chart_fingerprint(chart_name: str, data, dpi: int = CHART_DPI) -> str:
+    """
+    Hash a chart's input aggregate together with its render settings.
+
+    Two renders with the same fingerprint produce the same image, so a file
+    recorded under this fingerprint can be reused instead of redrawn.
+    """
+    digest = hashlib.sha256()
+    settings = {
+        'chart': chart_name,
+        'dpi': dpi,
+        'style_version': CHART_STYLE_VERSION,
+        'matplotlib': matplotlib.__version__
+    }
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    digest.update(json.dumps([str(name) for name in frame.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir: str) -> Dict[str, Dict]:
+    """Read the chart manifest of an output folder, or an empty one."""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir: str, manifest: Dict[str, Dict]) -> None:
+    """Write the chart manifest of an output folder."""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def _file_stat(path: str) -> Dict[str, int]:
+    """Return a file's size and modification time, as recorded in the manifest."""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _cached_chart(manifest: Dict[str, Dict], chart_path: str, fingerprint: str) -> bool:
+    """
+    True if chart_path was rendered from the given fingerprint and not written since.
+
+    The file's size and modification time must still match the manifest, so
+    a PNG overwritten by anything else is redrawn rather than reused.
+    """
+    entry = manifest.get(os.path.basename(chart_path))
+    if not entry or entry.get('fingerprint') != fingerprint:
+        return False
+    try:
+        current = _file_stat(chart_path)
+    except OSError:
+        return False
+    return entry.get('size') == current['size'] and entry.get('mtime_ns') == current['mtime_ns']
+
+
+def render_charts(jobs: Dict[str, Tuple[object, str]], parallel: bool = True,
+                  max_workers: Optional[int] = None, use_cache: bool = True,
+                  progress: Optional[Callable[[float, str], None]] = None) -> Dict[str, str]:
+    """
+    Render several charts and return their paths by chart name.
+
+    jobs maps a RENDERERS name to (aggregate, chart_path). With use_cache
+    enabled, a chart whose file was last rendered from an identical aggregate
+    and settings (see chart_fingerprint) and not written since is reused. The
+    output folder's chart_manifest.json records which fingerprint produced
+    each file, with the file's size and modification time; it is updated
+    whether or not use_cache is enabled.
+
+    With parallel enabled and more than one CPU available, each remaining
+    chart is drawn in its own worker process; only the small aggregate is sent
+    to the worker. If a process pool cannot be used, the charts are drawn one
+    after another instead.
+
+    progress, if given, is called with the fraction of charts done and a
+    message each time a chart is drawn or found unchanged.
+    """
+    fingerprints = {name: chart_fingerprint(name, data) for name, (data, _) in jobs.items()}
+    manifests = {}
+    results = {}
+    pending = {}
+    for name, (data, path) in jobs.items():
+        output_dir = os.path.dirname(path)
+        if output_dir not in manifests:
+            manifests[output_dir] = load_manifest(output_dir)
+        if use_cache and _cached_chart(manifests[output_dir], path, fingerprints[name]):
+            results[name] = path
+        else:
+            pending[name] = (data, path)
+
+    done = []
+
+    def report(name: str, state: str) -> None:
+        done.append(name)
+        if progress is not None:
+            progress(len(done) / len(jobs), f"{state} {name} chart")
+
+    for name in results:
+        report(name, "Reused")
+
+    rendered = None
+    workers = max_workers or min(len(pending), os.cpu_count() or 1)
+    if parallel and workers > 1 and len(pending) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as pool:
+                futures = {pool.submit(RENDERERS[name], data, path): name
+                           for name, (data, path) in pending.items()}
+                rendered = {}
+                for future in as_completed(futures):
+                    rendered[futures[future]] = future.result()
+                    report(futures[future], "Rendered")
+        except (OSError, BrokenProcessPool, pickle.PicklingError) as e:
+            print(f"Parallel chart rendering unavailable ({e}); rendering sequentially")
+            rendered = None
+            del done[len(results):]
+
+    if rendered is None:
+        rendered = {}
+        for name, (data, path) in pending.items():
+            rendered[name] = RENDERERS[name](data, path)
+            report(name, "Rendered")
+    results.update(rendered)
+
+    for name, path in rendered.items():
+        output_dir = os.path.dirname(path)
+        try:
+            stat = _file_stat(path)
+        except OSError:
+            continue
+        manifests[output_dir][os.path.basename(path)] = dict(stat, chart=name, fingerprint=fingerprints[name])
+    for output_dir, manifest in manifests.items():
+        if rendered:
+            try:
+                save_manifest(output_dir, manifest)
+            except OSError as e:
+                print(f"Could not write chart manifest: {e}")
+
+    # Keep the caller's chart order
+    return {name: results[name] for name in jobs}
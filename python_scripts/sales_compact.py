@@ -0,0 +1,128 @@
+"""
+Compact Sales Frames
+Shrinks cleaned sales rows in memory: categorical text columns, the smallest
+integer type for quantities, integer cents for money and second-resolution
+dates.
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+try:
+    from python_scripts.sales_money import MONEY_COLUMNS, cents_column
+except ImportError:
+    from sales_money import MONEY_COLUMNS, cents_column
+
+
+TEXT_COLUMNS = ['Product Name', 'Category', 'Payment Method', 'Customer Type']
+
+# Text columns with at most this share of distinct values become categoricals
+MAX_CATEGORY_RATIO = 0.5
+
+
+def _smallest_int_dtype(values: pd.Series):
+    """Return the smallest NumPy integer dtype that holds every value."""
+    low, high = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+
+def compact_sales_frame(sales_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a memory-compact copy of cleaned sales rows.
+
+    - Product Name, Category, Payment Method and Customer Type become
+      categoricals when they have few distinct values
+    - Quantity Sold becomes int8 / int16 / int32, whichever is smallest
+    - Unit Price and Total Amount are replaced by "Unit Price Cents" and
+      "Total Amount Cents" integer columns
+    - Date is stored as datetime64[s] (pandas has no day-resolution dtype)
+
+    Columns with missing values keep their original type, so no value changes.
+    """
+    compact = sales_data.copy()
+
+    for column in TEXT_COLUMNS:
+        if column in compact.columns and len(compact):
+            if compact[column].nunique(dropna=True) <= MAX_CATEGORY_RATIO * len(compact):
+                compact[column] = compact[column].astype('category')
+
+    if 'Quantity Sold' in compact.columns and compact['Quantity Sold'].notna().all() and len(compact):
+        quantity = compact['Quantity Sold']
+        if (quantity == quantity.round()).all():
+            compact['Quantity Sold'] = quantity.astype(_smallest_int_dtype(quantity))
+
+    for column in MONEY_COLUMNS:
+        if column not in compact.columns:
+            continue
+        cents = compact[cents_column(column)] if cents_column(column) in compact.columns else None
+        if cents is None and compact[column].notna().all() and len(compact):
+            cents = pd.Series(np.round(compact[column].to_numpy(dtype=np.float64) * 100), index=compact.index)
+        if cents is not None and cents.notna().all() and len(compact):
+            # Keep only the cents, in the dollar column's position
+            position = compact.columns.get_loc(column)
+            compact = compact.drop(columns=[name for name in (column, cents_column(column))
+                                            if name in compact.columns])
+            compact.insert(position, cents_column(column), cents.astype(_smallest_int_dtype(cents)))
+
+    if 'Date' in compact.columns and compact['Date'].dtype.kind == 'M':
+        compact['Date'] = compact['Date'].astype('datetime64[s]')
+
+    return compact
+
+
+def column_memory(sales_data: pd.DataFrame) -> Dict[str, int]:
+    """Return the memory used by each column (and the index) in bytes, counting string contents."""
+    usage = sales_data.memory_usage(deep=True, index=True)
+    return {column: int(size) for column, size in usage.items()}
+
+
+def compare_memory(before: Dict[str, int], after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare per-column memory of the original rows with a compact frame.
+
+    Each money column and its cents column share one row, so a cents column
+    that was already present before compaction is not counted twice. The
+    totals equal the two frames' full memory_usage(deep=True).
+    """
+    after_usage = column_memory(after)
+    companions = {cents_column(column): column for column in MONEY_COLUMNS}
+    folded = {}
+    for column, before_bytes in before.items():
+        name = companions.get(column, column)
+        if name not in before:
+            name = column
+        folded[name] = folded.get(name, 0) + before_bytes
+
+    rows = []
+    counted = set()
+    for column, before_bytes in folded.items():
+        names = [name for name in (column, cents_column(column)) if name in after_usage]
+        if column not in MONEY_COLUMNS:
+            names = names[:1]
+        after_bytes = sum(after_usage[name] for name in names)
+        counted.update(names)
+        rows.append({
+            'Column': column,
+            'Before (bytes)': before_bytes,
+            'After (bytes)': after_bytes,
+            'Dtype': ', '.join(str(after[name].dtype) for name in names if name in after.columns),
+            'Saved (%)': round(100 * (1 - after_bytes / before_bytes), 1) if before_bytes else 0.0
+        })
+    for column, after_bytes in after_usage.items():
+        if column not in counted:
+            rows.append({'Column': column, 'Before (bytes)': 0, 'After (bytes)': after_bytes,
+                         'Dtype': str(after[column].dtype) if column in after.columns else '',
+                         'Saved (%)': 0.0})
+
+    report = pd.DataFrame(rows).set_index('Column')
+    total_before = report['Before (bytes)'].sum()
+    total_after = report['After (bytes)'].sum()
+    report.loc['Total'] = [total_before, total_after, '',
+                           round(100 * (1 - total_after / total_before), 1) if total_before else 0.0]
+    return report
@@ -0,0 +1,166 @@
+"""
+Multi-Store Consolidation
+Aggregates one workbook per shop in parallel worker processes and merges the
+partial aggregates into a chain-wide plan with per-store breakdowns.
+"""
+
+import glob
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+try:
+    from python_scripts.sales_aggregates import AggregationPlan
+except ImportError:
+    from sales_aggregates import AggregationPlan
+
+
+WORKBOOK_PATTERNS = ('*.xlsx', '*.xlsm')
+
+
+def resolve_workbooks(source: str) -> List[str]:
+    """
+    Return the workbooks named by a directory, a glob pattern or a single file.
+
+    A directory yields its .xlsx / .xlsm files (not subfolders). Excel's "~$"
+    lock files are skipped. Paths are sorted so store order is stable.
+    """
+    if os.path.isdir(source):
+        paths = [path for pattern in WORKBOOK_PATTERNS for path in glob.glob(os.path.join(source, pattern))]
+    elif any(char in source for char in '*?['):
+        paths = glob.glob(source)
+    else:
+        paths = [source] if os.path.exists(source) else []
+    return sorted(path for path in paths if not os.path.basename(path).startswith('~$'))
+
+
+def store_name(workbook: str) -> str:
+    """Return the store name for a workbook: its file name without the extension."""
+    return os.path.splitext(os.path.basename(workbook))[0]
+
+
+def aggregate_workbook(workbook: str, backend: str = 'pandas', use_cache: bool = True) -> Dict:
+    """
+    Load one store's workbook and return its partial aggregate.
+
+    Runs in a worker process. The result holds the store name, the
+    AggregationPlan (sums, counts and value sketches) and the seconds taken;
+    only this small summary is sent back to the parent process.
+    """
+    # Imported here: sales_analyzer imports this module for its consolidation mode
+    try:
+        from python_scripts.sales_analyzer import SalesAnalyzer
+    except ImportError:
+        from sales_analyzer import SalesAnalyzer
+
+    started = time.perf_counter()
+    analyzer = SalesAnalyzer(workbook, use_cache=use_cache, backend=backend)
+    analyzer.load_sales_data()
+    plan = analyzer.build_aggregation_plan()
+    return {
+        'store': store_name(workbook),
+        'workbook': workbook,
+        'plan': plan,
+        'seconds': time.perf_counter() - started
+    }
+
+
+def merge_plans(plans: List[AggregationPlan]) -> AggregationPlan:
+    """Merge plans pairwise, so each row of the result is regrouped about log2(n) times."""
+    plans = [plan for plan in plans if not plan.empty]
+    if not plans:
+        return AggregationPlan()
+    while len(plans) > 1:
+        merged = [plans[i].merge(plans[i + 1]) for i in range(0, len(plans) - 1, 2)]
+        if len(plans) % 2:
+            merged.append(plans[-1])
+        plans = merged
+    return plans[0]
+
+
+class ConsolidatedSales:
+    """
+    Per-store aggregation plans for a chain of shops and their merged total.
+
+    chain is the reduce step's AggregationPlan over every store, so it feeds
+    the usual report tables. stores keeps each store's own plan for the
+    breakdown; timings records how long each workbook took in its worker.
+    """
+
+    def __init__(self, stores: Dict[str, AggregationPlan], timings: Optional[Dict[str, float]] = None,
+                 wall_seconds: float = 0.0):
+        self.stores = stores
+        self.timings = timings or {}
+        self.wall_seconds = wall_seconds
+        self.chain = merge_plans(list(stores.values()))
+
+    @classmethod
+    def from_workbooks(cls, workbooks: List[str], max_workers: Optional[int] = None,
+                       backend: str = 'pandas', use_cache: bool = True,
+                       parallel: bool = True) -> 'ConsolidatedSales':
+        """
+        Aggregate each workbook in its own worker process and merge the results.
+
+        Workers default to one per CPU, capped at the number of workbooks. With
+        one CPU, parallel disabled or no usable process pool, the workbooks are
+        aggregated one after another in this process instead.
+        """
+        started = time.perf_counter()
+        workers = max_workers or min(len(workbooks), os.cpu_count() or 1)
+        partials = None
+        if parallel and workers > 1 and len(workbooks) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(aggregate_workbook, workbook, backend, use_cache)
+                               for workbook in workbooks]
+                    partials = [future.result() for future in as_completed(futures)]
+            except (OSError, BrokenProcessPool, pickle.PicklingError) as e:
+                print(f"Parallel consolidation unavailable ({e}); aggregating sequentially")
+
+        if partials is None:
+            partials = [aggregate_workbook(workbook, backend, use_cache) for workbook in workbooks]
+
+        # Keep the workbook order, whatever order the workers finished in
+        order = {workbook: i for i, workbook in enumerate(workbooks)}
+        partials.sort(key=lambda partial: order[partial['workbook']])
+        stores = {}
+        for partial in partials:
+            name = partial['store']
+            if name in stores:
+                name = f"{name} ({os.path.dirname(partial['workbook']) or '.'})"
+            stores[name] = partial['plan']
+        timings = {name: partial['seconds'] for name, partial in zip(stores, partials)}
+        return cls(stores, timings, time.perf_counter() - started)
+
+    def store_breakdown(self) -> pd.DataFrame:
+        """Return one row of headline numbers per store, largest revenue first."""
+        columns = ['Total Revenue', 'Transactions', 'Avg Transaction', 'Median Transaction',
+                   'Best Selling Product', 'First Sale', 'Last Sale', 'Revenue Share (%)']
+        rows = {}
+        total_cents = 0 if self.chain.empty else self.chain.key_metrics()['total_revenue_cents']
+        for name, plan in self.stores.items():
+            if plan.empty:
+                continue
+            metrics = plan.key_metrics()
+            rows[name] = [
+                metrics['total_revenue'],
+                metrics['total_transactions'],
+                metrics['avg_transaction'],
+                metrics['transaction_quantiles'].get('Median'),
+                metrics['best_selling_product'],
+                metrics['first_date'],
+                metrics['last_date'],
+                round(100 * metrics['total_revenue_cents'] / total_cents, 1) if total_cents else 0.0
+            ]
+        breakdown = pd.DataFrame.from_dict(rows, orient='index', columns=columns)
+        breakdown.index.name = 'Store'
+        return breakdown.sort_values('Total Revenue', ascending=False)
+
+    def empty_stores(self) -> List[str]:
+        """Return the stores whose workbook had no usable sales rows."""
+        return [name for name, plan in self.stores.items() if plan.empty]
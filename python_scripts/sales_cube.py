@@ -0,0 +1,128 @@
+"""
+Sales Cube
+Pre-aggregated sales totals over every combination of date, product, category,
+payment method and customer type, saved next to the workbook so rollup
+questions can be answered without rescanning the raw rows.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from python_scripts.sales_cache import load_cached_frame, store_cached_frame
+    from python_scripts.sales_money import amount_cents, cents_column, to_dollars
+except ImportError:
+    from sales_cache import load_cached_frame, store_cached_frame
+    from sales_money import amount_cents, cents_column, to_dollars
+
+
+CUBE_SUFFIX = ".sales_cube.npz"
+
+
+def cube_path(excel_file: str) -> str:
+    """Return the cube file path that belongs to an Excel workbook."""
+    root, _ = os.path.splitext(excel_file)
+    return root + CUBE_SUFFIX
+
+
+class SalesCube:
+    """
+    Sales totals for every (date, product, category, payment, customer type) cell.
+
+    Only combinations that actually occur are stored. Rollups filter and sum
+    these cells, so their cost depends on the size of the cube rather than on
+    the number of sales rows. Sales are kept as integer cents in the cells and
+    only turned into dollars in rollup results.
+
+    Examples:
+        cube.rollup(['Category'], start='2025-03-01', end='2025-03-31')
+        cube.rollup(['Date'], filters={'Payment Method': ['Credit Card', 'Debit Card']})
+    """
+
+    DIMENSIONS = ['Date', 'Product Name', 'Category', 'Payment Method', 'Customer Type']
+    MEASURES = ['Total Sales', 'Total Quantity', 'Total Transactions']
+    CELL_MEASURES = [cents_column('Total Sales'), 'Total Quantity', 'Total Transactions']
+
+    def __init__(self, cells: pd.DataFrame):
+        self.cells = cells
+
+    @classmethod
+    def from_frame(cls, sales_data: pd.DataFrame) -> 'SalesCube':
+        """Materialize the cube from cleaned sales rows."""
+        if sales_data.empty:
+            return cls(pd.DataFrame(columns=cls.DIMENSIONS + cls.CELL_MEASURES))
+
+        amount = cents_column('Total Amount')
+        if amount not in sales_data.columns:
+            sales_data = sales_data.assign(**{amount: amount_cents(sales_data)})
+        cells = sales_data.groupby(cls.DIMENSIONS, dropna=False, observed=True).agg(
+            total_sales=(amount, 'sum'),
+            total_quantity=('Quantity Sold', 'sum'),
+            total_transactions=('Date', 'size')
+        ).reset_index()
+        cells.columns = cls.DIMENSIONS + cls.CELL_MEASURES
+        cells[cls.CELL_MEASURES[0]] = cells[cls.CELL_MEASURES[0]].astype(np.int64)
+        return cls(cells)
+
+    @classmethod
+    def load_for_workbook(cls, excel_file: str) -> Optional['SalesCube']:
+        """Load the workbook's saved cube, or return None if missing or out of date."""
+        cells = load_cached_frame(excel_file, cube_path(excel_file))
+        return cls(cells) if cells is not None else None
+
+    def save_for_workbook(self, excel_file: str, signature: Optional[Dict] = None) -> bool:
+        """Save the cube next to its workbook. Returns True on success."""
+        return store_cached_frame(excel_file, self.cells, signature, cube_path(excel_file))
+
+    @property
+    def empty(self) -> bool:
+        """True when the cube holds no sales."""
+        return self.cells.empty
+
+    def _check_dimension(self, name: str) -> None:
+        """Raise a ValueError for names that are not cube dimensions."""
+        if name not in self.DIMENSIONS and name != 'Month':
+            raise ValueError(f"Unknown cube dimension: {name}")
+
+    def rollup(self, by: Iterable[str] = (), start=None, end=None,
+               filters: Optional[Dict[str, Union[str, List[str]]]] = None) -> pd.DataFrame:
+        """
+        Sum the cube's measures grouped by the given dimensions.
+
+        by may include 'Month' in addition to the stored dimensions. start and
+        end are inclusive dates. filters maps a dimension to one value or a list
+        of accepted values.
+        """
+        by = list(by)
+        for name in by:
+            self._check_dimension(name)
+
+        if self.empty:
+            return pd.DataFrame(columns=self.MEASURES)
+
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+        if start is not None:
+            mask &= (cells['Date'] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            end_exclusive = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+            mask &= (cells['Date'] < end_exclusive).to_numpy()
+        for name, values in (filters or {}).items():
+            if name not in self.DIMENSIONS:
+                raise ValueError(f"Cannot filter on: {name}")
+            accepted = [values] if isinstance(values, str) else list(values)
+            mask &= cells[name].isin(accepted).to_numpy()
+
+        selected = cells[mask]
+        if not by:
+            totals = selected[self.CELL_MEASURES].sum().to_frame().T
+        else:
+            keys = [selected['Date'].dt.to_period('M').rename('Month') if name == 'Month'
+                    else selected[name] for name in by]
+            totals = selected.groupby(keys)[self.CELL_MEASURES].sum()
+        totals[self.CELL_MEASURES[0]] = to_dollars(totals[self.CELL_MEASURES[0]])
+        totals.columns = self.MEASURES
+        return totals
@@ -0,0 +1,353 @@
+"""
+Incremental Sales Ingestion
+Keeps the report's aggregation plan next to the workbook together with a
+high-water mark, so each run only aggregates the rows added since the last one.
+"""
+
+import hashlib
+import io
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from openpyxl import load_workbook
+
+# openpyxl's sheet parser is private (checked against openpyxl 3.0 and 3.1, see
+# requirements.txt); without it rows are read through the public iter_rows()
+try:
+    from openpyxl.worksheet._reader import WorkSheetParser
+except ImportError:
+    WorkSheetParser = None
+
+try:
+    from python_scripts.sales_aggregates import AggregationPlan
+    from python_scripts.sales_cache import CACHE_VERSION, load_frame, read_meta, save_frame
+    from python_scripts.sales_sketches import ValueSketches
+    from python_scripts.sales_stream import DEFAULT_BATCH_SIZE, _column_names, clean_sales_rows
+except ImportError:
+    from sales_aggregates import AggregationPlan
+    from sales_cache import CACHE_VERSION, load_frame, read_meta, save_frame
+    from sales_sketches import ValueSketches
+    from sales_stream import DEFAULT_BATCH_SIZE, _column_names, clean_sales_rows
+
+
+PLAN_SUFFIX = ".sales_plan.npz"
+SKETCH_SUFFIX = ".sales_sketches.npz"
+
+
+def plan_path(excel_file: str) -> str:
+    """Return the persisted aggregation plan path that belongs to an Excel workbook."""
+    root, _ = os.path.splitext(excel_file)
+    return root + PLAN_SUFFIX
+
+
+def sketch_path(plan_file: str) -> str:
+    """Return the path of the value sketches saved alongside a plan file."""
+    if plan_file.endswith(PLAN_SUFFIX):
+        return plan_file[:-len(PLAN_SUFFIX)] + SKETCH_SUFFIX
+    root, _ = os.path.splitext(plan_file)
+    return root + SKETCH_SUFFIX
+
+
+def row_hash(values: Sequence) -> str:
+    """Return a stable hash of one worksheet row's values."""
+    return hashlib.sha256(json.dumps(list(values), default=str).encode()).hexdigest()
+
+
+def chain_hash(previous: str, row_number: int, values: Sequence) -> str:
+    """
+    Extend a running hash of a sheet's rows with one more row.
+
+    The row number is hashed with the decoded values, so the hash does not
+    depend on how the XML was written. Blank rows leave it unchanged, because
+    iter_rows() yields them and the raw sheet parser does not.
+    """
+    if all(value is None for value in values):
+        return previous
+    return hashlib.sha256((previous + row_hash([row_number, *values])).encode()).hexdigest()
+
+
+def _padded(values: Sequence, width: int) -> tuple:
+    """Cut or pad a row's values to width columns."""
+    return tuple(values[:width]) + (None,) * (width - len(values))
+
+
+class _TailReader(io.RawIOBase):
+    """A file object that returns some buffered bytes, then the rest of a source stream."""
+
+    def __init__(self, head: bytes, source):
+        self.pending = head
+        self.source = source
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self.pending:
+            self.pending = self.source.read(len(buffer))
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+
+def raw_scan_available(workbook, sheet_name: str) -> bool:
+    """True when the private openpyxl hooks used to scan raw sheet XML are present."""
+    sheet = workbook[sheet_name]
+    return (WorkSheetParser is not None and hasattr(sheet, '_get_source')
+            and hasattr(workbook, '_date_formats') and hasattr(workbook, '_timedelta_formats'))
+
+
+def _iter_rows_public(workbook, sheet_name: str, first_row: int, width: int) -> Iterator[Tuple[int, tuple]]:
+    """iter_rows_from through openpyxl's public API."""
+    rows = workbook[sheet_name].iter_rows(min_row=first_row, max_col=width, values_only=True)
+    for row_number, values in enumerate(rows, start=first_row):
+        yield row_number, _padded(values, width)
+
+
+def iter_rows_from(workbook, sheet_name: str, first_row: int, width: int,
+                   chunk_size: int = 1 << 20, digest=None) -> Iterator[Tuple[int, tuple]]:
+    """
+    Yield (row number, values) for the rows of a read-only sheet from first_row on.
+
+    openpyxl's iter_rows(min_row=...) still converts every earlier cell. Here the
+    decompressed sheet XML is scanned as raw bytes for the ``<row r="first_row"``
+    tag and only the rows after it are parsed. Yields nothing if that row is not
+    in the sheet. Rows missing from the XML (blank rows) are skipped.
+
+    digest, if given, is a hashlib object updated with the sheet data before
+    first_row (the raw XML between ``<sheetData>`` and the tag) by the time
+    the first row is yielded. Without openpyxl's private parser (see
+    raw_scan_available) the public iter_rows(min_row=...) is used and digest
+    is left untouched.
+    """
+    if not raw_scan_available(workbook, sheet_name):
+        yield from _iter_rows_public(workbook, sheet_name, first_row, width)
+        return
+
+    sheet = workbook[sheet_name]
+    marker = b'<row r="%d"' % first_row
+    with sheet._get_source() as source:
+        preamble = None
+        buffer = b''
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            buffer += chunk
+            if preamble is None:
+                data_start = buffer.find(b'<sheetData>')
+                if data_start < 0:
+                    continue
+                data_start += len(b'<sheetData>')
+                preamble, buffer = buffer[:data_start], buffer[data_start:]
+            found = buffer.find(marker)
+            if found >= 0:
+                break
+            # Hash and drop what was scanned, keeping enough bytes to match a split marker
+            keep_from = max(0, len(buffer) - len(marker))
+            if digest is not None:
+                digest.update(buffer[:keep_from])
+            buffer = buffer[keep_from:]
+        if digest is not None:
+            digest.update(buffer[:found])
+
+        stream = io.BufferedReader(_TailReader(preamble + buffer[found:], source))
+        parser = WorkSheetParser(stream, workbook.shared_strings, data_only=workbook.data_only,
+                                 epoch=workbook.epoch, date_formats=workbook._date_formats,
+                                 timedelta_formats=workbook._timedelta_formats)
+        for row_number, cells in parser.parse():
+            values = [None] * width
+            for cell in cells:
+                if cell['column'] <= width:
+                    values[cell['column'] - 1] = cell['value']
+            yield row_number, tuple(values)
+
+
+def prefix_hash(workbook, sheet_name: str, row: int, width: int) -> Optional[str]:
+    """
+    Return the hash of the raw sheet XML before a row (see iter_rows_from).
+
+    None if the row is missing or the raw scan is not available.
+    """
+    if not raw_scan_available(workbook, sheet_name):
+        return None
+    digest = hashlib.sha256()
+    rows = iter_rows_from(workbook, sheet_name, row, width, digest=digest)
+    try:
+        found = next(rows, None)
+    finally:
+        rows.close()
+    return digest.hexdigest() if found is not None and found[0] == row else None
+
+
+def values_hash(workbook, sheet_name: str, row: int, width: int) -> str:
+    """Return the chain_hash of the decoded values of every data row before a row."""
+    chain = ''
+    if row > 2:
+        rows = workbook[sheet_name].iter_rows(min_row=2, max_row=row - 1, max_col=width, values_only=True)
+        for row_number, values in enumerate(rows, start=2):
+            chain = chain_hash(chain, row_number, _padded(values, width))
+    return chain
+
+
+class IncrementalIngestor:
+    """
+    Folds newly appended "Sales Entry" rows into a persisted AggregationPlan.
+
+    The watermark is the sheet row number of the last row holding a sale
+    (Product Name and Date filled in), a hash of that row and a hash of the
+    decoded values of every row before it (see values_hash), which is
+    carried forward row by row as new rows are aggregated. If those are
+    unchanged, only the rows below the watermark are aggregated and merged
+    into the saved plan; if any earlier row or the watermark row was edited
+    or removed, or the header changed, the plan is rebuilt from the whole
+    sheet.
+
+    Reading the earlier rows to check their values costs about as much as
+    parsing them, so the watermark also keeps a hash of their raw XML (see
+    prefix_hash). When the XML is byte-for-byte unchanged the values are
+    not read at all; when it differs (for instance because the workbook was
+    re-saved by another program, which rewrites strings and styles), the
+    values are read and compared, and only a real change forces a rebuild.
+    """
+
+    def __init__(self, excel_file: str, backend: str = 'pandas', batch_size: int = DEFAULT_BATCH_SIZE,
+                 sheet_name: str = "Sales Entry", plan_file: Optional[str] = None):
+        self.excel_file = excel_file
+        self.backend = backend
+        self.batch_size = batch_size
+        self.sheet_name = sheet_name
+        self.plan_file = plan_file or plan_path(excel_file)
+        self.last_run = {}
+
+    def load_state(self) -> Optional[Tuple[AggregationPlan, Dict]]:
+        """
+        Return the saved plan and watermark, or None if there is no usable state.
+
+        The plan's value sketches live in a second file; if it is missing or
+        was written for a different row count, the state is not used.
+        """
+        if not os.path.exists(self.plan_file):
+            return None
+        try:
+            meta = read_meta(self.plan_file)
+            if meta.get('version') != CACHE_VERSION:
+                return None
+            watermark = meta['watermark']
+            if watermark['row_count'] == 0:
+                return AggregationPlan(), watermark
+            if read_meta(sketch_path(self.plan_file)).get('row_count') != watermark['row_count']:
+                return None
+            base = load_frame(self.plan_file).set_index(AggregationPlan.BASE_KEYS)
+            sketches = ValueSketches.from_table(load_frame(sketch_path(self.plan_file)))
+            return AggregationPlan(base, watermark['row_count'], sketches), watermark
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save_state(self, plan: AggregationPlan, watermark: Dict) -> bool:
+        """Persist the plan and its value sketches with the watermark. Returns True on success."""
+        if plan.empty:
+            base = pd.DataFrame(columns=AggregationPlan.BASE_KEYS + AggregationPlan.MEASURES)
+        else:
+            base = plan.base.reset_index()
+        watermark = dict(watermark, row_count=plan.row_count)
+        try:
+            if plan.sketches is not None:
+                save_frame(plan.sketches.to_table(), sketch_path(self.plan_file), {'row_count': plan.row_count})
+            save_frame(base, self.plan_file, {'watermark': watermark})
+            return True
+        except (OSError, ValueError) as e:
+            print(f"Could not write aggregation plan: {e}")
+            return False
+
+    def _scan(self, rows, columns: List[str], plan: AggregationPlan, watermark: Dict,
+              chain: str = '') -> Tuple[AggregationPlan, Dict, int]:
+        """
+        Aggregate (row number, values) pairs into plan, moving the watermark along.
+
+        chain is the chain_hash of the rows before the first pair; the
+        watermark records it as values_hash as of the watermark row.
+        """
+        product_col = columns.index('Product Name')
+        date_col = columns.index('Date')
+        batch = []
+        new_rows = 0
+        for row_number, values in rows:
+            values = _padded(values, len(columns))
+            if values[product_col] is not None and values[date_col] is not None:
+                watermark = dict(watermark, row=row_number, row_hash=row_hash(values), values_hash=chain)
+            chain = chain_hash(chain, row_number, values)
+            batch.append(values)
+            if len(batch) >= self.batch_size:
+                new_rows += len(batch)
+                plan = plan.merge(AggregationPlan.from_frame(
+                    clean_sales_rows(pd.DataFrame.from_records(batch, columns=columns)), self.backend))
+                batch = []
+        if batch:
+            new_rows += len(batch)
+            plan = plan.merge(AggregationPlan.from_frame(
+                clean_sales_rows(pd.DataFrame.from_records(batch, columns=columns)), self.backend))
+        return plan, watermark, new_rows
+
+    def ingest(self, force_rebuild: bool = False) -> AggregationPlan:
+        """
+        Bring the saved plan up to date with the workbook and return it.
+
+        self.last_run records whether the run was incremental, how many sheet
+        rows were read and, as 'added', the plan of just those rows.
+        """
+        state = None if force_rebuild else self.load_state()
+        workbook = load_workbook(self.excel_file, read_only=True, data_only=True)
+        try:
+            sheet = workbook[self.sheet_name]
+            header = next(sheet.iter_rows(max_row=1, values_only=True), None)
+            if header is None:
+                return AggregationPlan()
+            columns = _column_names(header)
+            header_hash = row_hash(columns)
+
+            incremental = xml_unchanged = False
+            if state is not None:
+                plan, watermark = state
+                if (watermark.get('header_hash') == header_hash and watermark.get('row')
+                        and watermark.get('values_hash') is not None):
+                    digest = hashlib.sha256()
+                    rows = iter_rows_from(workbook, self.sheet_name, watermark['row'], len(columns),
+                                          digest=digest)
+                    marked = next(rows, None)
+                    if (marked is not None and marked[0] == watermark['row']
+                            and row_hash(_padded(marked[1], len(columns))) == watermark['row_hash']):
+                        xml_unchanged = (watermark.get('prefix_hash') is not None
+                                         and digest.hexdigest() == watermark['prefix_hash'])
+                        incremental = xml_unchanged or values_hash(
+                            workbook, self.sheet_name, watermark['row'], len(columns)) == watermark['values_hash']
+
+            if incremental:
+                previous_row = watermark['row']
+                chain = chain_hash(watermark['values_hash'], previous_row, _padded(marked[1], len(columns)))
+                added, watermark, new_rows = self._scan(rows, columns, AggregationPlan(), watermark, chain)
+                plan = plan.merge(added)
+            else:
+                previous_row = None
+                rows = enumerate(sheet.iter_rows(min_row=2, max_col=len(columns), values_only=True), start=2)
+                watermark = {'header_hash': header_hash, 'row': None, 'row_hash': None,
+                             'values_hash': None, 'prefix_hash': None}
+                added, watermark, new_rows = self._scan(rows, columns, AggregationPlan(), watermark)
+                plan = added
+
+            # Hash the raw XML before the watermark row for the next run's quick check
+            if watermark['row'] and (watermark['row'] != previous_row or not xml_unchanged):
+                watermark['prefix_hash'] = prefix_hash(workbook, self.sheet_name, watermark['row'],
+                                                       len(columns))
+        finally:
+            workbook.close()
+
+        self.last_run = {'incremental': incremental, 'rows_read': new_rows, 'added': added}
+        self.save_state(plan, watermark)
+        return plan
+
+    def rebuild(self) -> AggregationPlan:
+        """Aggregate the whole sheet again, ignoring the saved watermark."""
+        return self.ingest(force_rebuild=True)
@@ -0,0 +1,87 @@
+"""
+Money in Integer Cents
+Converts dollar amounts to int64 cents so totals are summed exactly, and
+formats cent totals for reports without going back through floats.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+MONEY_COLUMNS = ['Unit Price', 'Total Amount']
+CENTS_SUFFIX = ' Cents'
+
+
+def cents_column(column: str) -> str:
+    """Return the integer-cents column name for a money column."""
+    return column + CENTS_SUFFIX
+
+
+def to_cents(amounts: pd.Series) -> pd.Series:
+    """
+    Convert dollar amounts to integer cents.
+
+    Amounts are rounded to the nearest cent. The result is int64, or the
+    nullable Int64 type when some amounts are missing.
+    """
+    cents = np.round(pd.to_numeric(amounts, errors='coerce').to_numpy(dtype=np.float64) * 100)
+    cents = pd.Series(cents, index=amounts.index)
+    return cents.astype('Int64') if cents.isna().any() else cents.astype(np.int64)
+
+
+def add_cents_columns(sales_data: pd.DataFrame) -> pd.DataFrame:
+    """Add "Unit Price Cents" and "Total Amount Cents" next to the dollar columns."""
+    for column in MONEY_COLUMNS:
+        if column in sales_data.columns:
+            sales_data[cents_column(column)] = to_cents(sales_data[column])
+    return sales_data
+
+
+def amount_cents(sales_data: pd.DataFrame, column: str = 'Total Amount') -> pd.Series:
+    """Return a money column in cents, using the stored cents column when there is one."""
+    if cents_column(column) in sales_data.columns:
+        return sales_data[cents_column(column)]
+    return to_cents(sales_data[column])
+
+
+def with_dollar_columns(sales_data: pd.DataFrame) -> pd.DataFrame:
+    """Return rows that have the dollar money columns, deriving them from cents if needed."""
+    missing = [column for column in MONEY_COLUMNS
+               if column not in sales_data.columns and cents_column(column) in sales_data.columns]
+    if not missing:
+        return sales_data
+    return sales_data.assign(**{column: sales_data[cents_column(column)].astype('float64') / 100
+                                for column in missing})
+
+
+def divide_cents(total_cents, count):
+    """
+    Divide cent totals by counts, rounding half up to whole cents.
+
+    Works on single integers and on arrays / Series of them. A zero count
+    gives 0.
+    """
+    total = np.asarray(total_cents, dtype=np.int64)
+    count = np.asarray(count, dtype=np.int64)
+    quotient = np.where(count > 0, (2 * total + count) // np.maximum(2 * count, 1), 0)
+    if quotient.ndim == 0:
+        return int(quotient)
+    if isinstance(total_cents, pd.Series):
+        return pd.Series(quotient, index=total_cents.index)
+    return quotient
+
+
+def to_dollars(cents):
+    """Convert integer cents (a number, array or Series) to float dollars."""
+    if isinstance(cents, pd.Series):
+        return cents.astype(np.float64) / 100
+    return cents / 100
+
+
+def format_cents(cents: int, grouping: bool = True) -> str:
+    """Format integer cents as dollars, e.g. 123456 -> "$1,234.56"."""
+    cents = int(cents)
+    sign = '-' if cents < 0 else ''
+    dollars, remainder = divmod(abs(cents), 100)
+    dollar_text = f"{dollars:,}" if grouping else str(dollars)
+    return f"{sign}${dollar_text}.{remainder:02d}"
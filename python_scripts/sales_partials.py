@@ -0,0 +1,331 @@
+"""
+Portable Partial Aggregates
+Writes a shop's sales as small, versioned files of per-day totals (products,
+categories, payment methods and customer types) and merges any number of them
+into chain-wide reports without the original workbooks.
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from python_scripts.sales_aggregates import AggregationPlan
+    from python_scripts.sales_consolidate import ConsolidatedSales
+    from python_scripts.sales_money import amount_cents, format_cents, to_dollars
+    from python_scripts.sales_sketches import DEFAULT_QUANTILE_K, KLLSketch, ValueSketches
+    from python_scripts.sales_stream import DEFAULT_BATCH_SIZE, clean_sales_rows, iter_sales_batches
+except ImportError:
+    from sales_aggregates import AggregationPlan
+    from sales_consolidate import ConsolidatedSales
+    from sales_money import amount_cents, format_cents, to_dollars
+    from sales_sketches import DEFAULT_QUANTILE_K, KLLSketch, ValueSketches
+    from sales_stream import DEFAULT_BATCH_SIZE, clean_sales_rows, iter_sales_batches
+
+
+PARTIAL_FORMAT = 'daily-sales-partial'
+PARTIAL_VERSION = 1
+PARTIAL_SUFFIX = '.sales_partial.json.gz'
+
+SALES_FIELDS = ['Date', 'Product Name', 'Category', 'Payment Method'] + AggregationPlan.MEASURES
+CUSTOMER_KEYS = ['Date', 'Customer Type']
+CUSTOMER_MEASURES = ['amount_cents', 'quantity_sum', 'rows']
+
+
+def _date_text(date) -> str:
+    """Write a date as YYYY-MM-DD, keeping the time only when there is one."""
+    date = pd.Timestamp(date)
+    return date.date().isoformat() if date == date.normalize() else date.isoformat()
+
+
+def _json_value(value):
+    """Return a JSON-ready value: None for missing, int for whole numbers."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return _date_text(value)
+    if isinstance(value, (np.integer, int)):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return int(value) if float(value).is_integer() else float(value)
+    return str(value)
+
+
+def partial_path(out_dir: str, store: str, date) -> str:
+    """Return the file name for one store's partial aggregate of one day."""
+    safe_store = store.replace(os.sep, '_').replace('/', '_')
+    return os.path.join(out_dir, f"{safe_store}_{pd.Timestamp(date).date().isoformat()}{PARTIAL_SUFFIX}")
+
+
+class SalesPartial:
+    """
+    One store's totals, ready to be written to a partial-aggregate file.
+
+    plan is the usual AggregationPlan (per date, product, category and payment
+    method, with its transaction-value sketches); customer_types holds the
+    totals per date and customer type, which the plan does not group by. Money
+    is kept as integer cents, so merged files give exact totals.
+    """
+
+    def __init__(self, store: str, plan: Optional[AggregationPlan] = None,
+                 customer_types: Optional[pd.DataFrame] = None):
+        self.store = store
+        self.plan = plan if plan is not None else AggregationPlan()
+        self.customer_types = customer_types
+
+    @classmethod
+    def from_frame(cls, sales_data: pd.DataFrame, store: str, backend: str = 'pandas') -> 'SalesPartial':
+        """Summarize cleaned sales rows."""
+        if sales_data.empty:
+            return cls(store)
+        customer_types = (sales_data.assign(amount_cents=amount_cents(sales_data))
+                          .groupby(CUSTOMER_KEYS, dropna=False, observed=True)
+                          .agg(amount_cents=('amount_cents', 'sum'),
+                               quantity_sum=('Quantity Sold', 'sum'),
+                               rows=('Date', 'size')))
+        customer_types['amount_cents'] = customer_types['amount_cents'].astype(np.int64)
+        return cls(store, AggregationPlan.from_frame(sales_data, backend), customer_types)
+
+    @classmethod
+    def from_workbook(cls, excel_file: str, store: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                      backend: str = 'pandas') -> 'SalesPartial':
+        """Summarize a workbook's "Sales Entry" sheet, reading it in batches."""
+        partial = cls(store)
+        for batch in iter_sales_batches(excel_file, batch_size):
+            partial = partial.merge(cls.from_frame(clean_sales_rows(batch), store, backend))
+        return partial
+
+    @property
+    def empty(self) -> bool:
+        """True when no rows have been summarized."""
+        return self.plan.empty
+
+    def merge(self, other: 'SalesPartial') -> 'SalesPartial':
+        """Return the totals of both partials, under this partial's store name."""
+        if other.empty:
+            return SalesPartial(self.store, self.plan, self.customer_types)
+        if self.empty:
+            return SalesPartial(self.store, other.plan, other.customer_types)
+        customer_types = (pd.concat([self.customer_types, other.customer_types])
+                          .groupby(level=[0, 1], dropna=False).sum())
+        return SalesPartial(self.store, self.plan.merge(other.plan), customer_types)
+
+    def dates(self) -> List[pd.Timestamp]:
+        """Return the distinct days covered, in order."""
+        if self.empty:
+            return []
+        return sorted(pd.DatetimeIndex(self.plan.base.index.get_level_values('Date')).normalize().unique())
+
+    def split_days(self) -> Dict[pd.Timestamp, 'SalesPartial']:
+        """Return one partial per day, as written by write_partials."""
+        if self.empty:
+            return {}
+        base_days = pd.DatetimeIndex(self.plan.base.index.get_level_values('Date')).normalize()
+        customer_days = pd.DatetimeIndex(self.customer_types.index.get_level_values('Date')).normalize()
+        days = {}
+        for day in self.dates():
+            base = self.plan.base[base_days == day]
+            sketches = None
+            if self.plan.sketches is not None:
+                sketches = ValueSketches({key: sketch for key, sketch in self.plan.sketches.sketches.items()
+                                          if key[0] == day}, self.plan.sketches.k)
+            plan = AggregationPlan(base, int(base['rows'].sum()), sketches)
+            days[day] = SalesPartial(self.store, plan, self.customer_types[customer_days == day])
+        return days
+
+    def customer_type_summary(self) -> pd.DataFrame:
+        """Return revenue, transactions and quantity per customer type."""
+        if self.empty:
+            return pd.DataFrame()
+        totals = self.customer_types.groupby(level='Customer Type', dropna=False).sum()
+        return pd.DataFrame({
+            'Total Amount': to_dollars(totals['amount_cents']),
+            'Transaction Count': totals['rows'],
+            'Total Quantity': totals['quantity_sum']
+        }).sort_values('Total Amount', ascending=False)
+
+    def to_payload(self) -> Dict:
+        """Return the partial as a JSON-ready dictionary (see PARTIAL_VERSION)."""
+        payload = {
+            'format': PARTIAL_FORMAT,
+            'version': PARTIAL_VERSION,
+            'store': self.store,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'dates': [_date_text(day) for day in self.dates()],
+            'rows': self.plan.row_count,
+            'sales_fields': SALES_FIELDS,
+            'sales': [],
+            'customer_fields': CUSTOMER_KEYS + CUSTOMER_MEASURES,
+            'customer_types': [],
+            'sketch_k': DEFAULT_QUANTILE_K,
+            'sketches': []
+        }
+        if self.empty:
+            return payload
+
+        for table, key in ((self.plan.base, 'sales'), (self.customer_types, 'customer_types')):
+            flat = table.reset_index()
+            payload[key] = [[_json_value(value) for value in row] for row in flat.itertuples(index=False)]
+        if self.plan.sketches is not None:
+            payload['sketch_k'] = self.plan.sketches.k
+            payload['sketches'] = [
+                [_date_text(date), category, [[_json_value(value) for value in items] for items in sketch.levels]]
+                for (date, category), sketch in self.plan.sketches.sketches.items()
+            ]
+        return payload
+
+    def save(self, path: str) -> str:
+        """Write the partial as gzip-compressed JSON and return the path."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(self.to_payload(), f, separators=(',', ':'))
+        return path
+
+    @classmethod
+    def from_payloads(cls, payloads: List[Dict], store: Optional[str] = None) -> 'SalesPartial':
+        """Combine payloads (of one store, or relabelled as store) into one partial."""
+        store = store or (payloads[0]['store'] if payloads else '')
+        sales = [row for payload in payloads for row in payload['sales']]
+        if not sales:
+            return cls(store)
+
+        base = pd.DataFrame(sales, columns=SALES_FIELDS)
+        base['Date'] = pd.to_datetime(base['Date'])
+        base = base.groupby(AggregationPlan.BASE_KEYS, dropna=False).sum()
+        base['amount_cents'] = base['amount_cents'].astype(np.int64)
+
+        customer_types = pd.DataFrame([row for payload in payloads for row in payload['customer_types']],
+                                      columns=CUSTOMER_KEYS + CUSTOMER_MEASURES)
+        customer_types['Date'] = pd.to_datetime(customer_types['Date'])
+        customer_types = customer_types.groupby(CUSTOMER_KEYS, dropna=False).sum()
+        customer_types['amount_cents'] = customer_types['amount_cents'].astype(np.int64)
+
+        sketches = None
+        if all(payload['sketches'] or not payload['sales'] for payload in payloads):
+            sketches = ValueSketches(k=min(payload['sketch_k'] for payload in payloads))
+            for payload in payloads:
+                part = {}
+                for date, category, levels in payload['sketches']:
+                    part[ValueSketches._key(date, category)] = KLLSketch.from_levels(levels, payload['sketch_k'])
+                sketches = sketches.merge(ValueSketches(part, payload['sketch_k']))
+
+        plan = AggregationPlan(base, int(base['rows'].sum()), sketches)
+        return cls(store, plan, customer_types)
+
+
+def read_payload(path: str) -> Dict:
+    """Read a partial-aggregate file, checking its format and version."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        payload = json.load(f)
+    if not isinstance(payload, dict) or payload.get('format') != PARTIAL_FORMAT:
+        raise ValueError(f"{path} is not a sales partial-aggregate file")
+    if payload.get('version') != PARTIAL_VERSION:
+        raise ValueError(f"{path} has format version {payload.get('version')}; "
+                         f"this tool reads version {PARTIAL_VERSION}")
+    return payload
+
+
+def resolve_partials(sources: Iterable[str]) -> List[str]:
+    """Expand folders and glob patterns into a sorted list of partial-aggregate files."""
+    paths = set()
+    for source in sources:
+        if os.path.isdir(source):
+            paths.update(glob.glob(os.path.join(source, '*' + PARTIAL_SUFFIX)))
+        elif any(char in source for char in '*?['):
+            paths.update(glob.glob(source))
+        elif os.path.exists(source):
+            paths.add(source)
+    return sorted(paths)
+
+
+def load_partials(paths: Iterable[str]) -> Dict[str, SalesPartial]:
+    """
+    Read partial-aggregate files and merge them per store.
+
+    Files that cannot be read are reported and skipped.
+    """
+    by_store = {}
+    for path in paths:
+        try:
+            payload = read_payload(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Skipping {path}: {e}")
+            continue
+        by_store.setdefault(payload['store'], []).append(payload)
+    return {store: SalesPartial.from_payloads(payloads, store) for store, payloads in sorted(by_store.items())}
+
+
+def consolidate_partials(paths: Iterable[str]) -> ConsolidatedSales:
+    """Merge partial-aggregate files into a chain-wide plan with per-store plans."""
+    return ConsolidatedSales({store: partial.plan for store, partial in load_partials(paths).items()})
+
+
+def write_partials(partial: SalesPartial, out_dir: str) -> List[str]:
+    """Write one file per day of a store's partial and return their paths."""
+    return [day_partial.save(partial_path(out_dir, partial.store, day))
+            for day, day_partial in partial.split_days().items()]
+
+
+def main():
+    """Export a shop's daily partial aggregates, or merge exported files into one report."""
+    parser = argparse.ArgumentParser(description="Write and merge portable sales partial aggregates")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="write one partial-aggregate file per day of a workbook")
+    export.add_argument('workbook', help="workbook with a 'Sales Entry' sheet")
+    export.add_argument('--store', default=None, help="store name (default: the workbook's file name)")
+    export.add_argument('--out', default='partials', help="folder for the partial-aggregate files")
+    export.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="rows per batch")
+
+    merge = commands.add_parser('merge', help="combine partial-aggregate files into a consolidated summary")
+    merge.add_argument('sources', nargs='+', help="partial-aggregate files, folders or glob patterns")
+    merge.add_argument('--output', default=None, help="also write the merged totals as one partial file")
+    merge.add_argument('--store', default='chain', help="store name for --output (default: chain)")
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        store = args.store or os.path.splitext(os.path.basename(args.workbook))[0]
+        partial = SalesPartial.from_workbook(args.workbook, store, args.batch_size)
+        paths = write_partials(partial, args.out)
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"Wrote {len(paths)} daily partial files for {store} to {args.out} ({size / 1024:.1f} KB)")
+        return
+
+    paths = resolve_partials(args.sources)
+    partials = load_partials(paths)
+    if not partials:
+        print("No partial-aggregate files found")
+        return
+    chain = None
+    for partial in partials.values():
+        chain = partial if chain is None else chain.merge(partial)
+    chain = SalesPartial(args.store, chain.plan, chain.customer_types)
+    consolidated = ConsolidatedSales({store: partial.plan for store, partial in partials.items()})
+    metrics = chain.plan.key_metrics()
+
+    print(f"Merged {len(paths)} files from {len(partials)} stores "
+          f"({metrics['first_date'].date()} to {metrics['last_date'].date()})")
+    print(f"Total Revenue: {format_cents(metrics['total_revenue_cents'])}")
+    print(f"Total Transactions: {metrics['total_transactions']:,}")
+    print("\nStores:")
+    print(consolidated.store_breakdown().to_string())
+    print("\nCategories:")
+    print(chain.plan.category_sales().to_string())
+    print("\nPayment Methods:")
+    print(chain.plan.payment_summary().to_string())
+    print("\nCustomer Types:")
+    print(chain.customer_type_summary().to_string())
+    if args.output:
+        chain.save(args.output)
+        print(f"\nMerged partial written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Partitioned Sales Dataset
+Stores cleaned sales rows as one file per month (or per day) so that a query
+for a date range only opens the partitions that overlap it.
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from python_scripts.sales_aggregates import AggregationPlan
+    from python_scripts.sales_cache import load_frame, save_frame
+    from python_scripts.sales_periods import PERIODS
+except ImportError:
+    from sales_aggregates import AggregationPlan
+    from sales_cache import load_frame, save_frame
+    from sales_periods import PERIODS
+
+
+DATASET_VERSION = 2
+MANIFEST_FILE = 'dataset.json'
+GRANULARITIES = {'month': ('M', '%Y-%m'), 'day': ('D', '%Y-%m-%d')}
+PARTITION_SUFFIX = '.npz'
+
+
+def dataset_path(excel_file: str) -> str:
+    """Return the partitioned dataset folder that belongs to an Excel workbook."""
+    root, _ = os.path.splitext(excel_file)
+    return root + '_partitions'
+
+
+def resolve_period(period: Optional[str], today=None) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """
+    Turn a period name into an inclusive (start, end) date range.
+
+    Accepts the names in PERIODS (relative to today), a month ('2025-03'), a
+    day ('2025-03-14') or an explicit 'START:END' range where either side may be
+    empty. None and 'all' mean no restriction and give (None, None).
+    """
+    if period is None or period == 'all':
+        return None, None
+
+    today = pd.Timestamp(today or pd.Timestamp.now()).normalize()
+    if period == 'today':
+        return today, today
+    if period == 'last_7_days':
+        return today - pd.Timedelta(days=6), today
+    if period == 'last_30_days':
+        return today - pd.Timedelta(days=29), today
+    if period == 'this_month':
+        return today.replace(day=1), today
+    if period == 'last_month':
+        month = today.to_period('M') - 1
+        return month.start_time, month.end_time.normalize()
+    if period == 'this_year':
+        return today.replace(month=1, day=1), today
+
+    if ':' in period:
+        start, end = period.split(':', 1)
+        return (pd.Timestamp(start) if start else None, pd.Timestamp(end) if end else None)
+    if re.fullmatch(r'\d{4}-\d{2}', period):
+        month = pd.Period(period, 'M')
+        return month.start_time, month.end_time.normalize()
+    if re.fullmatch(r'\d{4}-\d{2}-\d{2}', period):
+        return pd.Timestamp(period), pd.Timestamp(period)
+
+    raise ValueError(f"Unknown period '{period}'. Use one of {', '.join(PERIODS)}, "
+                     f"YYYY-MM, YYYY-MM-DD or START:END")
+
+
+def _filter_range(sales_data: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """Keep rows whose Date lies in the inclusive [start, end] day range."""
+    mask = pd.Series(True, index=sales_data.index)
+    if start is not None:
+        mask &= sales_data['Date'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= sales_data['Date'] < pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    return sales_data if mask.all() else sales_data[mask]
+
+
+class PartitionedDataset:
+    """
+    Cleaned sales rows split into one ``.npz`` file per month or per day.
+
+    A dataset.json manifest lists the partitions with their row counts and
+    records the workbook signature they were written from. Range queries
+    open only the partitions whose period overlaps the range; last_opened
+    lists the partitions read by the most recent query.
+    """
+
+    def __init__(self, root: str, granularity: str = 'month'):
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+        self.root = root
+        self.granularity = granularity
+        self.manifest = self._read_manifest()
+        if self.manifest.get('granularity') not in (None, granularity):
+            # Keep the layout the dataset was written with
+            self.granularity = self.manifest['granularity']
+        self.last_opened = []
+
+    def _manifest_path(self) -> str:
+        """Return the path of the dataset manifest."""
+        return os.path.join(self.root, MANIFEST_FILE)
+
+    def _read_manifest(self) -> Dict:
+        """Read the manifest, or return an empty one."""
+        try:
+            with open(self._manifest_path(), 'r') as f:
+                manifest = json.load(f)
+            return manifest if manifest.get('version') == DATASET_VERSION else {}
+        except (OSError, ValueError):
+            return {}
+
+    @property
+    def source(self) -> Optional[Dict]:
+        """Signature of the workbook the partitions were written from, if any."""
+        return self.manifest.get('source')
+
+    def partition_path(self, key: str) -> str:
+        """Return the file path of one partition."""
+        return os.path.join(self.root, key + PARTITION_SUFFIX)
+
+    def partition_range(self, key: str) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """Return the first and last day covered by a partition."""
+        period = pd.Period(key, GRANULARITIES[self.granularity][0])
+        return period.start_time, period.end_time.normalize()
+
+    def partitions(self) -> List[str]:
+        """Return the partition keys in date order."""
+        return sorted(self.manifest.get('partitions', {}))
+
+    def prune(self, start=None, end=None) -> List[str]:
+        """Return the partitions overlapping the inclusive [start, end] range."""
+        selected = []
+        for key in self.partitions():
+            first, last = self.partition_range(key)
+            if start is not None and last < pd.Timestamp(start).normalize():
+                continue
+            if end is not None and first > pd.Timestamp(end):
+                continue
+            selected.append(key)
+        return selected
+
+    def write(self, sales_data: pd.DataFrame, source: Optional[Dict] = None) -> List[str]:
+        """
+        Replace the dataset with the given cleaned rows, one file per period.
+
+        source is stored in the manifest so callers can tell whether the
+        partitions still match the workbook they came from.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        for key in self.partitions():
+            if os.path.exists(self.partition_path(key)):
+                os.remove(self.partition_path(key))
+
+        freq, fmt = GRANULARITIES[self.granularity]
+        partitions = {}
+        if not sales_data.empty:
+            keys = sales_data['Date'].dt.to_period(freq).dt.strftime(fmt)
+            for key, rows in sales_data.groupby(keys, sort=True):
+                save_frame(rows.reset_index(drop=True), self.partition_path(key))
+                partitions[key] = {'rows': len(rows)}
+
+        self.manifest = {
+            'version': DATASET_VERSION,
+            'granularity': self.granularity,
+            'source': source,
+            'partitions': partitions
+        }
+        tmp_path = self._manifest_path() + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._manifest_path())
+        return list(partitions)
+
+    def iter_frames(self, start=None, end=None) -> Iterator[pd.DataFrame]:
+        """Yield the rows of each overlapping partition, trimmed to the range."""
+        self.last_opened = []
+        for key in self.prune(start, end):
+            self.last_opened.append(key)
+            yield _filter_range(load_frame(self.partition_path(key)), start, end)
+
+    def read(self, start=None, end=None) -> pd.DataFrame:
+        """Return all rows in the inclusive [start, end] range as one DataFrame."""
+        frames = list(self.iter_frames(start, end))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def aggregation_plan(self, start=None, end=None, backend: str = 'pandas') -> AggregationPlan:
+        """Build the report's AggregationPlan one overlapping partition at a time."""
+        plan = AggregationPlan()
+        for rows in self.iter_frames(start, end):
+            plan = plan.merge(AggregationPlan.from_frame(rows, backend))
+        return plan
@@ -0,0 +1,10 @@
+"""
+Report Period Names
+The named periods a report can cover (see sales_partitions.resolve_period).
+Kept in a module without third-party imports, so the GUI can offer them
+without loading pandas.
+"""
+
+
+# Named periods accepted by resolve_period, for CLI and GUI choices
+PERIODS = ['all', 'today', 'last_7_days', 'last_30_days', 'this_month', 'last_month', 'this_year']
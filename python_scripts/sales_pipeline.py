@@ -0,0 +1,159 @@
+"""
+Setup Pipeline Scheduler
+Runs the setup steps (template, sample data, analysis) as a small dependency
+graph: each stage declares the files it reads and writes, stages whose inputs
+are ready run in parallel, and each stage's time is reported.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+TEMPLATE_FILE = "excel_templates/daily_sales_sheet.xlsx"
+SAMPLE_DATA_FILE = "sample_data/sample_sales_data.xlsx"
+REPORT_FILE = "visualizations/sales_analysis_report.txt"
+
+
+class Stage:
+    """
+    One step of a pipeline.
+
+    run is called with no arguments. The stage fails when it raises or
+    returns None or False; stages that need its outputs are then skipped.
+    inputs and outputs are file paths; a stage waits for every other stage
+    that writes one of its inputs. weight is the stage's rough share of the
+    total work, used for the progress fraction.
+    """
+
+    def __init__(self, name: str, run: Callable, inputs: Iterable[str] = (),
+                 outputs: Iterable[str] = (), weight: float = 1.0, label: Optional[str] = None):
+        self.name = name
+        self.run = run
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.weight = weight
+        self.label = label or name
+
+
+class Pipeline:
+    """
+    A set of stages ordered by the files they read and write.
+
+    run() starts every stage whose producers have finished, up to max_workers
+    at a time, so independent stages overlap and dependent ones wait.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("Stage names must be unique")
+        self.stages = {stage.name: stage for stage in stages}
+
+        producers = {}
+        for stage in stages:
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(f"'{output}' is written by both '{producers[output]}' and '{stage.name}'")
+                producers[output] = stage.name
+        self.dependencies = {stage.name: {producers[path] for path in stage.inputs
+                                          if path in producers and producers[path] != stage.name}
+                             for stage in stages}
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Return the stage names, in the order given, moving each after the stages it needs."""
+        order, remaining = [], dict(self.dependencies)
+        while remaining:
+            ready = [name for name, needs in remaining.items() if not needs - set(order)]
+            if not ready:
+                raise ValueError(f"Stages depend on each other in a cycle: {', '.join(sorted(remaining))}")
+            order.extend(ready)
+            for name in ready:
+                del remaining[name]
+        return order
+
+    def run(self, max_workers: Optional[int] = None,
+            progress: Optional[Callable[[Dict], None]] = None) -> Dict[str, Dict]:
+        """
+        Run the stages and return each one's state, seconds, result and error.
+
+        progress, if given, is called with an event dict (stage, label, state,
+        seconds, error and fraction done, 0 to 1) whenever a stage starts,
+        finishes, fails or is skipped.
+        """
+        total_weight = sum(stage.weight for stage in self.stages.values()) or 1.0
+        results = {}
+        done_weight = 0.0
+
+        def report(name: str) -> None:
+            if progress is not None:
+                outcome = results[name]
+                progress({'stage': name, 'label': self.stages[name].label, 'state': outcome['state'],
+                          'seconds': outcome['seconds'], 'error': outcome['error'],
+                          'fraction': done_weight / total_weight})
+
+        def timed(stage: Stage):
+            started = time.perf_counter()
+            try:
+                return stage.run(), None, time.perf_counter() - started
+            except Exception as e:
+                return None, f"{type(e).__name__}: {e}", time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(self.stages) or 1) as pool:
+            running = {}
+            while len(results) < len(self.stages):
+                for name in self.order:
+                    if name in results or name in running.values():
+                        continue
+                    needs = self.dependencies[name]
+                    if any(results.get(need, {}).get('state') in ('failed', 'skipped') for need in needs):
+                        failed = sorted(need for need in needs if results[need]['state'] != 'finished')
+                        results[name] = {'state': 'skipped', 'seconds': 0.0, 'result': None,
+                                         'error': f"needs {', '.join(failed)}"}
+                        done_weight += self.stages[name].weight
+                        report(name)
+                    elif all(results.get(need, {}).get('state') == 'finished' for need in needs):
+                        running[pool.submit(timed, self.stages[name])] = name
+                        if progress is not None:
+                            progress({'stage': name, 'label': self.stages[name].label, 'state': 'started',
+                                      'seconds': 0.0, 'error': None, 'fraction': done_weight / total_weight})
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    result, error, seconds = future.result()
+                    ok = error is None and result is not None and result is not False
+                    results[name] = {'state': 'finished' if ok else 'failed', 'seconds': seconds,
+                                     'result': result, 'error': error or (None if ok else "stage reported failure")}
+                    done_weight += self.stages[name].weight
+                    report(name)
+        return results
+
+    def summary(self, results: Dict[str, Dict]) -> str:
+        """Format one line per stage with its state and time."""
+        lines = []
+        for name in self.order:
+            outcome = results.get(name, {'state': 'not run', 'seconds': 0.0, 'error': None})
+            line = f"{self.stages[name].label:<24} {outcome['state']:<9} {outcome['seconds']:7.2f}s"
+            if outcome['state'] in ('failed', 'skipped') and outcome['error']:
+                line += f"  ({outcome['error']})"
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def setup_pipeline(create_template: Callable, generate_data: Callable, run_analysis: Callable) -> Pipeline:
+    """
+    Return the Complete Setup pipeline around three step functions.
+
+    The template and the sample data do not depend on each other and run
+    together; the analysis reads the sample data, so it waits for that stage.
+    """
+    return Pipeline([
+        Stage('template', create_template, outputs=[TEMPLATE_FILE], weight=1, label="Excel template"),
+        Stage('sample_data', generate_data, outputs=[SAMPLE_DATA_FILE], weight=3, label="Sample data"),
+        Stage('analysis', run_analysis, inputs=[SAMPLE_DATA_FILE], outputs=[REPORT_FILE], weight=6,
+              label="Sales analysis")
+    ])
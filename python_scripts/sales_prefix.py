@@ -0,0 +1,193 @@
+"""
+Daily Prefix-Sum Index
+Running totals of revenue, transactions and quantity over the calendar, so the
+totals of any date range, and week / month / year comparisons, come from two
+array lookups instead of a fresh scan and regroup of the sales rows.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from python_scripts.sales_aggregates import AggregationPlan
+    from python_scripts.sales_money import divide_cents, to_dollars
+except ImportError:
+    from sales_aggregates import AggregationPlan
+    from sales_money import divide_cents, to_dollars
+
+
+PREFIX_MEASURES = ['revenue_cents', 'transactions', 'quantity']
+
+# Period-over-period comparisons accepted by DailyPrefixIndex.compare
+COMPARISONS = {'wow': 'week over week', 'mom': 'month over month', 'yoy': 'year over year'}
+
+
+class DailyPrefixIndex:
+    """
+    Cumulative daily totals over every calendar day from the first sale day on.
+
+    Row i of the cumulative table holds the totals of all days before
+    origin + i, so days [a, b] sum to cumulative[b + 1] - cumulative[a].
+    Days without sales count as zero. Appending later days costs time in
+    proportion to the days added (the table grows by doubling); totals for days
+    already covered are added to the tail of the table.
+    """
+
+    def __init__(self):
+        self.origin = None
+        self.days = 0
+        self._cumulative = np.zeros((1, len(PREFIX_MEASURES)), dtype=np.int64)
+
+    @classmethod
+    def from_plan(cls, plan: AggregationPlan) -> 'DailyPrefixIndex':
+        """Build the index from an AggregationPlan's per-day totals."""
+        index = cls()
+        index.add_plan(plan)
+        return index
+
+    def add_plan(self, plan: AggregationPlan) -> None:
+        """Add the rows summarized by a plan, e.g. the rows of an incremental ingest."""
+        if plan.empty:
+            return
+        daily = plan.daily_totals()
+        self.add_daily(daily.index, np.column_stack([
+            daily['amount_cents'].to_numpy(dtype=np.int64),
+            daily['rows'].to_numpy(dtype=np.int64),
+            np.round(daily['quantity_sum'].fillna(0).to_numpy(dtype=np.float64)).astype(np.int64)
+        ]))
+
+    def add_daily(self, dates, totals: np.ndarray) -> None:
+        """Add one row of PREFIX_MEASURES totals per date. Dates may repeat."""
+        if len(dates) == 0:
+            return
+        days = pd.DatetimeIndex(dates).normalize()
+        if self.origin is None:
+            self.origin = days.min()
+        elif days.min() < self.origin:
+            self._extend_front((self.origin - days.min()).days)
+
+        offsets = np.asarray((days - self.origin).days, dtype=np.int64)
+        self._grow(int(offsets.max()) + 1)
+
+        # Per-day deltas from the earliest touched day, folded into the running totals
+        first = int(offsets.min())
+        deltas = np.zeros((self.days - first, len(PREFIX_MEASURES)), dtype=np.int64)
+        np.add.at(deltas, offsets - first, np.asarray(totals, dtype=np.int64))
+        self._cumulative[first + 1:self.days + 1] += np.cumsum(deltas, axis=0)
+
+    def _grow(self, days: int) -> None:
+        """Extend the calendar to cover `days` days, carrying the last total forward."""
+        if days <= self.days:
+            return
+        if days + 1 > len(self._cumulative):
+            capacity = max(days + 1, 2 * len(self._cumulative))
+            grown = np.empty((capacity, len(PREFIX_MEASURES)), dtype=np.int64)
+            grown[:self.days + 1] = self._cumulative[:self.days + 1]
+            self._cumulative = grown
+        self._cumulative[self.days + 1:days + 1] = self._cumulative[self.days]
+        self.days = days
+
+    def _extend_front(self, days: int) -> None:
+        """Move the origin `days` days earlier; the new days start out empty."""
+        grown = np.zeros((days + len(self._cumulative), len(PREFIX_MEASURES)), dtype=np.int64)
+        grown[days:] = self._cumulative
+        self._cumulative = grown
+        self.origin = self.origin - pd.Timedelta(days=days)
+        self.days += days
+
+    @property
+    def empty(self) -> bool:
+        """True when no days have been added."""
+        return self.days == 0
+
+    @property
+    def first_date(self) -> Optional[pd.Timestamp]:
+        """First day covered by the index."""
+        return None if self.empty else self.origin
+
+    @property
+    def last_date(self) -> Optional[pd.Timestamp]:
+        """Last day covered by the index."""
+        return None if self.empty else self.origin + pd.Timedelta(days=self.days - 1)
+
+    def _position(self, day, default: int, after: int = 0) -> int:
+        """Return the cumulative-table row for a day, clamped to the covered range."""
+        if day is None:
+            return default
+        offset = (pd.Timestamp(day).normalize() - self.origin).days + after
+        return min(max(offset, 0), self.days)
+
+    def range_totals(self, start=None, end=None) -> Dict:
+        """
+        Return revenue, transactions and quantity for the inclusive [start, end] days.
+
+        Either end may be None for an open range. Runs in constant time.
+        """
+        totals = np.zeros(len(PREFIX_MEASURES), dtype=np.int64)
+        if not self.empty:
+            low = self._position(start, 0)
+            high = self._position(end, self.days, after=1)
+            if high > low:
+                totals = self._cumulative[high] - self._cumulative[low]
+
+        revenue_cents, transactions, quantity = (int(value) for value in totals)
+        return {
+            'revenue': to_dollars(revenue_cents),
+            'revenue_cents': revenue_cents,
+            'transactions': transactions,
+            'quantity': quantity,
+            'avg_transaction_cents': divide_cents(revenue_cents, transactions)
+        }
+
+    @staticmethod
+    def comparison_ranges(kind: str, end) -> Tuple[Tuple[pd.Timestamp, pd.Timestamp],
+                                                   Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Return the current and previous (start, end) ranges for a comparison.
+
+        'wow' compares the 7 days ending on `end` with the 7 days before them.
+        'mom' and 'yoy' compare month-to-date and year-to-date with the same
+        stretch of the previous month or year (shorter months are clamped).
+        """
+        end = pd.Timestamp(end).normalize()
+        if kind == 'wow':
+            start = end - pd.Timedelta(days=6)
+            return (start, end), (start - pd.Timedelta(days=7), end - pd.Timedelta(days=7))
+        if kind == 'mom':
+            start = end.replace(day=1)
+            shift = pd.DateOffset(months=1)
+        elif kind == 'yoy':
+            start = end.replace(month=1, day=1)
+            shift = pd.DateOffset(years=1)
+        else:
+            raise ValueError(f"Unknown comparison '{kind}'. Choose from: {', '.join(COMPARISONS)}")
+        return (start, end), (start - shift, end - shift)
+
+    def compare(self, kind: str = 'wow', end=None) -> Dict:
+        """
+        Compare a period with the one before it ('wow', 'mom' or 'yoy').
+
+        end defaults to the last day in the index. Returns both ranges, their
+        totals and the percentage change of each measure (None when the
+        previous value is zero).
+        """
+        if end is None:
+            end = self.last_date if not self.empty else pd.Timestamp.now()
+        (current_start, current_end), (previous_start, previous_end) = self.comparison_ranges(kind, end)
+        current = self.range_totals(current_start, current_end)
+        previous = self.range_totals(previous_start, previous_end)
+
+        change = {}
+        for measure in ('revenue_cents', 'transactions', 'quantity'):
+            change[measure] = (round(100 * (current[measure] - previous[measure]) / previous[measure], 1)
+                               if previous[measure] else None)
+        return {
+            'kind': kind,
+            'current_range': (current_start, current_end),
+            'previous_range': (previous_start, previous_end),
+            'current': current,
+            'previous': previous,
+            'change_pct': change
+        }
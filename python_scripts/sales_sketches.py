@@ -0,0 +1,457 @@
+"""
+Streaming Sales Sketches
+Bounded-memory summaries of a chunked sales stream: a weighted Space-Saving
+sketch that tracks the top products by revenue and by quantity without
+keeping a total for every product in the catalogue, and mergeable KLL
+quantile sketches of transaction values.
+"""
+
+import argparse
+import heapq
+import itertools
+import math
+from typing import Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from python_scripts.sales_money import amount_cents, to_dollars
+    from python_scripts.sales_stream import DEFAULT_BATCH_SIZE, clean_sales_rows, iter_sales_batches
+except ImportError:
+    from sales_money import amount_cents, to_dollars
+    from sales_stream import DEFAULT_BATCH_SIZE, clean_sales_rows, iter_sales_batches
+
+
+DEFAULT_EPSILON = 0.001
+DEFAULT_QUANTILE_K = 200
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class SpaceSaving:
+    """
+    Weighted Space-Saving heavy-hitters sketch.
+
+    At most `capacity` items are counted. When a new item arrives and the table
+    is full, the item with the smallest count is replaced and the newcomer
+    inherits that count as its possible overcount. Every estimate is at least
+    the item's true total and at most max_error above it, and max_error never
+    exceeds total_weight / capacity. Any item whose true total is above that
+    bound is guaranteed to be in the table.
+    """
+
+    def __init__(self, capacity: Optional[int] = None, epsilon: float = DEFAULT_EPSILON):
+        if capacity is None:
+            if not 0 < epsilon < 1:
+                raise ValueError("epsilon must be between 0 and 1")
+            capacity = math.ceil(1 / epsilon)
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total_weight = 0
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self._heap = []
+        self._order = itertools.count()
+
+    @property
+    def epsilon(self) -> float:
+        """Relative error bound: estimates are within epsilon * total_weight."""
+        return 1 / self.capacity
+
+    @property
+    def max_error(self) -> int:
+        """The largest possible overcount of any estimate (the smallest count once full)."""
+        if len(self.counts) < self.capacity:
+            return 0
+        return self._min_item()[0]
+
+    def _min_item(self):
+        """Return (count, item) for the smallest counter, dropping stale heap entries."""
+        while True:
+            count, order, item = self._heap[0]
+            if self.counts.get(item) == count:
+                return count, item
+            heapq.heappop(self._heap)
+
+    def _push(self, item, count: int) -> None:
+        """Record an item's new count in the min-heap."""
+        heapq.heappush(self._heap, (count, next(self._order), item))
+        # Stale entries pile up as counts change; rebuild before they dominate
+        if len(self._heap) > 8 * self.capacity:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        """Rebuild the min-heap from the current counts."""
+        self._heap = [(count, next(self._order), item) for item, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def add(self, item, weight: int = 1) -> None:
+        """Add weight to one item. Weights of zero or less are ignored."""
+        if weight <= 0:
+            return
+        self.total_weight += weight
+        if item in self.counts:
+            self.counts[item] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = weight
+            self.errors[item] = 0
+        else:
+            smallest, evicted = self._min_item()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[item] = smallest + weight
+            self.errors[item] = smallest
+        self._push(item, self.counts[item])
+
+    def update(self, weights: pd.Series) -> None:
+        """Add a Series of per-item weights (item labels as the index)."""
+        for item, weight in weights.items():
+            self.add(item, int(weight))
+
+    def merge(self, other: 'SpaceSaving') -> 'SpaceSaving':
+        """
+        Return a sketch of both streams, with the smaller of the two capacities.
+
+        An item missing from a full sketch may have been counted up to that
+        sketch's max_error, so that much is added to its count and error.
+        """
+        merged = SpaceSaving(capacity=min(self.capacity, other.capacity))
+        merged.total_weight = self.total_weight + other.total_weight
+        self_floor, other_floor = self.max_error, other.max_error
+        combined = []
+        for item in set(self.counts) | set(other.counts):
+            count = self.counts.get(item, self_floor) + other.counts.get(item, other_floor)
+            error = self.errors.get(item, self_floor) + other.errors.get(item, other_floor)
+            combined.append((count, error, item))
+        combined.sort(key=lambda entry: entry[0], reverse=True)
+        for count, error, item in combined[:merged.capacity]:
+            merged.counts[item] = count
+            merged.errors[item] = error
+        merged._rebuild_heap()
+        return merged
+
+    def top(self, k: int = 10) -> pd.DataFrame:
+        """
+        Return the k items with the largest estimates, largest first.
+
+        Columns: Estimate, Max Error and Guaranteed, which is True when the
+        item's lower bound (estimate minus error) beats the k+1-th estimate, so
+        it is certainly in the true top k.
+        """
+        ranked = sorted(self.counts.items(), key=lambda entry: (-entry[1], str(entry[0])))
+        threshold = ranked[k][1] if len(ranked) > k else self.max_error
+        rows = [{'Item': item, 'Estimate': count, 'Max Error': self.errors[item],
+                 'Guaranteed': count - self.errors[item] >= threshold}
+                for item, count in ranked[:k]]
+        return pd.DataFrame(rows, columns=['Item', 'Estimate', 'Max Error', 'Guaranteed'])
+
+
+class TopProducts:
+    """
+    Top-K best sellers by revenue and by quantity over a stream of sales batches.
+
+    Each batch is first summed per product (so memory per batch is bounded by
+    the batch), then fed into two Space-Saving sketches with
+    ceil(1 / epsilon) counters each. Revenue is counted in integer cents.
+    """
+
+    def __init__(self, k: int = 10, epsilon: float = DEFAULT_EPSILON):
+        self.k = k
+        self.revenue = SpaceSaving(epsilon=epsilon)
+        self.quantity = SpaceSaving(epsilon=epsilon)
+        self.row_count = 0
+
+    def update(self, batch: pd.DataFrame) -> None:
+        """Fold a batch of cleaned sales rows into both sketches."""
+        if batch.empty:
+            return
+        self.row_count += len(batch)
+        products = batch.assign(amount_cents=amount_cents(batch)).groupby(
+            'Product Name', observed=True)[['amount_cents', 'Quantity Sold']].sum()
+        self.revenue.update(products['amount_cents'])
+        self.quantity.update(products['Quantity Sold'].round())
+
+    def merge(self, other: 'TopProducts') -> 'TopProducts':
+        """Return the top products of both streams."""
+        merged = TopProducts(max(self.k, other.k))
+        merged.revenue = self.revenue.merge(other.revenue)
+        merged.quantity = self.quantity.merge(other.quantity)
+        merged.row_count = self.row_count + other.row_count
+        return merged
+
+    def top_by_revenue(self, k: Optional[int] = None) -> pd.DataFrame:
+        """Return the top products by revenue in dollars, with the error bound per product."""
+        top = self.revenue.top(k or self.k).rename(columns={'Item': 'Product Name'})
+        top['Estimate'] = to_dollars(top['Estimate'])
+        top['Max Error'] = to_dollars(top['Max Error'])
+        return top.rename(columns={'Estimate': 'Total Revenue'})
+
+    def top_by_quantity(self, k: Optional[int] = None) -> pd.DataFrame:
+        """Return the top products by units sold, with the error bound per product."""
+        top = self.quantity.top(k or self.k).rename(columns={'Item': 'Product Name'})
+        return top.rename(columns={'Estimate': 'Total Quantity'})
+
+    def best_seller(self) -> Optional[str]:
+        """Return the product with the most units sold, or None if nothing was added."""
+        top = self.quantity.top(1)
+        return None if top.empty else top['Item'].iloc[0]
+
+
+class KLLSketch:
+    """
+    Mergeable KLL quantile sketch over a stream of numbers.
+
+    Values are kept in levels; an item on level h stands for 2**h original
+    values. Level capacities are k for the top level, shrinking by 2/3 per
+    level below. When the sketch holds more items than all capacities
+    together, the lowest full level is sorted and every other item is
+    promoted to the next level. Memory stays around 3k items however many
+    values are added. Until k values have been added the sketch is exact.
+
+    Compaction offsets come from a generator with a fixed seed, so the same
+    input always gives the same sketch.
+    """
+
+    def __init__(self, k: int = DEFAULT_QUANTILE_K):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._random = None  # created on the first compaction
+
+    def _capacity(self, level: int) -> int:
+        """Return the number of items a level may hold."""
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values) -> None:
+        """Add an array of values; missing values are skipped."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def _compress(self) -> None:
+        """Compact the lowest full level until all items fit the total capacity."""
+        while sum(len(items) for items in self.levels) > sum(self._capacity(level)
+                                                             for level in range(len(self.levels))):
+            level = next(level for level in range(len(self.levels))
+                         if len(self.levels[level]) >= self._capacity(level))
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+            if self._random is None:
+                self._random = np.random.default_rng(0)
+            items = np.sort(self.levels[level])
+            # An odd item out stays behind; the rest are halved pairwise
+            kept, paired = items[:len(items) % 2], items[len(items) % 2:]
+            self.levels[level] = kept
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], paired[self._random.integers(2)::2]])
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, k: int = DEFAULT_QUANTILE_K) -> 'KLLSketch':
+        """Return a sketch of an array of values without missing entries."""
+        sketch = cls(k)
+        if len(values) <= k:
+            # Fits the single level as it is; skip the compaction bookkeeping
+            sketch.levels = [np.asarray(values, dtype=np.float64)]
+            sketch.count = len(values)
+        else:
+            sketch.update(values)
+        return sketch
+
+    @classmethod
+    def from_levels(cls, levels: Sequence, k: int = DEFAULT_QUANTILE_K) -> 'KLLSketch':
+        """Rebuild a saved sketch from its levels; level i items each stand for 2**i values."""
+        sketch = cls(k)
+        sketch.levels = [np.asarray(items, dtype=np.float64) for items in levels] or sketch.levels
+        sketch.count = int(sum(len(items) * 2 ** level for level, items in enumerate(sketch.levels)))
+        return sketch
+
+    @classmethod
+    def merge_all(cls, sketches: Sequence['KLLSketch']) -> 'KLLSketch':
+        """Return one sketch of all inputs, concatenating each level once."""
+        if not sketches:
+            return cls()
+        merged = cls(min(sketch.k for sketch in sketches))
+        depth = max(len(sketch.levels) for sketch in sketches)
+        merged.levels = [np.concatenate([sketch.levels[level] for sketch in sketches
+                                         if level < len(sketch.levels)])
+                         for level in range(depth)]
+        merged.count = sum(sketch.count for sketch in sketches)
+        # Continue an existing generator; a fresh one would repeat its first draws
+        merged._random = next((sketch._random for sketch in sketches if sketch._random is not None), None)
+        merged._compress()
+        return merged
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Return a sketch of both inputs."""
+        return KLLSketch.merge_all([self, other])
+
+    def quantiles(self, quantiles: Sequence[float]) -> np.ndarray:
+        """
+        Return the estimated value at each quantile (0 to 1).
+
+        A quantile q is the smallest kept value whose cumulative weight reaches
+        q of the count, matching numpy's 'inverted_cdf' method on exact data.
+        """
+        if self.count == 0:
+            return np.full(len(quantiles), np.nan)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level, dtype=np.int64)
+                                  for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        targets = np.asarray(quantiles, dtype=np.float64) * cumulative[-1]
+        positions = np.searchsorted(cumulative, targets, side='left')
+        return values[order][np.minimum(positions, len(values) - 1)]
+
+
+def quantile_label(quantile: float) -> str:
+    """Return a column label for a quantile: 'Median' for 0.5, else 'P90', 'P99'..."""
+    return 'Median' if quantile == 0.5 else f"P{quantile * 100:g}"
+
+
+class ValueSketches:
+    """
+    One KLLSketch of transaction values (Total Amount, in cents) per date and category.
+
+    Sketches for any date range or set of categories are merged on demand, so
+    quantiles over a range never re-read the rows. The set is stored with an
+    AggregationPlan and merged along with it.
+    """
+
+    KEYS = ['Date', 'Category']
+
+    def __init__(self, sketches: Optional[Dict[Tuple, KLLSketch]] = None, k: int = DEFAULT_QUANTILE_K):
+        self.sketches = sketches or {}
+        self.k = k
+
+    @classmethod
+    def from_frame(cls, sales_data: pd.DataFrame, k: int = DEFAULT_QUANTILE_K) -> 'ValueSketches':
+        """Build one sketch per (date, category) from cleaned sales rows."""
+        if sales_data.empty:
+            return cls(k=k)
+        values = amount_cents(sales_data).to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        if not present.any():
+            return cls(k=k)
+        sales_data = sales_data[present]
+        groups = sales_data.groupby(cls.KEYS, dropna=False, observed=True, sort=False).ngroup().to_numpy()
+        order = np.argsort(groups, kind='stable')
+        starts = np.flatnonzero(np.diff(groups[order], prepend=-1))
+        dates = pd.DatetimeIndex(sales_data['Date'].to_numpy()[order[starts]]).normalize()
+        categories = [category if isinstance(category, str) else None
+                      for category in sales_data['Category'].to_numpy()[order[starts]]]
+
+        chunks = np.split(values[present][order], starts[1:])
+        sketches = {(date, category): KLLSketch.from_values(chunk, k)
+                    for date, category, chunk in zip(dates, categories, chunks)}
+        return cls(sketches, k)
+
+    @staticmethod
+    def _key(date, category) -> Tuple:
+        """Return the dictionary key for a date and category (missing category -> None)."""
+        return pd.Timestamp(date).normalize(), category if isinstance(category, str) else None
+
+    def merge(self, other: 'ValueSketches') -> 'ValueSketches':
+        """Return the sketches of both sets, merging those with the same key."""
+        sketches = dict(self.sketches)
+        for key, sketch in other.sketches.items():
+            sketches[key] = sketches[key].merge(sketch) if key in sketches else sketch
+        return ValueSketches(sketches, min(self.k, other.k))
+
+    def select(self, start=None, end=None, categories: Optional[Iterable[str]] = None) -> KLLSketch:
+        """Merge the sketches of an inclusive date range and, optionally, some categories."""
+        start = pd.Timestamp(start).normalize() if start is not None else None
+        end = pd.Timestamp(end).normalize() if end is not None else None
+        accepted = None if categories is None else ({categories} if isinstance(categories, str) else set(categories))
+        selected = [sketch for (date, category), sketch in self.sketches.items()
+                    if (start is None or date >= start) and (end is None or date <= end)
+                    and (accepted is None or category in accepted)]
+        return KLLSketch.merge_all(selected) if selected else KLLSketch(self.k)
+
+    def quantiles(self, quantiles: Sequence[float] = DEFAULT_QUANTILES, start=None, end=None,
+                  categories: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Return transaction-value quantiles in dollars for a date range and categories."""
+        values = self.select(start, end, categories).quantiles(quantiles)
+        return {quantile_label(q): float(to_dollars(value)) for q, value in zip(quantiles, values)}
+
+    def _grouped(self, position: int, quantiles: Sequence[float]) -> pd.DataFrame:
+        """Merge sketches by one key part (0 = date, 1 = category) and tabulate quantiles."""
+        groups = {}
+        for key, sketch in self.sketches.items():
+            groups.setdefault(key[position], []).append(sketch)
+        rows = {name: to_dollars(KLLSketch.merge_all(sketches).quantiles(quantiles))
+                for name, sketches in groups.items()}
+        table = pd.DataFrame.from_dict(rows, orient='index', columns=[quantile_label(q) for q in quantiles])
+        table.index.name = self.KEYS[position]
+        return table.sort_index()
+
+    def daily_quantiles(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> pd.DataFrame:
+        """Return one row of transaction-value quantiles per date."""
+        return self._grouped(0, quantiles)
+
+    def category_quantiles(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> pd.DataFrame:
+        """Return one row of transaction-value quantiles per category, over all dates."""
+        return self._grouped(1, quantiles)
+
+    def to_table(self) -> pd.DataFrame:
+        """Flatten the sketches to Date / Category / Level / Value rows for saving."""
+        parts = []
+        for (date, category), sketch in self.sketches.items():
+            for level, items in enumerate(sketch.levels):
+                if len(items):
+                    parts.append(pd.DataFrame({'Date': date, 'Category': category,
+                                               'Level': np.int8(level), 'Value': items}))
+        if not parts:
+            return pd.DataFrame({'Date': pd.Series(dtype='datetime64[ns]'), 'Category': pd.Series(dtype=object),
+                                 'Level': pd.Series(dtype=np.int8), 'Value': pd.Series(dtype=np.float64)})
+        return pd.concat(parts, ignore_index=True)
+
+    @classmethod
+    def from_table(cls, table: pd.DataFrame, k: int = DEFAULT_QUANTILE_K) -> 'ValueSketches':
+        """Rebuild sketches saved with to_table."""
+        sketches = {}
+        for (date, category), rows in table.groupby(cls.KEYS, dropna=False, sort=False):
+            depth = int(rows['Level'].max()) + 1
+            levels = [rows['Value'].to_numpy()[rows['Level'].to_numpy() == level] for level in range(depth)]
+            sketches[cls._key(date, category)] = KLLSketch.from_levels(levels, k)
+        return cls(sketches, k)
+
+
+def stream_top_products(batches: Iterable[pd.DataFrame], k: int = 10,
+                        epsilon: float = DEFAULT_EPSILON) -> TopProducts:
+    """Feed cleaned sales batches into a TopProducts tracker and return it."""
+    tracker = TopProducts(k, epsilon)
+    for batch in batches:
+        tracker.update(batch)
+    return tracker
+
+
+def main():
+    """Print the top products of a workbook from a single streaming pass."""
+    parser = argparse.ArgumentParser(description="Find the top products of a sales workbook in bounded memory")
+    parser.add_argument('workbook', help="workbook with a 'Sales Entry' sheet")
+    parser.add_argument('--k', type=int, default=10, help="number of products to list")
+    parser.add_argument('--epsilon', type=float, default=DEFAULT_EPSILON,
+                        help="error bound as a share of the total (sets the sketch size)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="rows per batch")
+    args = parser.parse_args()
+
+    batches = (clean_sales_rows(batch) for batch in iter_sales_batches(args.workbook, args.batch_size))
+    tracker = stream_top_products(batches, args.k, args.epsilon)
+    print(f"Streamed {tracker.row_count:,} sales records "
+          f"({tracker.revenue.capacity} counters per sketch)\n")
+    print("Top products by revenue:")
+    print(tracker.top_by_revenue().to_string(index=False))
+    print("\nTop products by quantity:")
+    print(tracker.top_by_quantity().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Workbook Status Manifest
+Computes the headline numbers shown in the GUI's Project Status panel and keeps
+them in a small JSON file next to the workbook, keyed by the workbook's size and
+modification time, so repeat refreshes read a few hundred bytes instead of the
+whole workbook.
+"""
+
+import json
+import os
+from typing import Dict, Optional
+
+
+STATUS_VERSION = 1
+STATUS_SUFFIX = ".sales_status.json"
+
+CARD_PAYMENTS = ['Credit Card', 'Debit Card']
+
+
+def status_path(excel_file: str) -> str:
+    """Return the status manifest path that belongs to an Excel workbook."""
+    root, _ = os.path.splitext(excel_file)
+    return root + STATUS_SUFFIX
+
+
+def workbook_signature(excel_file: str) -> Dict[str, int]:
+    """
+    Describe a workbook by size and modification time.
+
+    Uses only os.stat, so checking the manifest does not import pandas (the
+    GUI calls it on the Tk main thread).
+    """
+    stat = os.stat(excel_file)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def compute_status(excel_file: str) -> Optional[Dict]:
+    """
+    Work out the status numbers for a workbook from its sales cube.
+
+    Returns the period, transaction and sales totals, the latest month's
+    revenue by category and the card payment total, or None if the workbook
+    has no usable sales rows.
+    """
+    # Imported here: pandas and the analyzer are only needed when the manifest is stale
+    try:
+        from python_scripts.sales_analyzer import SalesAnalyzer
+    except ImportError:
+        from sales_analyzer import SalesAnalyzer
+
+    analyzer = SalesAnalyzer(excel_file)
+    cube = analyzer.get_sales_cube()
+    if cube.cells.empty:
+        return None
+    totals = analyzer.query_cube()
+    first_date = cube.cells['Date'].min().date()
+    last_date = cube.cells['Date'].max().date()
+
+    month_start = last_date.replace(day=1)
+    by_category = analyzer.query_cube(['Category'], start=month_start, end=last_date)
+    by_category = by_category.sort_values('Total Sales', ascending=False)['Total Sales']
+    card_sales = analyzer.query_cube(filters={'Payment Method': CARD_PAYMENTS})['Total Sales'].iloc[0]
+
+    return {
+        'first_date': first_date.isoformat(),
+        'last_date': last_date.isoformat(),
+        'total_transactions': int(totals['Total Transactions'].iloc[0]),
+        'total_sales': float(totals['Total Sales'].iloc[0]),
+        'month': f"{month_start:%B %Y}",
+        'category_sales': [[str(category), float(sales)] for category, sales in by_category.items()],
+        'card_sales': float(card_sales)
+    }
+
+
+def load_status(excel_file: str) -> Optional[Dict]:
+    """Return the saved status numbers if the manifest matches the workbook as it is now."""
+    try:
+        with open(status_path(excel_file), 'r') as f:
+            manifest = json.load(f)
+        signature = workbook_signature(excel_file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != STATUS_VERSION or manifest.get('signature') != signature:
+        return None
+    return manifest.get('status')
+
+
+def save_status(excel_file: str, status: Optional[Dict], signature: Dict) -> None:
+    """Write the status manifest for a workbook with the signature it was computed from."""
+    path = status_path(excel_file)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': STATUS_VERSION, 'signature': signature, 'status': status}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def workbook_status(excel_file: str) -> Optional[Dict]:
+    """
+    Return a workbook's status numbers, from the manifest when it is fresh.
+
+    Otherwise they are computed and saved. The signature is taken before the
+    workbook is read, so a workbook changed mid-read is recomputed next time.
+    """
+    status = load_status(excel_file)
+    if status is not None:
+        return status
+    signature = workbook_signature(excel_file)
+    status = compute_status(excel_file)
+    if status is not None:
+        try:
+            save_status(excel_file, status, signature)
+        except OSError as e:
+            print(f"Could not write status manifest: {e}")
+    return status
+
+
+def format_status(status: Optional[Dict]) -> str:
+    """Format status numbers as the Project Status panel's data summary."""
+    if status is None:
+        return "\n⚠️ Could not read sample data statistics\n"
+    total_sales = status['total_sales']
+    total_transactions = status['total_transactions']
+    text = f"\n📊 DATA SUMMARY:\n"
+    text += f"Period: {status['first_date']} to {status['last_date']}\n"
+    text += f"Total Transactions: {total_transactions:,}\n"
+    text += f"Total Sales: ${total_sales:,.2f}\n"
+    if total_transactions:
+        text += f"Average Transaction: ${total_sales / total_transactions:.2f}\n"
+    text += f"\n🗂️ REVENUE BY CATEGORY ({status['month']}):\n"
+    for category, sales in status['category_sales']:
+        text += f"{category}: ${sales:,.2f}\n"
+    text += f"\n💳 Card Payments: ${status['card_sales']:,.2f}\n"
+    return text
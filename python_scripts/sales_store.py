@@ -0,0 +1,261 @@
+"""
+SQLite Sales Store
+Keeps "Sales Entry" rows in a local SQLite database (WAL mode) with indexes on
+date, product and category, so questions about a date range or a product can
+be answered by SQL instead of re-parsing a whole workbook.
+"""
+
+import argparse
+import sqlite3
+from contextlib import closing
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from python_scripts.sales_aggregates import AggregationPlan
+    from python_scripts.sales_money import add_cents_columns, with_dollar_columns
+    from python_scripts.sales_stream import DEFAULT_BATCH_SIZE, clean_sales_rows, iter_sales_batches
+except ImportError:
+    from sales_aggregates import AggregationPlan
+    from sales_money import add_cents_columns, with_dollar_columns
+    from sales_stream import DEFAULT_BATCH_SIZE, clean_sales_rows, iter_sales_batches
+
+
+DEFAULT_STORE_PATH = "sample_data/sales_store.db"
+
+# "Sales Entry" column -> SQL column
+SQL_COLUMNS = {
+    'Date': 'sale_date',
+    'Product Name': 'product_name',
+    'Category': 'category',
+    'Quantity Sold': 'quantity_sold',
+    'Unit Price': 'unit_price',
+    'Total Amount': 'total_amount',
+    'Payment Method': 'payment_method',
+    'Customer Type': 'customer_type'
+}
+SALES_COLUMNS = list(SQL_COLUMNS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sales (
+    id INTEGER PRIMARY KEY,
+    sale_date TEXT NOT NULL,
+    product_name TEXT NOT NULL,
+    category TEXT,
+    quantity_sold INTEGER,
+    unit_price REAL,
+    total_amount REAL,
+    payment_method TEXT,
+    customer_type TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sales_date ON sales (sale_date);
+CREATE INDEX IF NOT EXISTS idx_sales_product ON sales (product_name);
+CREATE INDEX IF NOT EXISTS idx_sales_category ON sales (category);
+"""
+
+Filters = Dict[str, Union[str, List[str]]]
+
+
+def _date_text(dates: pd.Series) -> pd.Series:
+    """Format dates as sortable ISO text, adding the time only when there is one."""
+    dates = pd.to_datetime(dates)
+    if (dates == dates.dt.normalize()).all():
+        return dates.dt.strftime('%Y-%m-%d')
+    return dates.dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _sql_value(value):
+    """Convert a pandas / NumPy cell to a value sqlite3 can bind."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class SalesStore:
+    """
+    A SQLite database holding the eight "Sales Entry" columns.
+
+    Each operation opens its own short-lived connection, so one store object can
+    be shared between threads. Dates are stored as ISO text, which sorts and
+    range-filters correctly through the sale_date index.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_STORE_PATH):
+        self.db_path = db_path
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the store."""
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def row_count(self, start=None, end=None, filters: Optional[Filters] = None) -> int:
+        """Return the number of stored sales rows, optionally only those matching a range and filters."""
+        where, params = self._where(start, end, filters)
+        with closing(self._connect()) as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM sales{where}", params).fetchone()[0]
+
+    def insert_frame(self, sales_data: pd.DataFrame, connection: Optional[sqlite3.Connection] = None) -> int:
+        """Insert cleaned sales rows and return how many were written."""
+        if sales_data.empty:
+            return 0
+
+        sales_data = with_dollar_columns(sales_data)
+        rows = sales_data.reindex(columns=SALES_COLUMNS).assign(Date=_date_text(sales_data['Date']))
+        records = ([_sql_value(value) for value in row] for row in rows.itertuples(index=False, name=None))
+        placeholders = ', '.join('?' * len(SALES_COLUMNS))
+        statement = f"INSERT INTO sales ({', '.join(SQL_COLUMNS.values())}) VALUES ({placeholders})"
+
+        if connection is not None:
+            connection.executemany(statement, records)
+        else:
+            with closing(self._connect()) as connection, connection:
+                connection.executemany(statement, records)
+        return len(rows)
+
+    def import_workbook(self, excel_file: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                        replace: bool = False) -> int:
+        """
+        Import the "Sales Entry" sheet of a workbook and return the row count.
+
+        The workbook is read in batches, cleaned like SalesAnalyzer.load_sales_data
+        and written in a single transaction. With replace enabled the existing
+        rows are deleted first.
+        """
+        imported = 0
+        with closing(self._connect()) as connection, connection:
+            if replace:
+                connection.execute("DELETE FROM sales")
+            for batch in iter_sales_batches(excel_file, batch_size):
+                imported += self.insert_frame(clean_sales_rows(batch), connection)
+        return imported
+
+    def _where(self, start=None, end=None, filters: Optional[Filters] = None) -> Tuple[str, list]:
+        """Build a WHERE clause for an inclusive date range and column filters."""
+        clauses = []
+        params = []
+        if start is not None:
+            clauses.append("sale_date >= ?")
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            end_exclusive = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+            clauses.append("sale_date < ?")
+            params.append(end_exclusive.strftime('%Y-%m-%d'))
+        for name, values in (filters or {}).items():
+            if name not in SQL_COLUMNS:
+                raise ValueError(f"Cannot filter on: {name}")
+            accepted = [values] if isinstance(values, str) else list(values)
+            clauses.append(f"{SQL_COLUMNS[name]} IN ({', '.join('?' * len(accepted))})")
+            params.extend(accepted)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    @staticmethod
+    def _to_frame(rows: pd.DataFrame) -> pd.DataFrame:
+        """Rename SQL columns back to "Sales Entry" names, parse dates and add cents."""
+        rows.columns = SALES_COLUMNS
+        rows['Date'] = pd.to_datetime(rows['Date'], format='ISO8601')
+        return add_cents_columns(rows)
+
+    def load_frame(self, start=None, end=None, filters: Optional[Filters] = None) -> pd.DataFrame:
+        """Return the stored rows in an inclusive date range, matching filters."""
+        where, params = self._where(start, end, filters)
+        query = f"SELECT {', '.join(SQL_COLUMNS.values())} FROM sales{where} ORDER BY id"
+        with closing(self._connect()) as connection:
+            rows = pd.read_sql_query(query, connection, params=params)
+        return self._to_frame(rows)
+
+    def iter_frames(self, batch_size: int = DEFAULT_BATCH_SIZE, start=None, end=None,
+                    filters: Optional[Filters] = None) -> Iterator[pd.DataFrame]:
+        """Yield the selected rows in DataFrames of at most batch_size rows."""
+        where, params = self._where(start, end, filters)
+        query = f"SELECT {', '.join(SQL_COLUMNS.values())} FROM sales{where} ORDER BY id"
+        with closing(self._connect()) as connection:
+            for rows in pd.read_sql_query(query, connection, params=params, chunksize=batch_size):
+                yield self._to_frame(rows)
+
+    def page_frame(self, offset: int, limit: int, start=None, end=None, filters: Optional[Filters] = None,
+                   sort_by: str = 'Date', descending: bool = False) -> pd.DataFrame:
+        """
+        Return one page of the selected rows, sorted by a "Sales Entry" column.
+
+        The sort, filter and LIMIT / OFFSET all run in SQLite, so only the page
+        leaves the database. Rows with equal sort values are in insert order
+        (reversed when descending), so an index on the sort column covers the
+        whole ORDER BY and no temporary sort is needed.
+        """
+        if sort_by not in SQL_COLUMNS:
+            raise ValueError(f"Cannot sort on: {sort_by}")
+        where, params = self._where(start, end, filters)
+        direction = 'DESC' if descending else 'ASC'
+        query = f"""
+            SELECT {', '.join(SQL_COLUMNS.values())} FROM sales{where}
+            ORDER BY {SQL_COLUMNS[sort_by]} {direction}, id {direction}
+            LIMIT ? OFFSET ?
+        """
+        with closing(self._connect()) as connection:
+            rows = pd.read_sql_query(query, connection, params=params + [int(limit), int(offset)])
+        return self._to_frame(rows)
+
+    def distinct_values(self, column: str) -> List[str]:
+        """Return the sorted distinct values of a text column, for filter choices."""
+        if column not in SQL_COLUMNS:
+            raise ValueError(f"Unknown column: {column}")
+        sql_column = SQL_COLUMNS[column]
+        query = f"SELECT DISTINCT {sql_column} FROM sales WHERE {sql_column} IS NOT NULL ORDER BY {sql_column}"
+        with closing(self._connect()) as connection:
+            return [str(value) for (value,) in connection.execute(query)]
+
+    def aggregation_plan(self, start=None, end=None, filters: Optional[Filters] = None) -> AggregationPlan:
+        """
+        Build an AggregationPlan with a SQL GROUP BY instead of loading rows.
+
+        Only the plan's base table (one row per date, product, category and
+        payment method) leaves the database. Amounts are rounded to integer
+        cents before they are summed, so the totals match the in-memory plan.
+        """
+        where, params = self._where(start, end, filters)
+        query = f"""
+            SELECT sale_date, product_name, category, payment_method,
+                   COALESCE(SUM(CAST(ROUND(total_amount * 100) AS INTEGER)), 0) AS amount_cents,
+                   COUNT(total_amount) AS amount_count,
+                   TOTAL(quantity_sold) AS quantity_sum,
+                   COUNT(*) AS rows
+            FROM sales{where}
+            GROUP BY sale_date, product_name, category, payment_method
+        """
+        with closing(self._connect()) as connection:
+            base = pd.read_sql_query(query, connection, params=params)
+        if base.empty:
+            return AggregationPlan()
+
+        base.columns = AggregationPlan.BASE_KEYS + AggregationPlan.MEASURES
+        base['Date'] = pd.to_datetime(base['Date'], format='ISO8601')
+        if (base['quantity_sum'] == base['quantity_sum'].round()).all():
+            base['quantity_sum'] = base['quantity_sum'].astype(np.int64)
+        base = base.set_index(AggregationPlan.BASE_KEYS).sort_index()
+        return AggregationPlan(base, int(base['rows'].sum()))
+
+
+def main():
+    """Import a workbook into the SQLite sales store."""
+    parser = argparse.ArgumentParser(description="Import a sales workbook into the SQLite sales store")
+    parser.add_argument('workbook', help="workbook with a 'Sales Entry' sheet")
+    parser.add_argument('--db', default=DEFAULT_STORE_PATH, help="SQLite database path")
+    parser.add_argument('--replace', action='store_true', help="delete existing rows first")
+    args = parser.parse_args()
+
+    store = SalesStore(args.db)
+    imported = store.import_workbook(args.workbook, replace=args.replace)
+    print(f"Imported {imported:,} sales records into {args.db} ({store.row_count():,} total)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Streaming Sales Reader
+Reads the "Sales Entry" sheet in fixed-size row batches without loading the
+whole workbook into memory, and cleans raw rows into typed analysis data.
+"""
+
+from typing import Iterator, List, Sequence
+
+import pandas as pd
+from openpyxl import load_workbook
+
+try:
+    from python_scripts.sales_money import add_cents_columns
+except ImportError:
+    from sales_money import add_cents_columns
+
+
+DEFAULT_BATCH_SIZE = 5000
+NUMERIC_COLUMNS = ['Quantity Sold', 'Unit Price', 'Total Amount']
+
+
+def clean_sales_rows(sales_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean raw "Sales Entry" rows into typed analysis data.
+
+    Unit Price and Total Amount also get integer "Cents" columns, which the
+    aggregations sum instead of the floats.
+    """
+    sales_data['Date'] = pd.to_datetime(sales_data['Date'])
+    sales_data = sales_data.dropna(subset=['Product Name', 'Date'])
+
+    # Ensure numeric columns
+    for col in NUMERIC_COLUMNS:
+        sales_data[col] = pd.to_numeric(sales_data[col], errors='coerce')
+
+    return add_cents_columns(sales_data)
+
+
+def _column_names(header: Sequence) -> List[str]:
+    """Turn a header row into column names, naming blank headers like pandas does."""
+    return [str(value) if value is not None else f"Unnamed: {i}" for i, value in enumerate(header)]
+
+
+def iter_sales_batches(excel_file: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                       sheet_name: str = "Sales Entry") -> Iterator[pd.DataFrame]:
+    """
+    Yield raw rows of a worksheet as DataFrames of at most batch_size rows.
+
+    The workbook is opened in openpyxl's read-only mode, so only the current
+    batch is held in memory. Rows are returned as stored in the sheet; cleaning
+    is left to the caller.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _column_names(header)
+
+        batch = []
+        for row in rows:
+            batch.append(row[:len(columns)])
+            if len(batch) >= batch_size:
+                yield pd.DataFrame.from_records(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=columns)
+    finally:
+        workbook.close()
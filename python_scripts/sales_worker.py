@@ -0,0 +1,264 @@
+"""
+Warm Background Worker
+A long-lived process that keeps pandas, matplotlib and the loaded sales data in
+memory and runs template, sample-data and analysis jobs sent to it over a pipe,
+so repeat jobs skip the interpreter start-up, imports and workbook parsing.
+"""
+
+import atexit
+import contextlib
+import io
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Optional
+
+
+JOB_KINDS = ('ping', 'template', 'generate', 'analyze')
+
+SAMPLE_DATA_FILE = "sample_data/sample_sales_data.xlsx"
+TEMPLATE_FILE = "excel_templates/daily_sales_sheet.xlsx"
+
+
+class WorkerUnavailable(RuntimeError):
+    """Raised when the worker process is not running or stops during a job."""
+
+
+class JobRunner:
+    """
+    Runs jobs inside the worker process.
+
+    One SalesAnalyzer is kept per workbook together with the workbook's size
+    and modification time, so a repeat analysis of an unchanged workbook
+    reuses the rows already in memory. progress, if given, is called with a
+    fraction (0 to 1) and a message while a job runs.
+    """
+
+    def __init__(self, progress: Optional[Callable[[float, str], None]] = None):
+        self.analyzers = {}
+        self.progress = progress
+
+    @staticmethod
+    def warm_up() -> None:
+        """Import the heavy modules up front, so the first job does not pay for them."""
+        try:
+            import python_scripts.sales_analyzer  # noqa: F401
+            import python_scripts.generate_sample_data  # noqa: F401
+            import python_scripts.create_excel_template  # noqa: F401
+        except ImportError:
+            import sales_analyzer  # noqa: F401
+            import generate_sample_data  # noqa: F401
+            import create_excel_template  # noqa: F401
+
+    def run(self, kind: str, params: Dict) -> None:
+        """Run one job; its printed output is the job's output."""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job '{kind}'. Choose from: {', '.join(JOB_KINDS)}")
+        if kind == 'ping':
+            print("pong")
+        elif kind == 'template':
+            self.create_template()
+        elif kind == 'generate':
+            self.generate(**params)
+        else:
+            self.analyze(**params)
+
+    def create_template(self) -> None:
+        """Create the Excel template, as create_excel_template.py does."""
+        try:
+            from python_scripts.create_excel_template import main as create_template_main
+        except ImportError:
+            from create_excel_template import main as create_template_main
+        if self.progress is not None:
+            self.progress(0.0, "Creating Excel template")
+        create_template_main()
+        if self.progress is not None:
+            self.progress(1.0, "Template created")
+
+    def generate(self, days: int = 30, seed: Optional[int] = None, vectorized: bool = False) -> None:
+        """Generate and save sample data, as generate_sample_data.py does."""
+        try:
+            from python_scripts.generate_sample_data import SampleDataGenerator
+        except ImportError:
+            from generate_sample_data import SampleDataGenerator
+        generator = SampleDataGenerator(seed=seed, progress=self.progress)
+        filepath = generator.generate_and_save(days=days, vectorized=vectorized)
+        print(f"Generated {days} days of sample data: {filepath}")
+
+    def analyzer_for(self, excel_file: str):
+        """Return the kept analyzer for a workbook, replacing it if the workbook changed."""
+        try:
+            from python_scripts.sales_analyzer import SalesAnalyzer
+            from python_scripts.sales_cache import file_signature
+        except ImportError:
+            from sales_analyzer import SalesAnalyzer
+            from sales_cache import file_signature
+
+        signature = file_signature(excel_file, with_hash=False)
+        kept = self.analyzers.get(excel_file)
+        if kept is not None and kept[0] == signature:
+            return kept[1]
+        analyzer = SalesAnalyzer(excel_file)
+        self.analyzers[excel_file] = (signature, analyzer)
+        return analyzer
+
+    def analyze(self, excel_file: Optional[str] = None, period: Optional[str] = None) -> None:
+        """Print the sales report, as sales_analyzer.py does."""
+        excel_file = excel_file or SAMPLE_DATA_FILE
+        if not os.path.exists(excel_file):
+            excel_file = TEMPLATE_FILE
+            if not os.path.exists(excel_file):
+                print("No data file found. Please run:")
+                print("1. create_excel_template.py to create the template")
+                print("2. generate_sample_data.py to create sample data")
+                return
+
+        analyzer = self.analyzer_for(excel_file)
+        analyzer.progress = self.progress
+        if period in (None, 'all') and analyzer.sales_data is None:
+            analyzer.load_sales_data()
+        print(analyzer.generate_sales_report(period=period))
+        print(f"\nAnalysis complete! Check the 'visualizations' folder for charts and reports.")
+
+
+def worker_main(connection, cwd: str) -> None:
+    """
+    Serve jobs from a pipe until it closes or a None job arrives.
+
+    Each job is a dict with 'id', 'kind' and 'params'. While it runs, progress
+    messages with the same id, a 'progress' fraction and a 'message' are sent.
+    The final reply has the id, 'ok', the job's printed 'output', the 'error'
+    traceback if it failed and the 'seconds' it took.
+    """
+    os.chdir(cwd)
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    current = {'id': None}
+
+    def send_progress(fraction: float, message: str) -> None:
+        connection.send({'id': current['id'], 'progress': fraction, 'message': message})
+
+    runner = JobRunner(progress=send_progress)
+    runner.warm_up()
+
+    while True:
+        try:
+            job = connection.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+
+        current['id'] = job['id']
+        started = time.perf_counter()
+        output = io.StringIO()
+        ok, error = True, ''
+        try:
+            with contextlib.redirect_stdout(output):
+                runner.run(job['kind'], job.get('params') or {})
+        except Exception:
+            ok, error = False, traceback.format_exc()
+        connection.send({'id': job['id'], 'ok': ok, 'output': output.getvalue(),
+                         'error': error, 'seconds': time.perf_counter() - started})
+
+
+class SalesWorker:
+    """
+    Client for one warm worker process.
+
+    start() launches the process, which imports the sales modules straight
+    away; run() sends a job and waits for its reply, passing any progress
+    messages to the caller's callback on the way. Jobs run one at a time;
+    callers on other threads wait their turn. If the process dies, run()
+    raises WorkerUnavailable and the next start() launches a fresh one.
+    """
+
+    def __init__(self):
+        self._process = None
+        self._connection = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        atexit.register(self.stop)
+
+    @property
+    def alive(self) -> bool:
+        """True while the worker process is running."""
+        return self._process is not None and self._process.is_alive()
+
+    def start(self) -> None:
+        """Start the worker process if it is not already running."""
+        with self._lock:
+            if self.alive:
+                return
+            # spawn: the parent may be a Tk application with threads, which fork does not suit
+            context = multiprocessing.get_context('spawn')
+            parent_end, child_end = context.Pipe()
+            process = context.Process(target=worker_main, args=(child_end, os.getcwd()),
+                                      name='sales-worker')
+            process.start()
+            child_end.close()
+            self._process, self._connection = process, parent_end
+
+    def run(self, kind: str, timeout: Optional[float] = None, wait: bool = True,
+            progress: Optional[Callable[[float, str], None]] = None, **params) -> Dict:
+        """
+        Run a job in the worker and return its reply.
+
+        progress, if given, is called on this thread with each fraction and
+        message the job reports before it finishes. Raises WorkerUnavailable
+        if the worker is not running, stops during the job or does not answer
+        within timeout seconds. With wait=False it is also raised straight
+        away when another job is running, so the caller can run the job
+        elsewhere instead of queueing behind it.
+        """
+        if not self._lock.acquire(blocking=wait):
+            raise WorkerUnavailable("worker is busy with another job")
+        try:
+            if not self.alive:
+                raise WorkerUnavailable("worker process is not running")
+            job_id = next(self._ids)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            try:
+                self._connection.send({'id': job_id, 'kind': kind, 'params': params})
+                while True:
+                    while not self._connection.poll(0.1):
+                        if not self._process.is_alive():
+                            raise WorkerUnavailable(f"worker process exited with code {self._process.exitcode}")
+                        if deadline is not None and time.monotonic() > deadline:
+                            self._terminate()
+                            raise WorkerUnavailable(f"job '{kind}' timed out after {timeout}s")
+                    reply = self._connection.recv()
+                    if 'progress' not in reply:
+                        break
+                    if progress is not None and reply['id'] == job_id:
+                        progress(reply['progress'], reply['message'])
+            except (EOFError, OSError, BrokenPipeError) as e:
+                raise WorkerUnavailable(f"lost the worker process ({e})") from e
+        finally:
+            self._lock.release()
+        return reply
+
+    def _terminate(self) -> None:
+        """Kill the worker process without waiting for its current job."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join(timeout=5)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ask the worker to exit, killing it if it does not within timeout seconds."""
+        process, connection = self._process, self._connection
+        if process is None:
+            return
+        try:
+            if process.is_alive():
+                connection.send(None)
+            process.join(timeout)
+        except (OSError, ValueError):
+            pass
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout)
+        connection.close()
+        self._process = self._connection = None